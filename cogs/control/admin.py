@@ -3,13 +3,16 @@ from discord.ext import commands
 from discord import app_commands
 from utils.database import server_autocomplete
 from utils.bans import (
-    fetch_bans,
+    export_bans,
     log_ban,
+    remove_ban,
     clear_bans
 )
 from utils.apiutility import get_api_instance
+from utils.bansync import push_ban_action
+import datetime
 import logging
-import io
+import time
 
 class AdminCog(commands.Cog):
     def __init__(self, bot):
@@ -21,6 +24,14 @@ class AdminCog(commands.Cog):
         choices = [app_commands.Choice(name=name, value=name) for name in server_names]
         return choices
 
+    def sync_summary(self, results, elapsed):
+        applied = sum(1 for r in results if not r[2])
+        lines = [f"Applied on {applied}/{len(results)} servers in {elapsed:.1f}s."]
+        for name, _, failed, _ in results:
+            if failed:
+                lines.append(f"- {name}: {failed[0][1]}")
+        return "\n".join(lines)
+
     @app_commands.command(name="kick", description="Kick a player from the server.")
     @app_commands.describe(server="The name of the server", player_id="The player ID to kick", reason="The reason for the kick")
     @app_commands.autocomplete(server=server_autocomplete)
@@ -40,70 +51,99 @@ class AdminCog(commands.Cog):
             await interaction.followup.send(f"An unexpected error occurred: {str(e)}", ephemeral=True)
             logging.error(f"An unexpected error occurred: {str(e)}")
 
-    @app_commands.command(name="ban", description="Ban a player from the server.")
-    @app_commands.describe(server="The name of the server", player_id="The player ID to ban", reason="The reason for the ban")
+    @app_commands.command(name="ban", description="Ban a player from every server in this guild.")
+    @app_commands.describe(server="The server the ban is issued from", player_id="The player ID to ban", reason="The reason for the ban")
     @app_commands.autocomplete(server=server_autocomplete)
     @app_commands.default_permissions(administrator=True)
     @app_commands.guild_only()
     async def ban_player(self, interaction: discord.Interaction, server: str, player_id: str, reason: str):
         await interaction.response.defer(thinking=True, ephemeral=True)
         try:
-            api, error = await get_api_instance(interaction.guild.id, server)
+            _, error = await get_api_instance(interaction.guild.id, server)
             if error:
                 await interaction.followup.send(error, ephemeral=True)
                 return
             
-            await api.ban_player(player_id, reason)
-            await log_ban(player_id, reason)
-            await interaction.followup.send(f"Player {player_id} has been banned for: {reason}", ephemeral=True)
+            # Every server in the guild gets the ban; the reconcile loop in
+            # BanSyncCog retries the ones that fail here.
+            start = time.perf_counter()
+            await log_ban(interaction.guild.id, player_id, reason)
+            self.bot.dispatch("moderation_changed")
+            results = await push_ban_action(interaction.guild.id, player_id, "ban", reason)
+            summary = self.sync_summary(results, time.perf_counter() - start)
+            await interaction.followup.send(f"Player {player_id} has been banned for: {reason}\n{summary}", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"An unexpected error occurred: {str(e)}", ephemeral=True)
             logging.error(f"An unexpected error occurred: {str(e)}")
 
-    @app_commands.command(name="unban", description="Unban a player from the server.")
-    @app_commands.describe(server="The name of the server", player_id="The player ID to unban")
+    @app_commands.command(name="unban", description="Unban a player from every server in this guild.")
+    @app_commands.describe(server="The server the unban is issued from", player_id="The player ID to unban")
     @app_commands.autocomplete(server=server_autocomplete)
     @app_commands.default_permissions(administrator=True)
     @app_commands.guild_only()
     async def unban_player(self, interaction: discord.Interaction, server: str, player_id: str):
         await interaction.response.defer(thinking=True, ephemeral=True)
         try:
-            api, error = await get_api_instance(interaction.guild.id, server)
+            _, error = await get_api_instance(interaction.guild.id, server)
             if error:
                 await interaction.followup.send(error, ephemeral=True)
                 return
             
-            await api.unban_player(player_id)
-            await interaction.followup.send(f"Player {player_id} has been unbanned.", ephemeral=True)
+            start = time.perf_counter()
+            await remove_ban(interaction.guild.id, player_id)
+            self.bot.dispatch("moderation_changed")
+            results = await push_ban_action(interaction.guild.id, player_id, "unban")
+            summary = self.sync_summary(results, time.perf_counter() - start)
+            await interaction.followup.send(f"Player {player_id} has been unbanned.\n{summary}", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"An unexpected error occurred: {str(e)}", ephemeral=True)
             logging.error(f"An unexpected error occurred: {str(e)}")
 
-    # Uploads ban logs as a text file
-    @app_commands.command(name="bans", description="List all banned players.")
+    # Uploads ban logs as a CSV or JSON file, streamed straight from the database
+    @app_commands.command(name="bans", description="Export banned players.")
+    @app_commands.describe(
+        fmt="File format",
+        player_id="Only this player",
+        reason="Only reasons starting with this",
+        since="Only bans on or after this date (YYYY-MM-DD)",
+        until="Only bans on or before this date (YYYY-MM-DD)"
+    )
+    @app_commands.choices(fmt=[
+        app_commands.Choice(name="CSV", value="csv"),
+        app_commands.Choice(name="JSON", value="json")
+    ])
     @app_commands.default_permissions(administrator=True)
     @app_commands.guild_only()
-    async def list_bans(self, interaction: discord.Interaction):
+    async def list_bans(self, interaction: discord.Interaction, fmt: str = "csv", player_id: str = None, reason: str = None, since: str = None, until: str = None):
         await interaction.response.defer(thinking=True, ephemeral=True)
-        bans = await fetch_bans()
-        if bans:
-            ban_list = "\n".join([f"{ban[0]}: {ban[1]}" for ban in bans])
-            ban_file = io.StringIO(ban_list)
-            discord_file = discord.File(ban_file, filename="bannedplayers.txt")
-            await interaction.followup.send("Banned players:", file=discord_file, ephemeral=True)
-            ban_file.close()
-        else:
-            await interaction.followup.send("No players are banned.", ephemeral=True)
-            logging.info("No players are banned.")
+        try:
+            since = datetime.date.fromisoformat(since).isoformat() if since else None
+            until = (datetime.date.fromisoformat(until) + datetime.timedelta(days=1)).isoformat() if until else None
+        except ValueError:
+            await interaction.followup.send("Dates must be in YYYY-MM-DD format.", ephemeral=True)
+            return
+        try:
+            ban_file, count = await export_bans(interaction.guild.id, fmt, player_id, reason, since, until)
+            with ban_file:
+                if not count:
+                    await interaction.followup.send("No players are banned.", ephemeral=True)
+                    logging.info("No players are banned.")
+                    return
+                discord_file = discord.File(ban_file, filename=f"bannedplayers.{fmt}")
+                await interaction.followup.send(f"Banned players: {count}", file=discord_file, ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"Failed to export bans: {str(e)}", ephemeral=True)
+            logging.error(f"Failed to export bans: {str(e)}")
 
-    @app_commands.command(name="clearbans", description="Clear ban history from the database.")
+    @app_commands.command(name="clearbans", description="Clear this guild's ban history from the database.")
     @app_commands.default_permissions(administrator=True)
     @app_commands.guild_only()
     async def clear_bans_command(self, interaction: discord.Interaction):
         await interaction.response.defer(thinking=True, ephemeral=True)
-        await clear_bans()
-        await interaction.followup.send("All bans have been cleared.", ephemeral=True)
-        logging.info("All bans have been cleared.")
+        count = await clear_bans(interaction.guild.id)
+        self.bot.dispatch("moderation_changed")
+        await interaction.followup.send(f"Cleared {count} bans for this guild.", ephemeral=True)
+        logging.info(f"Cleared {count} bans for guild {interaction.guild.id}.")
 
 async def setup(bot):
     await bot.add_cog(AdminCog(bot))
@@ -0,0 +1,115 @@
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+from palworld_api import PalworldAPI
+from utils.database import fleet_servers
+from utils.bans import (
+    ban_sync_guilds,
+    queue_missing_bans,
+    requeue_server_bans,
+    ban_server_starts,
+    set_ban_server_start,
+    ban_sync_summary
+)
+from utils.bansync import converge
+from utils.fleet import run_fleet
+import datetime
+import time
+import logging
+
+# A start time that moves by more than this means the server restarted.
+RESTART_SLACK = 120
+
+class BanSyncCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.last_runs = {}
+        self.reconcile.start()
+
+    def cog_unload(self):
+        self.reconcile.cancel()
+
+    async def server_start(self, server):
+        name, host, password, api_port, rcon_port = server
+        if not api_port:
+            raise ValueError("No REST API port configured.")
+        metrics = await PalworldAPI(f"http://{host}:{api_port}", password).get_server_metrics()
+        if not isinstance(metrics, dict) or "error" in metrics:
+            raise RuntimeError(metrics.get("error") if isinstance(metrics, dict) else metrics)
+        return int(time.time() - metrics["uptime"])
+
+    # Servers restored from a backup come back with an older banlist, and REST
+    # has no way to read it, so anything that restarted gets every action
+    # replayed. Servers added since a ban was issued get it queued here too.
+    async def reconcile_guild(self, guild_id):
+        start = time.perf_counter()
+        now = int(time.time())
+        servers = await fleet_servers(guild_id)
+        known = await ban_server_starts(guild_id)
+        requeued = 0
+        for name, ok, started_at, _ in await run_fleet(servers, self.server_start):
+            if not ok:
+                continue
+            if name in known and abs(started_at - known[name]) > RESTART_SLACK:
+                requeued += await requeue_server_bans(guild_id, name)
+            if known.get(name) != started_at:
+                await set_ban_server_start(guild_id, name, started_at)
+        for server in servers:
+            requeued += await queue_missing_bans(guild_id, server[0], now)
+
+        results = await converge(guild_id)
+        elapsed = time.perf_counter() - start
+        self.last_runs[guild_id] = (now, requeued, results, elapsed)
+        failed = sum(len(r[2]) for r in results)
+        if results:
+            logging.info(f"Ban sync for guild {guild_id}: {sum(r[1] for r in results)} applied, {failed} failed, {requeued} queued in {elapsed:.1f}s")
+
+    @tasks.loop(minutes=5)
+    async def reconcile(self):
+        try:
+            for guild_id in await ban_sync_guilds():
+                await self.reconcile_guild(guild_id)
+        except Exception as e:
+            logging.error(f"Ban sync reconcile failed: {e}")
+
+    @reconcile.before_loop
+    async def before_reconcile(self):
+        await self.bot.wait_until_ready()
+
+    bansync_group = app_commands.Group(name="bansync", description="Ban propagation across servers", default_permissions=discord.Permissions(administrator=True), guild_only=True)
+
+    @bansync_group.command(name="status", description="Show how far bans have propagated to each server.")
+    async def bansync_status(self, interaction: discord.Interaction):
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        try:
+            rows = await ban_sync_summary(interaction.guild.id)
+            if not rows:
+                await interaction.followup.send("No bans have been synced yet.", ephemeral=True)
+                return
+
+            now = time.time()
+            lines = []
+            for server_name, applied, pending, oldest, slowest, error in rows:
+                line = f"**{server_name}**: {applied} applied, {pending} pending"
+                if pending and oldest:
+                    line += f" (oldest {int(now - oldest) // 60}m)"
+                if slowest is not None:
+                    line += f", slowest {slowest}s"
+                if error:
+                    line += f"\n  `{error[:80]}`"
+                lines.append(line)
+
+            color = discord.Color.green() if not any(r[2] for r in rows) else discord.Color.orange()
+            embed = discord.Embed(title="Ban Sync", description="\n".join(lines)[:4000], color=color)
+            last = self.last_runs.get(interaction.guild.id)
+            if last:
+                ran_at, requeued, results, elapsed = last
+                embed.set_footer(text=f"Last reconcile: {sum(r[1] for r in results)} applied, {sum(len(r[2]) for r in results)} failed, {requeued} queued in {elapsed:.1f}s")
+                embed.timestamp = datetime.datetime.fromtimestamp(ran_at, tz=datetime.timezone.utc)
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        except Exception as e:
+            logging.error(f"Failed to fetch ban sync status: {e}")
+            await interaction.followup.send(f"Failed to fetch ban sync status: {e}", ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(BanSyncCog(bot))
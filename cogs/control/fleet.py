@@ -0,0 +1,137 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from palworld_api import PalworldAPI
+from utils.database import (
+    server_autocomplete,
+    fetch_server_details,
+    add_server_tag,
+    remove_server_tag,
+    tag_autocomplete,
+    fleet_servers
+)
+from utils.fleet import run_fleet
+from utils.rconutility import get_scheduler
+import time
+import logging
+
+class FleetCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def server_names(self, interaction: discord.Interaction, current: str):
+        server_names = await server_autocomplete(interaction.guild.id, current)
+        return [app_commands.Choice(name=name, value=name) for name in server_names]
+
+    async def tag_names(self, interaction: discord.Interaction, current: str):
+        tags = await tag_autocomplete(interaction.guild.id, current)
+        return [app_commands.Choice(name=tag, value=tag) for tag in tags]
+
+    # PalworldAPI reports failures as {"error": ...} instead of raising.
+    def rest_action(self, method: str, *args):
+        async def action(server):
+            name, host, password, api_port, rcon_port = server
+            if not api_port:
+                raise ValueError("No REST API port configured.")
+            api = PalworldAPI(f"http://{host}:{api_port}", password)
+            response = await getattr(api, method)(*args)
+            if isinstance(response, dict) and "error" in response:
+                raise RuntimeError(response["error"])
+            return response
+        return action
+
+    def rcon_action(self, command: str):
+        async def action(server):
+            name, host, password, api_port, rcon_port = server
+            if not rcon_port:
+                raise ValueError("No RCON port configured.")
+            return await get_scheduler(host, rcon_port, password).submit(command)
+        return action
+
+    async def broadcast(self, interaction: discord.Interaction, title: str, tag: str, action):
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        tag = tag.strip().lower() if tag else None
+        try:
+            servers = await fleet_servers(interaction.guild.id, tag)
+            if not servers:
+                await interaction.followup.send(f"No servers tagged `{tag}`." if tag else "No servers configured.", ephemeral=True)
+                return
+
+            start = time.perf_counter()
+            results = await run_fleet(servers, action)
+            elapsed = time.perf_counter() - start
+            await interaction.followup.send(embed=self.fleet_embed(title, tag, results, elapsed), ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"An unexpected error occurred: {str(e)}", ephemeral=True)
+            logging.error(f"Fleet {title} failed: {str(e)}")
+
+    def fleet_embed(self, title: str, tag: str, results, elapsed: float):
+        succeeded = sum(1 for r in results if r[1])
+        if succeeded == len(results):
+            color = discord.Color.green()
+        elif succeeded:
+            color = discord.Color.orange()
+        else:
+            color = discord.Color.red()
+
+        lines = []
+        for name, ok, result, seconds in results:
+            detail = str(result).strip() if result not in (None, "") else "OK"
+            if len(detail) > 80:
+                detail = detail[:77] + "..."
+            lines.append(f"{'✅' if ok else '❌'} **{name}** `{seconds * 1000:.0f} ms` {detail}")
+
+        description = "\n".join(lines)
+        if len(description) > 4000:
+            description = description[:4000].rsplit("\n", 1)[0] + "\n..."
+        embed = discord.Embed(title=f"Fleet {title}" + (f" [{tag}]" if tag else ""), description=description, color=color)
+        embed.set_footer(text=f"{succeeded}/{len(results)} succeeded in {elapsed:.2f}s")
+        return embed
+
+    fleet_group = app_commands.Group(name="fleet", description="Run commands on every server at once", default_permissions=discord.Permissions(administrator=True), guild_only=True)
+
+    @fleet_group.command(name="announce", description="Announce a message on every server.")
+    @app_commands.describe(message="The message to announce", tag="Only servers with this tag")
+    @app_commands.autocomplete(tag=tag_names)
+    async def fleet_announce(self, interaction: discord.Interaction, message: str, tag: str = None):
+        await self.broadcast(interaction, "Announce", tag, self.rest_action("make_announcement", message))
+
+    @fleet_group.command(name="save", description="Save every server.")
+    @app_commands.describe(tag="Only servers with this tag")
+    @app_commands.autocomplete(tag=tag_names)
+    async def fleet_save(self, interaction: discord.Interaction, tag: str = None):
+        await self.broadcast(interaction, "Save", tag, self.rest_action("save_server_state"))
+
+    @fleet_group.command(name="rcon", description="Send an RCON command to every server.")
+    @app_commands.describe(command="RCON Command", tag="Only servers with this tag")
+    @app_commands.autocomplete(tag=tag_names)
+    async def fleet_rcon(self, interaction: discord.Interaction, command: str, tag: str = None):
+        await self.broadcast(interaction, "RCON", tag, self.rcon_action(command))
+
+    @fleet_group.command(name="tag", description="Add a server to a fleet tag.")
+    @app_commands.describe(server="The name of the server", tag="Tag name")
+    @app_commands.autocomplete(server=server_names, tag=tag_names)
+    async def fleet_tag(self, interaction: discord.Interaction, server: str, tag: str):
+        try:
+            if not await fetch_server_details(interaction.guild.id, server):
+                await interaction.response.send_message(f"Server '{server}' configuration not found.", ephemeral=True)
+                return
+            await add_server_tag(interaction.guild.id, server, tag.strip().lower())
+            await interaction.response.send_message(f"Tagged `{server}` with `{tag.strip().lower()}`.", ephemeral=True)
+        except Exception as e:
+            await interaction.response.send_message(f"Failed to tag server: {e}", ephemeral=True)
+            logging.error(f"Failed to tag server: {e}")
+
+    @fleet_group.command(name="untag", description="Remove a server from a fleet tag.")
+    @app_commands.describe(server="The name of the server", tag="Tag name")
+    @app_commands.autocomplete(server=server_names, tag=tag_names)
+    async def fleet_untag(self, interaction: discord.Interaction, server: str, tag: str):
+        try:
+            await remove_server_tag(interaction.guild.id, server, tag.strip().lower())
+            await interaction.response.send_message(f"Removed `{server}` from `{tag.strip().lower()}`.", ephemeral=True)
+        except Exception as e:
+            await interaction.response.send_message(f"Failed to untag server: {e}", ephemeral=True)
+            logging.error(f"Failed to untag server: {e}")
+
+async def setup(bot):
+    await bot.add_cog(FleetCog(bot))
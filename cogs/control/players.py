@@ -1,13 +1,44 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.database import server_autocomplete
+from utils.database import server_autocomplete, latest_level_parse, fetch_save_bases, fetch_save_guilds
 from utils.apiutility import get_api_instance
+from utils.spatial import SpatialGrid
 import logging
 
 class PlayersCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.grids = {}
+        self.bases = {}
+
+    # Fed by PlayerLoggingCog every poll, so position queries never hit the server.
+    @commands.Cog.listener()
+    async def on_player_snapshot(self, guild_id, server_name, players, joined, left):
+        grid = self.grids.setdefault((guild_id, server_name), SpatialGrid())
+        snapshot = {}
+        for player in players:
+            try:
+                snapshot[player['userId']] = (float(player['location_x']), float(player['location_y']), player)
+            except (KeyError, TypeError, ValueError):
+                continue
+        grid.sync(snapshot)
+
+    # Base positions come from the newest parsed backup of Level.sav.
+    async def load_bases(self, guild_id, server_name):
+        sha256 = await latest_level_parse(guild_id, server_name)
+        if not sha256:
+            return {}
+        cached = self.bases.get((guild_id, server_name))
+        if cached and cached[0] == sha256:
+            return cached[1]
+        guild_names = {g[0]: g[1] for g in await fetch_save_guilds(sha256)}
+        bases = {
+            base_id: (name or base_id[:8], guild_names.get(owner, "No Guild"), x, y)
+            for base_id, owner, name, x, y, z in await fetch_save_bases(sha256)
+        }
+        self.bases[(guild_id, server_name)] = (sha256, bases)
+        return bases
 
     async def server_autocomplete(self, interaction: discord.Interaction, current: str):
         guild_id = interaction.guild.id
@@ -65,5 +96,55 @@ class PlayersCog(commands.Cog):
 
         return embed
 
+    async def base_autocomplete(self, interaction: discord.Interaction, current: str):
+        bases = await self.load_bases(interaction.guild.id, interaction.namespace.server)
+        current = current.lower()
+        choices = [
+            app_commands.Choice(name=f"{guild} - {name}"[:100], value=base_id)
+            for base_id, (name, guild, x, y) in bases.items()
+            if current in guild.lower() or current in name.lower()
+        ]
+        return sorted(choices, key=lambda c: c.name)[:25]
+
+    def nearby_embed(self, title, grid, results):
+        embed = discord.Embed(title=title, color=discord.Color.green())
+        lines = [f"`{data['name']}` ({data['userId']}) - {distance / 100:.0f}m" for _, data, distance in results[:30]]
+        embed.description = "\n".join(lines) if lines else "No players in range."
+        if len(results) > 30:
+            embed.description += f"\n...and {len(results) - 30} more"
+        embed.add_field(name="Positions As Of", value=f"<t:{int(grid.updated)}:R>")
+        return embed
+
+    @app_commands.command(name="nearby", description="List online players within a radius of a point.")
+    @app_commands.describe(server="The name of the server", x="World X coordinate", y="World Y coordinate", radius="Radius in world units")
+    @app_commands.autocomplete(server=server_autocomplete)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def nearby(self, interaction: discord.Interaction, server: str, x: float, y: float, radius: app_commands.Range[float, 1, 1000000] = 10000):
+        grid = self.grids.get((interaction.guild.id, server))
+        if not grid or grid.updated is None:
+            await interaction.response.send_message(f"No player positions recorded for '{server}' yet.", ephemeral=True)
+            return
+        embed = self.nearby_embed(f"Players near ({x:.0f}, {y:.0f}) on {server}", grid, grid.within(x, y, radius))
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="nearbase", description="List online players near a base from the latest save backup.")
+    @app_commands.describe(server="The name of the server", base="Base to search around", radius="Radius in world units")
+    @app_commands.autocomplete(server=server_autocomplete, base=base_autocomplete)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def nearbase(self, interaction: discord.Interaction, server: str, base: str, radius: app_commands.Range[float, 1, 1000000] = 10000):
+        grid = self.grids.get((interaction.guild.id, server))
+        if not grid or grid.updated is None:
+            await interaction.response.send_message(f"No player positions recorded for '{server}' yet.", ephemeral=True)
+            return
+        bases = await self.load_bases(interaction.guild.id, server)
+        if base not in bases:
+            await interaction.response.send_message("Base not found. Bases are read from the latest inspected backup.", ephemeral=True)
+            return
+        name, guild, x, y = bases[base]
+        embed = self.nearby_embed(f"Players near {guild} - {name} on {server}", grid, grid.within(x, y, radius))
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(PlayersCog(bot))
@@ -0,0 +1,159 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+from palworld_api import PalworldAPI
+from utils.database import (
+    server_autocomplete,
+    fetch_server_details,
+    fetch_logchannel,
+    fetch_global_bans,
+    add_moderation_rule,
+    remove_moderation_rule,
+    fetch_moderation_rules
+)
+from utils.bans import guild_ban_ids
+from utils.whitelist import whitelist_checker
+from utils.rules import RULE_KINDS, CompiledRules, parse_rule_value
+import asyncio
+import time
+import logging
+
+# A kicked player can linger in the REST player list for a poll or two.
+KICK_COOLDOWN = 60
+
+class RulesCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.rules = None
+        self.guild_bans = {}
+        self.global_bans = set()
+        self.compiled = {}
+        self.recent = {}
+
+    async def load_rules(self):
+        rules = {}
+        for rule_id, guild_id, server_name, kind, value, reason in await fetch_moderation_rules():
+            rules.setdefault(guild_id, []).append((server_name, (rule_id, kind, value, reason)))
+        guild_bans = {}
+        for guild_id, player_id in await guild_ban_ids():
+            guild_bans.setdefault(guild_id, set()).add(player_id)
+        self.global_bans = {row[0] for row in await fetch_global_bans()}
+        self.rules, self.guild_bans, self.compiled = rules, guild_bans, {}
+
+    def compiled_for(self, guild_id, server_name):
+        key = (guild_id, server_name)
+        if key not in self.compiled:
+            rules = [rule for scope, rule in self.rules.get(guild_id, []) if scope in (None, server_name)]
+            banned = (self.guild_bans.get(guild_id, set()), self.global_bans)
+            self.compiled[key] = CompiledRules(rules, banned)
+        return self.compiled[key]
+
+    # Rules, bans or the global banlist changed; recompile on the next snapshot.
+    @commands.Cog.listener()
+    async def on_moderation_changed(self):
+        self.rules = None
+
+    # Every online player is checked on every poll, so level and ping limits
+    # apply mid-session and failed kicks are retried on the next poll.
+    @commands.Cog.listener()
+    async def on_player_snapshot(self, guild_id, server_name, players, joined, left):
+        key = (guild_id, server_name)
+        if self.rules is None:
+            await self.load_rules()
+        rules = self.compiled_for(guild_id, server_name)
+        whitelisted = await whitelist_checker(guild_id, server_name)
+
+        now = time.time()
+        recent = {uid: at for uid, at in self.recent.get(key, {}).items() if now - at < KICK_COOLDOWN}
+        offenders = {}
+        for player in players:
+            userid = player.get('userId')
+            if not userid or userid in recent or userid in offenders:
+                continue
+            reason = rules.check(player, whitelisted)
+            if reason:
+                offenders[userid] = (player.get('name', userid), reason)
+                recent[userid] = now
+        self.recent[key] = recent
+        if not offenders:
+            return
+
+        details = await fetch_server_details(guild_id, server_name)
+        if not details:
+            return
+        api = PalworldAPI(f"http://{details[2]}:{details[4]}", details[3])
+        results = await asyncio.gather(*(api.kick_player(userid, reason) for userid, (_, reason) in offenders.items()), return_exceptions=True)
+
+        lines = []
+        for (userid, (name, reason)), result in zip(offenders.items(), results):
+            if isinstance(result, Exception) or (isinstance(result, dict) and 'error' in result):
+                recent.pop(userid, None)
+                logging.error(f"Failed to kick {userid} from server '{server_name}': {result}")
+                continue
+            logging.info(f"Kicked {userid} from server '{server_name}': {reason}")
+            lines.append(f"`{name}` (`{userid}`) - {reason}")
+
+        log_channel_id = await fetch_logchannel(guild_id, server_name)
+        log_channel = self.bot.get_channel(log_channel_id) if log_channel_id else None
+        if log_channel and lines:
+            embed = discord.Embed(
+                title="Moderation Rules",
+                description=f"Kicked from server {server_name}:\n" + "\n".join(lines)[:4000],
+                color=discord.Color.red(),
+                timestamp=discord.utils.utcnow()
+            )
+            await log_channel.send(embed=embed)
+
+    async def server_names(self, interaction: discord.Interaction, current: str):
+        server_names = await server_autocomplete(interaction.guild.id, current)
+        return [app_commands.Choice(name=name, value=name) for name in server_names]
+
+    rules_group = app_commands.Group(name="rules", description="Automatic kick rules", default_permissions=discord.Permissions(administrator=True), guild_only=True)
+
+    @rules_group.command(name="add", description="Add a rule that kicks matching players.")
+    @app_commands.describe(kind="What the rule checks", value="Regex, comma-separated words, level or ping", reason="Message shown to kicked players", server="Only apply to this server")
+    @app_commands.choices(kind=[app_commands.Choice(name=description, value=kind) for kind, description in RULE_KINDS.items()])
+    @app_commands.autocomplete(server=server_names)
+    async def rules_add(self, interaction: discord.Interaction, kind: str, value: str, reason: str = None, server: str = None):
+        try:
+            value = parse_rule_value(kind, value)
+        except Exception as e:
+            await interaction.response.send_message(f"Invalid value: {e}", ephemeral=True)
+            return
+        try:
+            if server and not await fetch_server_details(interaction.guild.id, server):
+                await interaction.response.send_message(f"Server '{server}' configuration not found.", ephemeral=True)
+                return
+            rule_id = await add_moderation_rule(interaction.guild.id, server, kind, value, reason)
+            self.bot.dispatch("moderation_changed")
+            await interaction.response.send_message(f"Rule #{rule_id} added: `{kind}` `{value}` on {server or 'all servers'}.", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Failed to add moderation rule: {e}")
+            await interaction.response.send_message(f"Failed to add rule: {e}", ephemeral=True)
+
+    @rules_group.command(name="remove", description="Remove a rule.")
+    @app_commands.describe(rule_id="The rule number from /rules list")
+    async def rules_remove(self, interaction: discord.Interaction, rule_id: int):
+        try:
+            if not await remove_moderation_rule(interaction.guild.id, rule_id):
+                await interaction.response.send_message(f"Rule #{rule_id} not found.", ephemeral=True)
+                return
+            self.bot.dispatch("moderation_changed")
+            await interaction.response.send_message(f"Rule #{rule_id} removed.", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Failed to remove moderation rule: {e}")
+            await interaction.response.send_message(f"Failed to remove rule: {e}", ephemeral=True)
+
+    @rules_group.command(name="list", description="List the rules for this guild.")
+    async def rules_list(self, interaction: discord.Interaction):
+        rules = await fetch_moderation_rules(interaction.guild.id)
+        lines = [
+            f"#{rule_id} `{kind}` `{value}` on {server_name or 'all servers'}" + (f" - {reason}" if reason else "")
+            for rule_id, _, server_name, kind, value, reason in rules
+        ]
+        embed = discord.Embed(title="Moderation Rules", description="\n".join(lines)[:4000] or "No rules configured.", color=discord.Color.blurple())
+        embed.set_footer(text="Invalid IDs and banned players are always kicked, as are non-whitelisted players where the whitelist is on.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(RulesCog(bot))
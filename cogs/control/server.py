@@ -5,12 +5,18 @@ from utils.database import (
     add_server,
     remove_server,
     server_autocomplete,
-    remove_whitelist_status,
     delete_chat,
     del_backup,
     delete_query,
-    remove_logchannel
+    remove_logchannel,
+    del_save_monitor,
+    del_server_tags,
+    del_movement_check,
+    del_moderation_rules,
+    del_export_dir
 )
+from utils.whitelist import remove_whitelist_status, remove_server_whitelists
+from utils.bans import remove_ban_state
 from utils.servermodal import AddServerModal
 import logging
 
@@ -66,10 +72,17 @@ class ServerManagementCog(commands.Cog):
         try:
             await remove_server(interaction.guild_id, server)
             await remove_whitelist_status(interaction.guild_id, server)
+            await remove_server_whitelists(interaction.guild_id, server)
             await delete_chat(interaction.guild_id, server)
             await del_backup(interaction.guild_id, server)
             await delete_query(interaction.guild_id, server)
             await remove_logchannel(interaction.guild_id, server)
+            await del_save_monitor(interaction.guild_id, server)
+            await del_server_tags(interaction.guild_id, server)
+            await del_movement_check(interaction.guild_id, server)
+            await remove_ban_state(interaction.guild_id, server)
+            await del_moderation_rules(interaction.guild_id, server)
+            await del_export_dir(interaction.guild_id, server)
             await interaction.followup.send("Server removed successfully.")
         except Exception as e:
             await interaction.followup.send(f"Failed to remove server: {e}", ephemeral=True)
@@ -1,103 +1,124 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from utils.whitelist import (
-    add_whitelist,
-    remove_whitelist,
-    is_whitelisted,
     whitelist_set,
-    whitelist_get
+    load_whitelist,
+    add_server_whitelist,
+    remove_server_whitelist,
+    add_guild_whitelist,
+    remove_guild_whitelist,
+    import_server_whitelist,
+    server_whitelist,
+    parse_whitelist_file,
+    format_whitelist_file
 )
-from utils.database import (
-    fetch_all_servers,
-    server_autocomplete,
-    fetch_logchannel
-)
-from palworld_api import PalworldAPI
+from utils.database import server_autocomplete, fleet_servers
+import io
 import logging
 
+MAX_IMPORT_BYTES = 8 * 1048576
+
 class WhitelistCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.check_whitelist.start()
-
-    def cog_unload(self):
-        self.check_whitelist.cancel()
-
-    @tasks.loop(seconds=60)
-    async def check_whitelist(self):
-        servers = await fetch_all_servers()
-        for server in servers:
-            guild_id, server_name, host, password, api_port, rcon_port = server
-            if not await whitelist_get(guild_id, server_name):
-                continue
-            
-            log_channel_id = await fetch_logchannel(guild_id, server_name)
-            log_channel = self.bot.get_channel(log_channel_id) if log_channel_id else None
 
-            try:
-                api = PalworldAPI(f"http://{host}:{api_port}", password)
-                player_list = await api.get_player_list()
-                
-                # Check for API errors
-                if isinstance(player_list, dict) and 'error' in player_list:
-                    logging.warning(f"API error for '{server_name}': {player_list.get('error')}")
-                    continue
-                
-                # Ensure player_list has the expected structure
-                if not isinstance(player_list, dict) or 'players' not in player_list:
-                    logging.warning(f"Unexpected player_list format for '{server_name}': {type(player_list)}")
-                    continue
-                
-                for player in player_list['players']:
-                    playerid = player['userId']
-                    if not await is_whitelisted(playerid):
-                        await api.kick_player(playerid, "You are not whitelisted.")
-                        logging.info(f"Player {playerid} kicked from server '{server_name}' for not being whitelisted.")
-                        
-                        if log_channel:
-                            kick_message = f"Player `{playerid}` was kicked from server {server_name} for not being whitelisted."
-                            embed = discord.Embed(title="Whitelist Check", description=kick_message, color=discord.Color.red(), timestamp=discord.utils.utcnow())
-                            await log_channel.send(embed=embed)
+    async def cog_load(self):
+        await load_whitelist()
 
-                logging.info(f"Whitelist checked for server '{server_name}'.")
-            except Exception as e:
-                logging.error(f"An unexpected error occurred while checking whitelist for server '{server_name}': {str(e)}")
+    async def guild_servers(self, guild_id: int):
+        return [row[0] for row in await fleet_servers(guild_id) or []]
 
-    @check_whitelist.before_loop
-    async def before_check_whitelist(self):
-        await self.bot.wait_until_ready()
+    async def server_names(self, interaction: discord.Interaction, current: str):
+        guild_id = interaction.guild.id
+        server_names = await server_autocomplete(guild_id, current)
+        return [app_commands.Choice(name=name, value=name) for name in server_names]
 
     @app_commands.command(name="add", description="Add a player to the whitelist.")
-    @app_commands.describe(playerid="The playerid of the player to whitelist.")
+    @app_commands.describe(playerid="The playerid of the player to whitelist.", server_name="Only whitelist on this server (default: every server in this guild).")
+    @app_commands.autocomplete(server_name=server_names)
     @app_commands.default_permissions(administrator=True)
     @app_commands.guild_only()
-    async def whitelist_add(self, interaction: discord.Interaction, playerid: str):
+    async def whitelist_add(self, interaction: discord.Interaction, playerid: str, server_name: str = None):
         await interaction.response.defer(thinking=True, ephemeral=True)
         try:
-            await add_whitelist(playerid, True)
-            await interaction.followup.send(f"Player {playerid} has been added to the whitelist.", ephemeral=True)
+            if server_name:
+                await add_server_whitelist(interaction.guild_id, server_name, playerid)
+                await interaction.followup.send(f"Player {playerid} has been added to the whitelist for {server_name}.", ephemeral=True)
+            else:
+                servers = await self.guild_servers(interaction.guild_id)
+                if not servers:
+                    await interaction.followup.send("No servers are set up in this guild.", ephemeral=True)
+                    return
+                await add_guild_whitelist(interaction.guild_id, servers, playerid)
+                await interaction.followup.send(f"Player {playerid} has been added to the whitelist on {len(servers)} servers.", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"An unexpected error occurred: {str(e)}", ephemeral=True)
             logging.error(f"An unexpected error occurred: {str(e)}")
 
     @app_commands.command(name="remove", description="Remove a player from the whitelist.")
-    @app_commands.describe(playerid="The playerid of the player to remove from the whitelist.")
+    @app_commands.describe(playerid="The playerid of the player to remove from the whitelist.", server_name="Only remove from this server's whitelist (default: every server in this guild).")
+    @app_commands.autocomplete(server_name=server_names)
     @app_commands.default_permissions(administrator=True)
     @app_commands.guild_only()
-    async def whitelist_remove(self, interaction: discord.Interaction, playerid: str):
+    async def whitelist_remove(self, interaction: discord.Interaction, playerid: str, server_name: str = None):
         await interaction.response.defer(thinking=True, ephemeral=True)
         try:
-            await remove_whitelist(playerid)
-            await interaction.followup.send(f"Player {playerid} has been removed from the whitelist.", ephemeral=True)
+            if server_name:
+                await remove_server_whitelist(interaction.guild_id, server_name, playerid)
+                await interaction.followup.send(f"Player {playerid} has been removed from the whitelist for {server_name}.", ephemeral=True)
+            else:
+                await remove_guild_whitelist(interaction.guild_id, playerid)
+                await interaction.followup.send(f"Player {playerid} has been removed from the whitelist on every server.", ephemeral=True)
         except Exception as e:
             await interaction.followup.send(f"An unexpected error occurred: {str(e)}", ephemeral=True)
             logging.error(f"An unexpected error occurred: {str(e)}")
 
-    async def server_names(self, interaction: discord.Interaction, current: str):
-        guild_id = interaction.guild.id
-        server_names = await server_autocomplete(guild_id, current)
-        return [app_commands.Choice(name=name, value=name) for name in server_names]
+    @app_commands.command(name="importwhitelist", description="Import a server whitelist from a CSV or JSON file.")
+    @app_commands.describe(file="CSV with player ids in the first column, or a JSON list.", server_name="The server the whitelist applies to (default: every server in this guild).", replace="Replace the current whitelist instead of adding to it.")
+    @app_commands.autocomplete(server_name=server_names)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def whitelist_import(self, interaction: discord.Interaction, file: discord.Attachment, server_name: str = None, replace: bool = False):
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        try:
+            if file.size > MAX_IMPORT_BYTES:
+                await interaction.followup.send(f"File is too large (max {MAX_IMPORT_BYTES // 1048576} MB).", ephemeral=True)
+                return
+            player_ids = parse_whitelist_file(file.filename, await file.read())
+            if not player_ids:
+                await interaction.followup.send("No player ids found in the file.", ephemeral=True)
+                return
+            servers = [server_name] if server_name else await self.guild_servers(interaction.guild_id)
+            if not servers:
+                await interaction.followup.send("No servers are set up in this guild.", ephemeral=True)
+                return
+            for server in servers:
+                count = await import_server_whitelist(interaction.guild_id, server, player_ids, replace)
+            target = server_name or f"{len(servers)} servers"
+            await interaction.followup.send(f"Imported {count} players into the whitelist for {target}" + (" (replaced)." if replace else "."), ephemeral=True)
+        except (ValueError, UnicodeDecodeError) as e:
+            await interaction.followup.send(f"Could not read {file.filename}: {str(e)}", ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"An unexpected error occurred: {str(e)}", ephemeral=True)
+            logging.error(f"An unexpected error occurred: {str(e)}")
+
+    @app_commands.command(name="exportwhitelist", description="Download a server whitelist as CSV or JSON.")
+    @app_commands.describe(server_name="The server whose whitelist to export.", fmt="File format")
+    @app_commands.choices(fmt=[app_commands.Choice(name="CSV", value="csv"), app_commands.Choice(name="JSON", value="json")])
+    @app_commands.autocomplete(server_name=server_names)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def whitelist_export(self, interaction: discord.Interaction, server_name: str, fmt: str = "csv"):
+        await interaction.response.defer(thinking=True, ephemeral=True)
+        try:
+            player_ids = await server_whitelist(interaction.guild_id, server_name)
+            data = format_whitelist_file(player_ids, fmt)
+            file = discord.File(io.BytesIO(data), filename=f"whitelist-{server_name}.{fmt}")
+            await interaction.followup.send(f"{len(player_ids)} players whitelisted on {server_name}.", file=file, ephemeral=True)
+        except Exception as e:
+            await interaction.followup.send(f"An unexpected error occurred: {str(e)}", ephemeral=True)
+            logging.error(f"An unexpected error occurred: {str(e)}")
 
     @app_commands.command(name="enable", description="Enable whitelist for a server.")
     @app_commands.describe(server_name="The name of the server to enable the whitelist for.")
@@ -2,27 +2,55 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 import os
+import asyncio
 import zipfile
 import datetime
 import logging
+import io
 from utils.database import (
     set_backup,
     del_backup,
     all_backups,
     server_autocomplete,
-    fetch_server_details
+    fetch_server_details,
+    add_backup_record,
+    set_backup_status,
+    cached_save_hashes,
+    store_save_parse,
+    latest_level_parse,
+    fetch_save_players,
+    fetch_save_guilds,
+    fetch_save_bases,
+    recent_backups,
+    fetch_backup,
+    diff_backup_files,
+    fetch_backup_file_hash,
+    save_parse_status,
+    prune_backup_history
 )
 from utils.servermodal import BackupModal
+from utils.backupverify import verify_archive
+from utils.savparser import inspect_archive
+from utils.backupdiff import build_report
+from utils.workers import run_in_process, shutdown_process_pool
 from palworld_api import PalworldAPI
 
+# Backup manifests (and the save data parsed from them) kept per server.
+HISTORY_KEEP = int(os.getenv("BACKUP_HISTORY_KEEP", 50))
+
 class BackupCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.last_run = {}
+        self.upload_locks = {}
+        self.pending = set()
         self.runloop.start()
 
     def cog_unload(self):
         self.runloop.cancel()
+        for task in self.pending:
+            task.cancel()
+        shutdown_process_pool()
 
     @tasks.loop(seconds=60)
     async def runloop(self):
@@ -79,25 +107,86 @@ class BackupCog(commands.Cog):
                                 z.write(meta_sav, "LevelMeta.sav")
 
                         file_size = os.path.getsize(zip_path)
-                        timestamp_dt = discord.utils.utcnow()
-                        discord_ts = f"<t:{int(timestamp_dt.timestamp())}:F>"
-
-                        embed = discord.Embed(
-                            title=f"Backup Completed - {name}",
-                            color=discord.Color.blurple(),
-                            description=f"Backup created successfully for **{name}**.\n"
+                        backup_id = await add_backup_record(gid, name, zip_name, file_size)
+                        task = asyncio.create_task(
+                            self.verify_and_upload(key, channel, backup_id, name, zip_path, zip_name, file_size)
                         )
-                        embed.add_field(name="Filename", value=zip_name, inline=False)
-                        embed.add_field(name="Size", value=f"{file_size / 1024:.2f} KB", inline=False)
-                        embed.add_field(name="Time", value=discord_ts, inline=False)
-                        embed.set_footer(text=discord.utils.utcnow())
-
-                        await channel.send(embed=embed)
-                        await channel.send(file=discord.File(zip_path))
-                        os.remove(zip_path)
-                        logging.info(f"Backup created and uploaded: {zip_path}")
+                        self.pending.add(task)
+                        task.add_done_callback(self.pending.discard)
                     except Exception as e:
-                        logging.error(f"Error creating or sending backup: {e}")
+                        logging.error(f"Error creating backup: {e}")
+
+    # Verification runs in a worker process so it overlaps with the upload of the
+    # previous archive; uploads for the same server are still serialized.
+    async def verify_and_upload(self, key, channel, backup_id, name, zip_path, zip_name, file_size):
+        inspection = None
+        try:
+            try:
+                result = await run_in_process(verify_archive, zip_path)
+            except Exception as e:
+                result = {"ok": False, "error": str(e), "files": []}
+
+            status = "verified" if result["ok"] else "failed"
+            await set_backup_status(backup_id, status, result["error"], result["files"])
+            if result["ok"]:
+                inspection = asyncio.create_task(self.inspect_saves(zip_path, result["files"]))
+
+            lock = self.upload_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                timestamp_dt = discord.utils.utcnow()
+                discord_ts = f"<t:{int(timestamp_dt.timestamp())}:F>"
+
+                if result["ok"]:
+                    embed = discord.Embed(
+                        title=f"Backup Completed - {name}",
+                        color=discord.Color.blurple(),
+                        description=f"Backup created successfully for **{name}**.\n"
+                    )
+                    embed.add_field(name="Verified", value=f"{len(result['files'])} files, CRC and SHA-256 checked", inline=False)
+                else:
+                    embed = discord.Embed(
+                        title=f"Backup Failed Verification - {name}",
+                        color=discord.Color.red(),
+                        description=f"Backup for **{name}** is corrupt and was not uploaded.\n"
+                    )
+                    embed.add_field(name="Error", value=result["error"][:1024], inline=False)
+                embed.add_field(name="Filename", value=zip_name, inline=False)
+                embed.add_field(name="Size", value=f"{file_size / 1024:.2f} KB", inline=False)
+                embed.add_field(name="Time", value=discord_ts, inline=False)
+                embed.set_footer(text=discord.utils.utcnow())
+
+                await channel.send(embed=embed)
+                if result["ok"]:
+                    await channel.send(file=discord.File(zip_path))
+            logging.info(f"Backup {status} and processed: {zip_path}")
+        except Exception as e:
+            logging.error(f"Error verifying or sending backup: {e}")
+        finally:
+            if inspection:
+                await inspection
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
+            try:
+                gid, _, server_name = key.partition("-")
+                await prune_backup_history(int(gid), server_name, HISTORY_KEEP)
+            except Exception as e:
+                logging.error(f"Error pruning backup history for {name}: {e}")
+
+    # Parsing is cached by file hash, so an unchanged Level.sav is never parsed twice.
+    async def inspect_saves(self, zip_path, files):
+        members = {f["path"]: f["sha256"] for f in files if f["path"] == "Level.sav"}
+        try:
+            cached = await cached_save_hashes(list(members.values()))
+            members = {path: sha for path, sha in members.items() if sha not in cached}
+            if not members:
+                return
+            results = await run_in_process(inspect_archive, zip_path, members)
+            for sha256, result in results.items():
+                await store_save_parse(sha256, result)
+                if not result["ok"]:
+                    logging.warning(f"Could not parse save {sha256}: {result['error']}")
+        except Exception as e:
+            logging.error(f"Error inspecting saves in {zip_path}: {e}")
 
     async def server_names(self, interaction: discord.Interaction, current: str):
         guild_id = interaction.guild.id
@@ -155,6 +244,112 @@ class BackupCog(commands.Cog):
             logging.error(f"Error wiping backups: {e}")
             await interaction.response.send_message("Failed to wipe backup configs.", ephemeral=True)
 
+    @backup_group.command(name="inspect", description="Show player data parsed from the latest backup.")
+    @app_commands.describe(server="Select the server name", player="Player name or UID to look up")
+    @app_commands.autocomplete(server=server_names)
+    async def inspectbackup(self, interaction: discord.Interaction, server: str, player: str = None):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            sha256 = await latest_level_parse(interaction.guild.id, server)
+            if not sha256:
+                await interaction.followup.send("No parsed save data for this server yet.", ephemeral=True)
+                return
+
+            players = await fetch_save_players(sha256)
+            guilds = {g[0]: g for g in await fetch_save_guilds(sha256)}
+            bases = await fetch_save_bases(sha256)
+
+            if player:
+                needle = player.lower()
+                match = next((p for p in players if p[0] == needle or p[1].lower() == needle), None)
+                if not match:
+                    await interaction.followup.send(f"Player not found in save: {player}", ephemeral=True)
+                    return
+                uid, nickname, level, guild_id, pal_count = match
+                guild = guilds.get(guild_id)
+                embed = discord.Embed(title=f"Save Data: {nickname}", color=discord.Color.blurple())
+                embed.add_field(name="Level", value=level)
+                embed.add_field(name="Pals", value=pal_count)
+                embed.add_field(name="Guild", value=guild[1] if guild else "None")
+                embed.add_field(name="Guild Bases", value=sum(1 for b in bases if b[1] == guild_id) if guild else 0)
+                embed.add_field(name="PlayerUID", value=f"```{uid}```", inline=False)
+            else:
+                top = sorted(players, key=lambda p: p[2], reverse=True)[:10]
+                embed = discord.Embed(title=f"Save Data: {server}", color=discord.Color.blurple())
+                embed.add_field(name="Players", value=len(players))
+                embed.add_field(name="Guilds", value=len(guilds))
+                embed.add_field(name="Bases", value=len(bases))
+                embed.add_field(
+                    name="Top Levels",
+                    value="\n".join(f"`{p[1]}` - Lv {p[2]} ({p[4]} pals)" for p in top) or "None",
+                    inline=False
+                )
+            embed.set_footer(text=f"Level.sav {sha256[:12]}")
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        except Exception as e:
+            logging.error(f"Error inspecting backup: {e}")
+            await interaction.followup.send(f"Failed to inspect backup: {e}", ephemeral=True)
+
+    async def backup_ids(self, interaction: discord.Interaction, current: str):
+        server = interaction.namespace.server
+        if not server:
+            return []
+        rows = await recent_backups(interaction.guild.id, server, current)
+        return [app_commands.Choice(name=f"{r[1]} ({r[2]})", value=r[0]) for r in rows]
+
+    async def load_entities(self, backup_id):
+        sha256 = await fetch_backup_file_hash(backup_id, "Level.sav")
+        if not sha256 or await save_parse_status(sha256) != "ok":
+            return None
+        return {
+            "players": await fetch_save_players(sha256),
+            "guilds": await fetch_save_guilds(sha256),
+            "bases": await fetch_save_bases(sha256)
+        }
+
+    @backup_group.command(name="diff", description="Compare two backups of a server.")
+    @app_commands.describe(server="Select the server name", older="Older backup (defaults to the previous one)", newer="Newer backup (defaults to the latest)")
+    @app_commands.autocomplete(server=server_names, older=backup_ids, newer=backup_ids)
+    async def diffbackups(self, interaction: discord.Interaction, server: str, older: int = None, newer: int = None):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            guild_id = interaction.guild.id
+            if older is None or newer is None:
+                verified = [r[0] for r in await recent_backups(guild_id, server) if r[2] == "verified"]
+                if newer is None and verified:
+                    newer = verified[0]
+                if older is None and newer is not None:
+                    older = next((b for b in verified if b < newer), None)
+
+            old_row = await fetch_backup(guild_id, server, older) if older else None
+            new_row = await fetch_backup(guild_id, server, newer) if newer else None
+            if not old_row or not new_row:
+                await interaction.followup.send("Need two backups of this server to compare.", ephemeral=True)
+                return
+
+            rows, total = await diff_backup_files(older, newer)
+            old_entities = await self.load_entities(older)
+            new_entities = await self.load_entities(newer) if old_entities else None
+            files, entities = await asyncio.to_thread(build_report, rows, old_entities, new_entities)
+
+            embed = discord.Embed(title=f"Backup Diff - {server}", color=discord.Color.blurple())
+            embed.add_field(name="Older", value=old_row[1], inline=False)
+            embed.add_field(name="Newer", value=new_row[1], inline=False)
+            embed.add_field(name="Changed Files", value=f"{len(rows)} of {total}")
+            embed.add_field(name="Entity Changes", value=len(entities) if entities is not None else "Save not parsed")
+            preview = "\n".join((entities or []) + files)
+            embed.description = f"```diff\n{preview[:3900]}\n```" if preview else "No differences."
+
+            report = ["# Files"] + files
+            if entities is not None:
+                report += ["", "# Entities"] + entities
+            report_file = io.StringIO("\n".join(report))
+            await interaction.followup.send(embed=embed, file=discord.File(report_file, filename=f"{server}_diff_{older}_{newer}.txt"), ephemeral=True)
+            report_file.close()
+        except Exception as e:
+            logging.error(f"Error diffing backups: {e}")
+            await interaction.followup.send(f"Failed to diff backups: {e}", ephemeral=True)
+
     @runloop.before_loop
     async def before_runloop(self):
         await self.bot.wait_until_ready()
@@ -0,0 +1,90 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+import datetime
+import io
+import time
+import logging
+import numpy as np
+from utils.database import (
+    server_autocomplete,
+    add_position_sample,
+    fetch_position_samples,
+    latest_position_sample,
+    prune_position_samples
+)
+from utils.charts import render_heatmap
+
+SAMPLE_SECONDS = 120
+KEEP_SECONDS = 30 * 86400
+
+class HeatmapCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.last_sample = {}
+        self.last_prune = 0
+        self.images = {}
+
+    # Every snapshot is 30s apart; keeping one in four is plenty for a heatmap.
+    @commands.Cog.listener()
+    async def on_player_snapshot(self, guild_id, server_name, players, joined, left):
+        now = time.time()
+        if not players or now - self.last_sample.get((guild_id, server_name), 0) < SAMPLE_SECONDS:
+            return
+        positions = []
+        for player in players:
+            try:
+                positions.append((float(player['location_x']), float(player['location_y'])))
+            except (KeyError, TypeError, ValueError):
+                continue
+        if not positions:
+            return
+        self.last_sample[(guild_id, server_name)] = now
+        try:
+            await add_position_sample(guild_id, server_name, now, np.array(positions).round().astype(np.int32).tobytes())
+            if now - self.last_prune >= 3600:
+                self.last_prune = now
+                await prune_position_samples(int(now - KEEP_SECONDS))
+        except Exception as e:
+            logging.error(f"Failed to record position sample for '{server_name}': {e}")
+
+    async def server_names(self, interaction: discord.Interaction, current: str):
+        server_names = await server_autocomplete(interaction.guild.id, current)
+        return [app_commands.Choice(name=name, value=name) for name in server_names]
+
+    @app_commands.command(name="heatmap", description="Show where players have been on a server.")
+    @app_commands.describe(server="The name of the server", hours="How many hours of samples to include", bins="Grid resolution")
+    @app_commands.autocomplete(server=server_names)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def heatmap(self, interaction: discord.Interaction, server: str, hours: app_commands.Range[int, 1, 720] = 168, bins: app_commands.Range[int, 50, 500] = 200):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            latest = await latest_position_sample(interaction.guild.id, server)
+            if latest is None:
+                await interaction.followup.send(f"No player positions recorded for '{server}' yet.", ephemeral=True)
+                return
+
+            # Reuse the last render until a newer sample has been written.
+            key = (interaction.guild.id, server)
+            cached = self.images.get(key)
+            if not cached or cached[:3] != (latest, hours, bins):
+                blobs = await fetch_position_samples(interaction.guild.id, server, int(time.time() - hours * 3600))
+                if not blobs:
+                    await interaction.followup.send(f"No player positions recorded in the last {hours} hours.", ephemeral=True)
+                    return
+                image, count = await asyncio.to_thread(render_heatmap, server, blobs, hours, bins)
+                cached = self.images[key] = (latest, hours, bins, image.getvalue(), count)
+
+            embed = discord.Embed(title=f"Player Heatmap - {server}", color=discord.Color.blurple())
+            embed.set_image(url="attachment://heatmap.png")
+            embed.set_footer(text=f"{cached[4]} samples | last sample")
+            embed.timestamp = datetime.datetime.fromtimestamp(latest, tz=datetime.timezone.utc)
+            await interaction.followup.send(embed=embed, file=discord.File(io.BytesIO(cached[3]), filename="heatmap.png"), ephemeral=True)
+        except Exception as e:
+            logging.error(f"Error rendering heatmap: {e}")
+            await interaction.followup.send(f"Failed to render heatmap: {e}", ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(HeatmapCog(bot))
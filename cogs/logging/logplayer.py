@@ -1,35 +1,87 @@
 import discord
 from discord.ext import commands, tasks
 from discord import app_commands
+import asyncio
 import datetime
 from utils.database import (
-    add_player,
+    add_players,
     fetch_all_servers,
     fetch_player,
     player_autocomplete,
     track_sessions,
-    get_player_session
+    get_player_session,
+    add_player_observations,
+    fetch_player_observations,
+    fetch_alt_evidence,
+    update_presence,
+    reset_presence,
+    fetch_presence
 )
-from utils.whitelist import is_whitelisted
+from utils.whitelist import whitelisted_servers
+from utils.alts import AltIndex, build_alt_indexes
+from utils.presence import PresenceIndex
 from palworld_api import PalworldAPI
 import logging
 
 class PlayerLoggingCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.alts = {}
+        self.observed = {}
+        self.presence = PresenceIndex()
         self.log_players.start()
 
+    async def cog_load(self):
+        await reset_presence()
+        self.alts = await asyncio.to_thread(build_alt_indexes, await fetch_player_observations())
+
     def cog_unload(self):
         self.log_players.cancel()
 
+    # Only writes when an online player's IP or account name differs from what
+    # was last recorded for them, which is usually once per session.
+    async def observe_players(self, guild_id, players, now):
+        rows = []
+        for player in players:
+            user_id, ip, account_name = player.get('userId'), player.get('ip') or "", player.get('accountName') or ""
+            if not user_id or self.observed.get((guild_id, user_id)) == (ip, account_name):
+                continue
+            self.observed[(guild_id, user_id)] = (ip, account_name)
+            index = self.alts.get(guild_id)
+            if index is None:
+                index = self.alts[guild_id] = AltIndex()
+            index.observe(user_id, ip, account_name)
+            rows.append((guild_id, user_id, ip, account_name, now))
+        if rows:
+            await add_player_observations(rows)
+
+    # The players row is written when someone joins, when their name, IP or
+    # level changes, and once more when they leave everywhere; ping and
+    # location in between are served from the presence index.
+    async def record_presence(self, guild_id, server_name, players, now):
+        key = (guild_id, server_name)
+        previous_online = self.presence.online(key)
+        joined, changed, left = self.presence.update(key, {player['userId']: player for player in players})
+        offline = [player for player in left if player['userId'] not in self.presence.where]
+        if joined or changed or offline:
+            await add_players(joined + changed + offline)
+        if joined or left:
+            await update_presence(guild_id, server_name, [(p['userId'], p['name']) for p in joined], [p['userId'] for p in left], now)
+        for player in left:
+            self.observed.pop((guild_id, player['userId']), None)
+        return previous_online
+
+    async def end_presence(self, guild_id, server_name, now):
+        previous_online = await self.record_presence(guild_id, server_name, [], now)
+        if previous_online:
+            await track_sessions(set(), previous_online, now)
+            self.bot.dispatch("player_snapshot", guild_id, server_name, [], set(), previous_online)
+
     @tasks.loop(seconds=30)
     async def log_players(self):
         servers = await fetch_all_servers()
         now = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
-        if not hasattr(self, 'server_online_cache'):
-            self.server_online_cache = {}
-
         for server in servers:
             guild_id, server_name, host, password, api_port, rcon_port = server
             try:
@@ -38,9 +90,7 @@ class PlayerLoggingCog(commands.Cog):
                 
                 # Check for API errors
                 if isinstance(player_list, dict) and 'error' in player_list:
-                    if server_name in self.server_online_cache:
-                        await track_sessions(set(), self.server_online_cache[server_name], now)
-                        del self.server_online_cache[server_name]
+                    await self.end_presence(guild_id, server_name, now)
                     logging.warning(f"API error for '{server_name}': {player_list.get('error')}")
                     continue
                 
@@ -50,25 +100,24 @@ class PlayerLoggingCog(commands.Cog):
                     continue
                 
                 current_online = set(player['userId'] for player in player_list['players'])
-                previous_online = self.server_online_cache.get(server_name, set())
-                self.server_online_cache[server_name] = current_online
-
-                for player in player_list['players']:
-                    await add_player(player)
+                previous_online = await self.record_presence(guild_id, server_name, player_list['players'], now)
+                await self.observe_players(guild_id, player_list['players'], now)
 
                 await track_sessions(current_online, previous_online, now)
+                self.bot.dispatch("player_snapshot", guild_id, server_name, player_list['players'], current_online - previous_online, previous_online - current_online)
 
             except Exception as e:
-                if server_name in self.server_online_cache:
-                    await track_sessions(set(), self.server_online_cache[server_name], now)
-                    del self.server_online_cache[server_name]
+                try:
+                    await self.end_presence(guild_id, server_name, now)
+                except Exception as inner:
+                    logging.error(f"Failed to end presence for '{server_name}': {str(inner)}")
                 logging.error(f"API unreachable for '{server_name}', sessions ended for tracked users: {str(e)}")
 
     async def player_autocomplete(self, interaction: discord.Interaction, current: str):
-        players = await player_autocomplete(current)
+        players = await player_autocomplete(current, 25)
         choices = [
             app_commands.Choice(name=f"{player[1]} (ID: {player[0]})", value=player[0])
-            for player in players[:25]
+            for player in players
         ]
         return choices
 
@@ -80,7 +129,7 @@ class PlayerLoggingCog(commands.Cog):
         player = await fetch_player(user)
         if player:
             session = await get_player_session(user)
-            whitelisted = await is_whitelisted(player[0])
+            whitelisted = await whitelisted_servers(interaction.guild.id, player[0])
             now = datetime.datetime.now(datetime.timezone.utc)
             total = session[1] if session else 0
             if session and session[2]:
@@ -90,23 +139,72 @@ class PlayerLoggingCog(commands.Cog):
             m = (total % 3600) // 60
             s = total % 60
             time_str = f"`{h}h {m}m {s}s`" if h else f"`{m}m {s}s`"
-            embed = self.player_embed(player, time_str, whitelisted)
+
+            # Live values from the presence index while online; the players
+            # row only holds what was recorded at join or leave.
+            live = [(key[1], p) for key, p in self.presence.locate(user) if key[0] == interaction.guild.id]
+            if live:
+                latest = live[0][1]
+                player = list(player)
+                player[5], player[6], player[7], player[8] = latest.get('ping'), latest.get('location_x'), latest.get('location_y'), latest.get('level')
+                status = "Online on " + ", ".join(f"`{server_name}`" for server_name, _ in live)
+            else:
+                presence = await fetch_presence(interaction.guild.id, user)
+                if presence:
+                    last_seen = datetime.datetime.fromisoformat(presence[0][3])
+                    status = f"Last seen on `{presence[0][0]}` <t:{int(last_seen.timestamp())}:R>"
+                else:
+                    status = "Offline"
+            embed = self.player_embed(player, time_str, whitelisted, status)
             await interaction.response.send_message(embed=embed, ephemeral=True)
         else:
             await interaction.response.send_message("Player not found.", ephemeral=True)
 
-    def player_embed(self, player, time_str, whitelisted):
-        embed = discord.Embed(title=f"Player: {player[1]} ({player[2]})", color=discord.Color.blurple())
+    def player_embed(self, player, time_str, whitelisted, status):
+        embed = discord.Embed(title=f"Player: {player[1]} ({player[2]})", description=status, color=discord.Color.blurple())
         embed.add_field(name="Level", value=player[8])
         embed.add_field(name="Ping", value=player[5])
         embed.add_field(name="Location", value=f"({player[6]}, {player[7]})")
-        embed.add_field(name="Whitelisted", value="Yes" if whitelisted else "No")
+        embed.add_field(name="Whitelisted", value=", ".join(f"`{server_name}`" for server_name in whitelisted)[:1024] if whitelisted else "No")
         embed.add_field(name="PlayerID", value=f"```{player[0]}```", inline=False)
         embed.add_field(name="PlayerUID", value=f"```{player[3]}```", inline=False)
         embed.add_field(name="PlayerIP", value=f"```{player[4]}```", inline=False)
         embed.add_field(name="Playtime", value=time_str)
         return embed
 
+    @app_commands.command(name="alts", description="Find accounts that share an IP or account name with a player")
+    @app_commands.autocomplete(user=player_autocomplete)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def player_alts(self, interaction: discord.Interaction, user: str):
+        index = self.alts.get(interaction.guild.id)
+        cluster = index.cluster(user) if index else [user]
+        if len(cluster) < 2:
+            await interaction.response.send_message("No linked accounts found.", ephemeral=True)
+            return
+
+        # Shared IPs chain through VPNs and households, so show what links each
+        # account rather than only the list.
+        shown = [user] + sorted(u for u in cluster if u != user)[:99]
+        rows = await fetch_alt_evidence(interaction.guild.id, shown)
+        names, ips, accounts = {}, {}, {}
+        for user_id, ip, account_name, first_seen, name in rows:
+            names[user_id] = name or user_id
+            if ip:
+                ips.setdefault(ip, set()).add(user_id)
+            if account_name:
+                accounts.setdefault(account_name, set()).add(user_id)
+
+        lines = []
+        for user_id in shown[1:]:
+            links = [f"IP `{ip}`" for ip, users in ips.items() if user_id in users and len(users) > 1]
+            links += [f"account `{account}`" for account, users in accounts.items() if user_id in users and len(users) > 1]
+            lines.append(f"**{names.get(user_id, user_id)}** (`{user_id}`): " + (", ".join(links[:3]) or "linked through other accounts"))
+
+        embed = discord.Embed(title=f"Linked Accounts: {names.get(user, user)}", description="\n".join(lines)[:4000], color=discord.Color.orange())
+        embed.set_footer(text=f"{len(cluster) - 1} linked accounts" + (f", showing {len(shown) - 1}" if len(cluster) > len(shown) else ""))
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @log_players.before_loop
     async def before_log_players(self):
         await self.bot.wait_until_ready()
@@ -0,0 +1,132 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+import time
+import logging
+from palworld_api import PalworldAPI
+from utils.database import (
+    server_autocomplete,
+    fetch_server_details,
+    fetch_logchannel,
+    set_movement_check,
+    del_movement_check,
+    all_movement_checks
+)
+from utils.movement import MovementTracker
+
+class MovementCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.trackers = {}
+        self.checks = None
+
+    async def load_checks(self):
+        self.checks = {(row[0], row[1]): row[2:] for row in await all_movement_checks()}
+        for key in [k for k in self.trackers if k not in self.checks]:
+            del self.trackers[key]
+
+    @commands.Cog.listener()
+    async def on_player_snapshot(self, guild_id, server_name, players, joined, left):
+        if self.checks is None:
+            await self.load_checks()
+        check = self.checks.get((guild_id, server_name))
+        if not check:
+            return
+        max_speed, strikes, kick = check
+
+        positions = {}
+        for player in players:
+            try:
+                positions[player['userId']] = (float(player['location_x']), float(player['location_y']))
+            except (KeyError, TypeError, ValueError):
+                continue
+        tracker = self.trackers.setdefault((guild_id, server_name), MovementTracker())
+        flagged = tracker.observe(time.time(), positions, max_speed)
+
+        # Alert once, on the poll where a player reaches the strike limit.
+        offenders = [f for f in flagged if f[3] == strikes]
+        if offenders:
+            names = {p['userId']: p.get('name', p['userId']) for p in players}
+            await self.handle_offenders(guild_id, server_name, offenders, names, kick)
+
+    async def handle_offenders(self, guild_id, server_name, offenders, names, kick):
+        details = await fetch_server_details(guild_id, server_name)
+        if kick and details:
+            api = PalworldAPI(f"http://{details[2]}:{details[4]}", details[3])
+            results = await asyncio.gather(
+                *(api.kick_player(userid, "Abnormal movement detected.") for userid, *_ in offenders),
+                return_exceptions=True
+            )
+            for (userid, *_), result in zip(offenders, results):
+                if isinstance(result, Exception) or (isinstance(result, dict) and "error" in result):
+                    logging.error(f"Failed to kick {userid} from '{server_name}' for abnormal movement: {result}")
+
+        for userid, speed, distance, count in offenders:
+            logging.info(f"Abnormal movement for {userid} on '{server_name}': {speed:.0f} u/s over {count} polls")
+
+        log_channel_id = await fetch_logchannel(guild_id, server_name)
+        log_channel = self.bot.get_channel(log_channel_id) if log_channel_id else None
+        if log_channel:
+            lines = [f"`{names.get(userid, userid)}` ({userid}) - {speed / 100:.0f} m/s, moved {distance / 100:.0f}m" for userid, speed, distance, _ in offenders]
+            embed = discord.Embed(
+                title="Abnormal Movement" + (" - Kicked" if kick else ""),
+                description=f"Server: {server_name}\n" + "\n".join(lines),
+                color=discord.Color.red(),
+                timestamp=discord.utils.utcnow()
+            )
+            await log_channel.send(embed=embed)
+
+    async def server_names(self, interaction: discord.Interaction, current: str):
+        server_names = await server_autocomplete(interaction.guild.id, current)
+        return [app_commands.Choice(name=name, value=name) for name in server_names]
+
+    movement_group = app_commands.Group(name="movement", description="Detect speed hacks and teleports", default_permissions=discord.Permissions(administrator=True), guild_only=True)
+
+    @movement_group.command(name="setup", description="Flag players moving faster than a limit.")
+    @app_commands.describe(server="The name of the server", max_speed="Fastest allowed speed in meters per second", strikes="Polls in a row over the limit before acting", kick="Kick flagged players")
+    @app_commands.autocomplete(server=server_names)
+    async def movement_setup(self, interaction: discord.Interaction, server: str, max_speed: app_commands.Range[float, 1.0, 1000.0] = 50.0, strikes: app_commands.Range[int, 1, 10] = 2, kick: bool = False):
+        try:
+            if not await fetch_server_details(interaction.guild.id, server):
+                await interaction.response.send_message(f"Server '{server}' configuration not found.", ephemeral=True)
+                return
+            await set_movement_check(interaction.guild.id, server, max_speed * 100, strikes, kick)
+            await self.load_checks()
+            await interaction.response.send_message(f"Movement checks enabled for `{server}` at {max_speed:g} m/s.", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Failed to set movement check: {e}")
+            await interaction.response.send_message(f"Failed: {e}", ephemeral=True)
+
+    @movement_group.command(name="remove", description="Stop movement checks for a server.")
+    @app_commands.describe(server="The name of the server")
+    @app_commands.autocomplete(server=server_names)
+    async def movement_remove(self, interaction: discord.Interaction, server: str):
+        try:
+            await del_movement_check(interaction.guild.id, server)
+            await self.load_checks()
+            await interaction.response.send_message("Movement checks removed.", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Error removing movement check: {e}")
+            await interaction.response.send_message("Failed to remove movement checks.", ephemeral=True)
+
+    @movement_group.command(name="status", description="Show the fastest movers on a server.")
+    @app_commands.describe(server="The name of the server")
+    @app_commands.autocomplete(server=server_names)
+    async def movement_status(self, interaction: discord.Interaction, server: str):
+        tracker = self.trackers.get((interaction.guild.id, server))
+        if not tracker or not tracker.rows:
+            await interaction.response.send_message(f"No movement tracked for '{server}' yet.", ephemeral=True)
+            return
+        speeds = sorted(tracker.speeds().items(), key=lambda s: -s[1][1])
+        strikes = {userid: int(tracker.strikes[row]) for userid, row in tracker.rows.items()}
+        lines = [
+            f"`{userid}` now {latest / 100:.0f} m/s, peak {peak / 100:.0f} m/s, strikes {strikes[userid]}"
+            for userid, (latest, peak) in speeds[:20] if peak >= 0
+        ]
+        embed = discord.Embed(title=f"Movement - {server}", description="\n".join(lines) or "Not enough polls yet.", color=discord.Color.blurple())
+        embed.set_footer(text=f"{len(tracker.rows)} players tracked over the last {tracker.history} polls")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(MovementCog(bot))
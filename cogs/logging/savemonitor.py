@@ -0,0 +1,222 @@
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+import os
+import asyncio
+import datetime
+import logging
+from palworld_api import PalworldAPI
+from utils.database import (
+    server_autocomplete,
+    fetch_server_details,
+    set_save_monitor,
+    del_save_monitor,
+    all_save_monitors,
+    add_save_samples,
+    fetch_save_series,
+    rollup_save_series
+)
+from utils.charts import render_growth_chart
+
+# How long each tier of save_series is kept before being folded into the next.
+RAW_KEEP_SECONDS = 2 * 86400
+FIVE_MIN_KEEP_SECONDS = 30 * 86400
+
+class SaveState:
+    def __init__(self):
+        self.first_check_time = None
+        self.last_mod_time = None
+        self.failure_count = 0
+        self.last_gap = None
+        self.last_duration = None
+
+# Stats every monitored save folder in one worker-thread call per tick.
+def stat_saves(paths):
+    results = {}
+    for path in paths:
+        level_sav = os.path.join(path, "Level.sav")
+        try:
+            level_stat = os.stat(level_sav)
+        except OSError:
+            results[path] = None
+            continue
+        mtimes = [level_stat.st_mtime]
+        try:
+            mtimes.append(os.stat(os.path.join(path, "LevelMeta.sav")).st_mtime)
+        except OSError:
+            pass
+        try:
+            with os.scandir(os.path.join(path, "Players")) as entries:
+                mtimes.extend(e.stat().st_mtime for e in entries if e.is_file())
+        except OSError:
+            pass
+        results[path] = (level_stat.st_mtime, level_stat.st_size, mtimes)
+    return results
+
+class SaveMonitor(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.states = {}
+        self.last_rollup = 0
+        self.monitor_loop.start()
+
+    def cog_unload(self):
+        self.monitor_loop.cancel()
+
+    @tasks.loop(seconds=60)
+    async def monitor_loop(self):
+        try:
+            monitors = await all_save_monitors()
+            if not monitors:
+                return
+
+            now = datetime.datetime.utcnow().timestamp()
+            stats = await asyncio.to_thread(stat_saves, {m[2] for m in monitors})
+            samples = []
+            remediations = []
+
+            for gid, name, save_path, stall_seconds, threshold, host, password, api_port in monitors:
+                stat = stats.get(save_path)
+                if stat is None:
+                    continue
+                mod_time, size, mtimes = stat
+                state = self.states.setdefault((gid, name), SaveState())
+
+                if state.first_check_time is None:
+                    state.first_check_time = now
+                    state.last_mod_time = mod_time
+                    continue
+
+                if mod_time != state.last_mod_time:
+                    # Files written since the previous save bracket how long this save took.
+                    written = [m for m in mtimes if m > state.last_mod_time]
+                    state.last_gap = mod_time - state.last_mod_time
+                    state.last_duration = max(written) - min(written) if written else 0.0
+                    samples.append((gid, name, mod_time, size, state.last_gap, state.last_duration))
+
+                if now - state.first_check_time >= stall_seconds and now - mod_time > stall_seconds and state.last_mod_time == mod_time:
+                    state.failure_count += 1
+                    logging.warning(f"Detected save stall attempt {state.failure_count}/{threshold} for '{name}'")
+                else:
+                    state.failure_count = 0
+
+                state.last_mod_time = mod_time
+
+                if state.failure_count >= threshold:
+                    remediations.append(self.restart_server(name, host, password, api_port))
+                    state.failure_count = 0
+                    state.first_check_time = now
+
+            if samples:
+                await add_save_samples(samples)
+            if remediations:
+                await asyncio.gather(*remediations)
+            if now - self.last_rollup >= 3600:
+                self.last_rollup = now
+                await rollup_save_series(0, 300, int(now - RAW_KEEP_SECONDS) // 300 * 300)
+                await rollup_save_series(300, 3600, int(now - FIVE_MIN_KEEP_SECONDS) // 3600 * 3600)
+
+        except Exception as e:
+            logging.exception(f"Exception occurred in save monitor loop: {e}")
+
+    async def restart_server(self, name, host, password, api_port):
+        try:
+            api = PalworldAPI(f"http://{host}:{api_port}", password)
+            await api.shutdown_server(30, "Save stalled! Restarting in 30 seconds!")
+            logging.info(f"Server '{name}' save file is stalled. Restarting server.")
+        except Exception as e:
+            logging.error(f"Failed to restart stalled server '{name}': {e}")
+
+    async def server_names(self, interaction: discord.Interaction, current: str):
+        guild_id = interaction.guild.id
+        names = await server_autocomplete(guild_id, current)
+        return [app_commands.Choice(name=n, value=n) for n in names]
+
+    savemonitor_group = app_commands.Group(name="savemonitor", description="Watch server saves and restart stalled servers", default_permissions=discord.Permissions(administrator=True), guild_only=True)
+
+    @savemonitor_group.command(name="setup", description="Watch a server's save folder for stalls.")
+    @app_commands.describe(server="Select the server name", path="Full path to the save folder containing Level.sav", stall_seconds="Seconds without a save before it counts as stalled", threshold="Stalled checks in a row before restarting")
+    @app_commands.autocomplete(server=server_names)
+    async def setupmonitor(self, interaction: discord.Interaction, server: str, path: str, stall_seconds: int = 300, threshold: int = 3):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            if not await fetch_server_details(interaction.guild.id, server):
+                await interaction.followup.send(f"Server '{server}' configuration not found.", ephemeral=True)
+                return
+            if not os.path.isfile(os.path.join(path, "Level.sav")):
+                await interaction.followup.send(f"No Level.sav found in `{path}`.", ephemeral=True)
+                return
+            await set_save_monitor(interaction.guild.id, server, path, stall_seconds, threshold)
+            self.states.pop((interaction.guild.id, server), None)
+            await interaction.followup.send(f"Save monitor enabled for `{server}`.", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Failed to set save monitor: {e}")
+            await interaction.followup.send(f"Failed: {e}", ephemeral=True)
+
+    @savemonitor_group.command(name="remove", description="Stop watching a server's saves.")
+    @app_commands.describe(server="Select the server name")
+    @app_commands.autocomplete(server=server_names)
+    async def removemonitor(self, interaction: discord.Interaction, server: str):
+        try:
+            await del_save_monitor(interaction.guild.id, server)
+            self.states.pop((interaction.guild.id, server), None)
+            await interaction.response.send_message("Save monitor removed.", ephemeral=True)
+        except Exception as e:
+            logging.error(f"Error removing save monitor: {e}")
+            await interaction.response.send_message("Failed to remove save monitor.", ephemeral=True)
+
+    @savemonitor_group.command(name="status", description="Show save cadence and duration for a server.")
+    @app_commands.describe(server="Select the server name")
+    @app_commands.autocomplete(server=server_names)
+    async def monitorstatus(self, interaction: discord.Interaction, server: str):
+        await interaction.response.defer(ephemeral=True)
+        now = datetime.datetime.utcnow().timestamp()
+        rows = await fetch_save_series(interaction.guild.id, server, int(now - 86400))
+        state = self.states.get((interaction.guild.id, server))
+        if not rows:
+            await interaction.followup.send("No saves recorded for this server in the last day.", ephemeral=True)
+            return
+
+        saves = sum(r[2] for r in rows)
+        embed = discord.Embed(title=f"Save Monitor - {server}", color=discord.Color.blurple())
+        embed.add_field(name="Last Save", value=f"<t:{rows[-1][0]}:R>")
+        embed.add_field(name="Level.sav Size", value=f"{rows[-1][4] / 1048576:.2f} MB")
+        embed.add_field(name="Avg Interval", value=f"{sum(r[5] * r[2] for r in rows) / saves:.1f}s")
+        embed.add_field(name="Max Interval", value=f"{max(r[6] for r in rows):.1f}s")
+        embed.add_field(name="Avg Duration", value=f"{sum(r[7] * r[2] for r in rows) / saves:.1f}s")
+        embed.add_field(name="Max Duration", value=f"{max(r[8] for r in rows):.1f}s")
+        embed.add_field(name="Stall Checks", value=state.failure_count if state else 0)
+        embed.set_footer(text=f"{saves} saves in the last 24 hours")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @savemonitor_group.command(name="growth", description="Chart Level.sav size and save duration over time.")
+    @app_commands.describe(server="Select the server name", days="How many days to chart")
+    @app_commands.autocomplete(server=server_names)
+    async def monitorgrowth(self, interaction: discord.Interaction, server: str, days: app_commands.Range[int, 1, 365] = 7):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            now = datetime.datetime.utcnow().timestamp()
+            rows = await fetch_save_series(interaction.guild.id, server, int(now - days * 86400))
+            if len(rows) < 2:
+                await interaction.followup.send("Not enough saves recorded to chart yet.", ephemeral=True)
+                return
+
+            image = await asyncio.to_thread(render_growth_chart, server, rows)
+            span_days = max((rows[-1][0] - rows[0][0]) / 86400, 1 / 24)
+            growth = (rows[-1][3] - rows[0][3]) / 1048576 / span_days
+
+            embed = discord.Embed(title=f"Save Growth - {server}", color=discord.Color.blurple())
+            embed.add_field(name="Current Size", value=f"{rows[-1][4] / 1048576:.2f} MB")
+            embed.add_field(name="Growth", value=f"{growth:+.2f} MB/day")
+            embed.set_image(url="attachment://growth.png")
+            await interaction.followup.send(embed=embed, file=discord.File(image, filename="growth.png"), ephemeral=True)
+        except Exception as e:
+            logging.error(f"Error charting save growth: {e}")
+            await interaction.followup.send(f"Failed to chart save growth: {e}", ephemeral=True)
+
+    @monitor_loop.before_loop
+    async def before_monitor_loop(self):
+        await self.bot.wait_until_ready()
+
+async def setup(bot):
+    await bot.add_cog(SaveMonitor(bot))
@@ -1,9 +1,10 @@
 import json
+import re
 import discord
 from discord.ext import commands
 from discord import app_commands
-import asyncio
-from utils.rconutility import RconUtility
+from utils.rconutility import get_scheduler
+from utils.kitdelivery import deliver_to_many, validate_kit, KIT_RATE, KIT_CONCURRENCY
 from utils.database import (
     fetch_server_details,
     server_autocomplete,
@@ -35,9 +36,11 @@ class KitModal(discord.ui.Modal):
             await interaction.response.send_message("Kit name is required.", ephemeral=True)
             return
         try:
-            json.loads(commands_data)
+            error = validate_kit(json.loads(commands_data))
         except json.JSONDecodeError:
-            await interaction.response.send_message("Commands must be valid JSON.", ephemeral=True)
+            error = "Commands must be valid JSON."
+        if error:
+            await interaction.response.send_message(error, ephemeral=True)
             return
         await save_kit(kit_name, commands_data, desc)
         await interaction.response.send_message(f"Kit '{kit_name}' has been saved.", ephemeral=True)
@@ -45,7 +48,6 @@ class KitModal(discord.ui.Modal):
 class KitsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.rcon = RconUtility()
 
     async def get_server_info(self, guild_id: int, server_name: str):
         details = await fetch_server_details(guild_id, server_name)
@@ -57,35 +59,83 @@ class KitsCog(commands.Cog):
         results = await server_autocomplete(guild_id, current)
         return [app_commands.Choice(name=x, value=x) for x in results[:25]]
 
-    @app_commands.command(name="givekit", description="Give a kit to a user")
-    @app_commands.describe(userid="User ID", kit_name="Kit Name", server="Server Name")
-    @app_commands.autocomplete(server=autocomplete_server, kit_name=autocomplete_kits)
-    @app_commands.default_permissions(administrator=True)
-    @app_commands.guild_only()
-    async def givekit(self, interaction: discord.Interaction, userid: str, kit_name: str, server: str):
-        await interaction.response.defer(ephemeral=True)
+    async def load_kit(self, interaction: discord.Interaction, kit_name: str, server: str):
         if not interaction.guild:
             await interaction.followup.send("No guild.", ephemeral=True)
-            return
+            return None, None
         server_info = await self.get_server_info(interaction.guild.id, server)
         if not server_info:
             await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
-            return
+            return None, None
         kit = await get_kit(kit_name)
         if not kit:
             await interaction.followup.send(f"Kit not found: {kit_name}", ephemeral=True)
-            return
+            return None, None
         commands_str, desc = kit
         try:
             commands_list = json.loads(commands_str)
         except json.JSONDecodeError:
             await interaction.followup.send("Commands data is not valid JSON.", ephemeral=True)
+            return None, None
+        if not isinstance(commands_list, list):
+            await interaction.followup.send("Commands data must be a JSON list.", ephemeral=True)
+            return None, None
+        return server_info, commands_list
+
+    def delivery_embed(self, kit_name: str, server: str, results: dict):
+        total = sum(len(r) for r in results.values())
+        sent = sum(1 for r in results.values() for _, ok, _ in r if ok)
+        complete = [u for u, r in results.items() if all(ok for _, ok, _ in r)]
+        embed = discord.Embed(
+            title=f"Kit '{kit_name}' on {server}",
+            color=discord.Color.green() if sent == total else discord.Color.orange()
+        )
+        embed.add_field(name="Players", value=f"{len(complete)}/{len(results)} complete")
+        embed.add_field(name="Commands", value=f"{sent}/{total} sent")
+        failures = [
+            f"`{userid}` {cmd}: {response}"
+            for userid, r in results.items()
+            for cmd, ok, response in r if not ok
+        ]
+        if failures:
+            embed.add_field(name="Failures", value="\n".join(failures)[:1024], inline=False)
+        if len(results) == 1:
+            responses = "\n".join(f"{cmd}: {response}" for cmd, ok, response in next(iter(results.values())) if ok and response)
+            if responses:
+                embed.description = responses[:4000]
+        return embed
+
+    @app_commands.command(name="givekit", description="Give a kit to a user")
+    @app_commands.describe(userid="User ID", kit_name="Kit Name", server="Server Name", rate="Commands per second, up to the server limit (KIT_RATE)")
+    @app_commands.autocomplete(server=autocomplete_server, kit_name=autocomplete_kits)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def givekit(self, interaction: discord.Interaction, userid: str, kit_name: str, server: str, rate: app_commands.Range[float, 0.1, 50.0] = KIT_RATE):
+        await interaction.response.defer(ephemeral=True)
+        server_info, commands_list = await self.load_kit(interaction, kit_name, server)
+        if not server_info:
+            return
+        scheduler = get_scheduler(server_info["host"], server_info["port"], server_info["password"])
+        results = await deliver_to_many(scheduler, commands_list, [userid], rate)
+        await interaction.followup.send(embed=self.delivery_embed(kit_name, server, results), ephemeral=True)
+
+    @app_commands.command(name="givekitmany", description="Give a kit to several users at once")
+    @app_commands.describe(userids="User IDs separated by commas or spaces", kit_name="Kit Name", server="Server Name", rate="Commands per second, up to the server limit (KIT_RATE)", concurrency="Players served at the same time")
+    @app_commands.autocomplete(server=autocomplete_server, kit_name=autocomplete_kits)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def givekitmany(self, interaction: discord.Interaction, userids: str, kit_name: str, server: str, rate: app_commands.Range[float, 0.1, 50.0] = KIT_RATE, concurrency: app_commands.Range[int, 1, 16] = KIT_CONCURRENCY):
+        await interaction.response.defer(ephemeral=True)
+        ids = list(dict.fromkeys(u for u in re.split(r"[\s,]+", userids) if u))
+        if not ids:
+            await interaction.followup.send("No user IDs given.", ephemeral=True)
+            return
+        server_info, commands_list = await self.load_kit(interaction, kit_name, server)
+        if not server_info:
             return
-        for cmd_template in commands_list:
-            final_cmd = cmd_template.format(userid=userid)
-            await self.rcon.rcon_command(server_info["host"], server_info["port"], server_info["password"], final_cmd)
-            await asyncio.sleep(1)
-        await interaction.followup.send(f"Kit '{kit_name}' given to {userid} on '{server}'.", ephemeral=True)
+        scheduler = get_scheduler(server_info["host"], server_info["port"], server_info["password"])
+        results = await deliver_to_many(scheduler, commands_list, ids, rate, concurrency)
+        await interaction.followup.send(embed=self.delivery_embed(kit_name, server, results), ephemeral=True)
 
     @app_commands.command(name="managekit", description="Create or update a kit.")
     @app_commands.describe(kit_name="Kit name (optional). If it exists, it will be loaded.")
@@ -1,34 +1,26 @@
-import os
-import json
 import discord
+import asyncio
+import time
 from discord.ext import commands
 from discord import app_commands
-from utils.rconutility import RconUtility
-from utils.database import fetch_server_details, server_autocomplete
+from utils.rconutility import RconUtility, get_scheduler, INTERACTIVE, BULK
+from utils.gamedata import get_gamedata
+from utils.pdexport import ExportCache, ExportError, read_export, parse_guilds, parse_pals
+from utils.apiutility import get_api_instance
+from utils.database import fetch_server_details, server_autocomplete, fetch_export_dir, set_export_dir, del_export_dir
 
 class PalDefenderCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.rcon = RconUtility()
-        self.pals = []
-        self.items = []
-        self.load_pals()
-        self.load_items()
-
-    def load_pals(self):
-        path = os.path.join("gamedata", "pals.json")
-        with open(path, "r", encoding="utf-8") as f:
-            self.pals = json.load(f).get("pals", [])
-
-    def load_items(self):
-        path = os.path.join("gamedata", "items.json")
-        with open(path, "r", encoding="utf-8") as f:
-            self.items = json.load(f).get("items", [])
+        self.pals = get_gamedata("pals")
+        self.items = get_gamedata("items")
+        self.exports = ExportCache()
 
     async def get_server_info(self, guild_id: int, server_name: str):
         details = await fetch_server_details(guild_id, server_name)
         if details:
-            return {"host": details[2], "password": details[3], "port": details[5]}
+            return {"host": details[2], "password": details[3], "port": details[5], "export_dir": await fetch_export_dir(guild_id, server_name)}
 
     async def autocomplete_server(self, interaction: discord.Interaction, current: str):
         guild_id = interaction.guild.id if interaction.guild else 0
@@ -36,24 +28,12 @@ class PalDefenderCog(commands.Cog):
         return [app_commands.Choice(name=name, value=name) for name in server_names[:25]]
 
     async def autocomplete_pal(self, interaction: discord.Interaction, current: str):
-        results = []
-        for pal in self.pals:
-            name = pal.get("name", "")
-            dev_name = pal.get("id", "")
-            if current.lower() in name.lower() or current.lower() in dev_name.lower():
-                display = f"{name} ({dev_name})"
-                results.append(app_commands.Choice(name=display, value=dev_name))
-        return results[:15]
+        pals = await self.pals.ready()
+        return [app_commands.Choice(name=f"{pal.name} ({pal.id})", value=pal.id) for pal in pals.search(current, 15)]
 
     async def autocomplete_item(self, interaction: discord.Interaction, current: str):
-        results = []
-        for item in self.items:
-            name = item.get("name", "")
-            item_id = item.get("id", "")
-            if current.lower() in name.lower() or current.lower() in item_id.lower():
-                display = f"{name} ({item_id})"
-                results.append(app_commands.Choice(name=display, value=item_id))
-        return results[:15]
+        items = await self.items.ready()
+        return [app_commands.Choice(name=f"{item.name} ({item.id})", value=item.id) for item in items.search(current, 15)]
 
     @app_commands.command(name="reloadcfg", description="Reload server config")
     @app_commands.describe(server="Server name")
@@ -120,11 +100,11 @@ class PalDefenderCog(commands.Cog):
         if not info:
             await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
             return
-        pal_data = next((x for x in self.pals if x["id"] == palid or x["name"] == palid), None)
+        pal_data = (await self.pals.ready()).find(palid)
         if not pal_data:
             await interaction.followup.send(f"Pal not found: {palid}", ephemeral=True)
             return
-        cmd = f"givepal {userid} {pal_data['id']} {level}"
+        cmd = f"givepal {userid} {pal_data.id} {level}"
         response = await self.rcon.rcon_command(info["host"], info["port"], info["password"], cmd)
         embed = discord.Embed(title=f"GivePal on {server}")
         embed.description = response
@@ -144,11 +124,11 @@ class PalDefenderCog(commands.Cog):
         if not info:
             await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
             return
-        item_data = next((x for x in self.items if x["id"] == itemid or x["name"] == itemid), None)
+        item_data = (await self.items.ready()).find(itemid)
         if not item_data:
             await interaction.followup.send(f"Item not found: {itemid}", ephemeral=True)
             return
-        cmd = f"give {userid} {item_data['id']} {amount}"
+        cmd = f"give {userid} {item_data.id} {amount}"
         response = await self.rcon.rcon_command(info["host"], info["port"], info["password"], cmd)
         embed = discord.Embed(title=f"GiveItem on {server}")
         embed.description = response
@@ -168,11 +148,11 @@ class PalDefenderCog(commands.Cog):
         if not info:
             await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
             return
-        item_data = next((x for x in self.items if x["id"] == itemid or x["name"] == itemid), None)
+        item_data = (await self.items.ready()).find(itemid)
         if not item_data:
             await interaction.followup.send(f"Item not found: {itemid}", ephemeral=True)
             return
-        cmd = f"delitem {userid} {item_data['id']} {amount}"
+        cmd = f"delitem {userid} {item_data.id} {amount}"
         response = await self.rcon.rcon_command(info["host"], info["port"], info["password"], cmd)
         embed = discord.Embed(title=f"DeleteItem on {server}")
         embed.description = response
@@ -199,12 +179,46 @@ class PalDefenderCog(commands.Cog):
         await interaction.followup.send(embed=embed, ephemeral=True)
 
     # export pals player userid
+    async def export_guilds(self, guild_id: int, server: str, info: dict, refresh: bool = False):
+        async def load():
+            response = await get_scheduler(info["host"], info["port"], info["password"]).submit("exportguilds")
+            return await read_export(response, parse_guilds, info["export_dir"])
+        return await self.exports.get((guild_id, server, "guilds"), load, refresh)
+
+    async def export_pals(self, guild_id: int, server: str, info: dict, userid: str, refresh: bool = False, priority: int = INTERACTIVE):
+        async def load():
+            response = await get_scheduler(info["host"], info["port"], info["password"]).submit(f"exportpals {userid}", priority)
+            return await read_export(response, parse_pals, info["export_dir"])
+        return await self.exports.get((guild_id, server, "pals", userid), load, refresh)
+
+    # Falls back to the raw RCON reply, as these commands showed before
+    # exports were parsed, when the export file can't be used.
+    async def export_failed(self, interaction: discord.Interaction, title: str, error: Exception):
+        if isinstance(error, ExportError) and error.response:
+            embed = discord.Embed(title=title, description=error.response[:4000])
+            embed.set_footer(text=str(error)[:2048])
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        else:
+            await interaction.followup.send(f"Export failed: {error}", ephemeral=True)
+
+    def species_name(self, species: str):
+        pal = self.pals.find(species)
+        return pal.name if pal else species
+
+    async def autocomplete_guild(self, interaction: discord.Interaction, current: str):
+        cached = self.exports.peek((interaction.guild.id, interaction.namespace.server, "guilds"))
+        if not cached:
+            return []
+        current = current.lower()
+        names = sorted({g["name"] for g in cached[1] if current in g["name"].lower()})
+        return [app_commands.Choice(name=name[:100], value=name[:100]) for name in names[:25]]
+
     @app_commands.command(name="exportpals", description="Export pals")
-    @app_commands.describe(userid="User ID", server="Server")
+    @app_commands.describe(userid="User ID", server="Server", refresh="Ignore the cached export")
     @app_commands.autocomplete(server=autocomplete_server)
     @app_commands.default_permissions(administrator=True)
     @app_commands.guild_only()
-    async def exportpals(self, interaction: discord.Interaction, userid: str, server: str):
+    async def exportpals(self, interaction: discord.Interaction, userid: str, server: str, refresh: bool = False):
         await interaction.response.defer(ephemeral=True)
         if not interaction.guild:
             await interaction.followup.send("No guild.", ephemeral=True)
@@ -213,17 +227,28 @@ class PalDefenderCog(commands.Cog):
         if not info:
             await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
             return
-        response = await self.rcon.rcon_command(info["host"], info["port"], info["password"], f"exportpals {userid}")
+        try:
+            await self.pals.ready()
+            exported_at, pals = await self.export_pals(interaction.guild.id, server, info, userid, refresh)
+        except Exception as e:
+            await self.export_failed(interaction, f"ExportPals on {server}", e)
+            return
+        species = {}
+        for pal in pals:
+            count, top = species.get(pal["species"], (0, 0))
+            species[pal["species"]] = (count + 1, max(top, pal["level"]))
+        lines = [f"**{self.species_name(sp)}** x{count} (max Lv {top})" for sp, (count, top) in sorted(species.items(), key=lambda x: -x[1][0])]
         embed = discord.Embed(title=f"ExportPals on {server}")
-        embed.description = response
+        embed.description = "\n".join(lines[:40]) or "No pals."
+        embed.set_footer(text=f"{len(pals)} pals for {userid} | exported {int(time.time() - exported_at)}s ago")
         await interaction.followup.send(embed=embed, ephemeral=True)
 
-    @app_commands.command(name="exportguilds", description="Export guilds")
-    @app_commands.describe(server="Server")
+    @app_commands.command(name="exportguilds", description="Export guilds, largest first")
+    @app_commands.describe(server="Server", count="How many guilds to list", refresh="Ignore the cached export")
     @app_commands.autocomplete(server=autocomplete_server)
     @app_commands.default_permissions(administrator=True)
     @app_commands.guild_only()
-    async def exportguilds(self, interaction: discord.Interaction, server: str):
+    async def exportguilds(self, interaction: discord.Interaction, server: str, count: app_commands.Range[int, 1, 50] = 15, refresh: bool = False):
         await interaction.response.defer(ephemeral=True)
         if not interaction.guild:
             await interaction.followup.send("No guild.", ephemeral=True)
@@ -232,10 +257,110 @@ class PalDefenderCog(commands.Cog):
         if not info:
             await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
             return
-        response = await self.rcon.rcon_command(info["host"], info["port"], info["password"], "exportguilds")
+        try:
+            exported_at, guilds = await self.export_guilds(interaction.guild.id, server, info, refresh)
+        except Exception as e:
+            await self.export_failed(interaction, f"ExportGuilds on {server}", e)
+            return
+        ranked = sorted(guilds, key=lambda g: (-len(g["members"]), -len(g["bases"]), g["name"]))
+        lines = [f"{i}. **{g['name']}** - {len(g['members'])} members, {len(g['bases'])} bases" for i, g in enumerate(ranked[:count], 1)]
         embed = discord.Embed(title=f"ExportGuilds on {server}")
-        embed.description = response
+        embed.description = "\n".join(lines) or "No guilds."
+        embed.set_footer(text=f"{len(guilds)} guilds, {sum(len(g['members']) for g in guilds)} members | exported {int(time.time() - exported_at)}s ago")
         await interaction.followup.send(embed=embed, ephemeral=True)
 
+    @app_commands.command(name="guildinfo", description="Show a guild's members and bases from the guild export")
+    @app_commands.describe(server="Server", guild="Guild name", refresh="Ignore the cached export")
+    @app_commands.autocomplete(server=autocomplete_server, guild=autocomplete_guild)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def guildinfo(self, interaction: discord.Interaction, server: str, guild: str, refresh: bool = False):
+        await interaction.response.defer(ephemeral=True)
+        info = await self.get_server_info(interaction.guild.id, server)
+        if not info:
+            await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
+            return
+        try:
+            exported_at, guilds = await self.export_guilds(interaction.guild.id, server, info, refresh)
+        except Exception as e:
+            await self.export_failed(interaction, f"GuildInfo on {server}", e)
+            return
+        match = next((g for g in guilds if g["name"].lower() == guild.lower()), None)
+        if not match:
+            await interaction.followup.send(f"Guild not found: {guild}", ephemeral=True)
+            return
+        members = sorted(match["members"], key=lambda m: -m["level"])
+        bases = [f"({b['location'][0]:.0f}, {b['location'][1]:.0f})" if b["location"] else str(b["id"]) for b in match["bases"]]
+        embed = discord.Embed(title=f"{match['name']} on {server}")
+        embed.add_field(name=f"Members ({len(members)})", value="\n".join(f"{m['name']} (Lv {m['level']})" for m in members[:30])[:1024] or "None", inline=False)
+        embed.add_field(name=f"Bases ({len(bases)})", value="\n".join(bases)[:1024] or "None", inline=False)
+        embed.set_footer(text=f"Exported {int(time.time() - exported_at)}s ago")
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="palowners", description="Find online players who own a pal species")
+    @app_commands.describe(palid="Pal species", server="Server", refresh="Ignore cached exports")
+    @app_commands.autocomplete(server=autocomplete_server, palid=autocomplete_pal)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def palowners(self, interaction: discord.Interaction, palid: str, server: str, refresh: bool = False):
+        await interaction.response.defer(ephemeral=True)
+        info = await self.get_server_info(interaction.guild.id, server)
+        if not info:
+            await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
+            return
+        api, error = await get_api_instance(interaction.guild.id, server)
+        if error:
+            await interaction.followup.send(error, ephemeral=True)
+            return
+        player_list = await api.get_player_list()
+        if "error" in player_list:
+            await interaction.followup.send(f"Failed to fetch players: {player_list['error']}", ephemeral=True)
+            return
+
+        pal = (await self.pals.ready()).find(palid)
+        species = (pal.id if pal else palid).lower()
+        players = player_list.get("players", [])
+        # Only stale per-player exports go back to the server, at bulk priority.
+        results = await asyncio.gather(
+            *(self.export_pals(interaction.guild.id, server, info, p["userId"], refresh, BULK) for p in players),
+            return_exceptions=True
+        )
+
+        owners, errors = [], []
+        for player, result in zip(players, results):
+            if isinstance(result, Exception):
+                errors.append(result)
+                continue
+            levels = [x["level"] for x in result[1] if x["species"].lower() == species]
+            if levels:
+                owners.append((player["name"], len(levels), max(levels)))
+        owners.sort(key=lambda o: (-o[1], -o[2]))
+
+        title = f"{pal.name if pal else palid} owners on {server}"
+        if players and len(errors) == len(players):
+            await self.export_failed(interaction, title, errors[0])
+            return
+        embed = discord.Embed(title=title)
+        embed.description = "\n".join(f"**{name}** x{count} (max Lv {top})" for name, count, top in owners[:40]) or "No online player owns this pal."
+        embed.set_footer(text=f"{len(players)} players checked" + (f", {len(errors)} exports failed" if errors else ""))
+        await interaction.followup.send(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="pdexportdir", description="Set where this bot can read a server's PalDefender exports")
+    @app_commands.describe(server="Server", export_dir="Local or mounted path of the export folder (leave empty to use the path the server reports)")
+    @app_commands.autocomplete(server=autocomplete_server)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def pdexportdir(self, interaction: discord.Interaction, server: str, export_dir: str = None):
+        await interaction.response.defer(ephemeral=True)
+        if not await self.get_server_info(interaction.guild.id, server):
+            await interaction.followup.send(f"Server not found: {server}", ephemeral=True)
+            return
+        if export_dir:
+            await set_export_dir(interaction.guild.id, server, export_dir)
+            await interaction.followup.send(f"Exports for {server} will be read from `{export_dir}`.", ephemeral=True)
+        else:
+            await del_export_dir(interaction.guild.id, server)
+            await interaction.followup.send(f"Exports for {server} will be read from the path the server reports.", ephemeral=True)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(PalDefenderCog(bot))
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from utils.rconutility import RconUtility
+from utils.rconutility import RconUtility, find_scheduler
 from utils.database import fetch_server_details, server_autocomplete
 
 class RconCog(commands.Cog):
@@ -36,5 +36,29 @@ class RconCog(commands.Cog):
         response = await self.rcon.rcon_command(info["host"], info["port"], info["password"], f"{command}")
         await interaction.followup.send(response, ephemeral=True)
 
+    @app_commands.command(name="rconstats", description="Show RCON queue depth and wait times for a server")
+    @app_commands.describe(server="Server")
+    @app_commands.autocomplete(server=autocomplete_server)
+    @app_commands.default_permissions(administrator=True)
+    @app_commands.guild_only()
+    async def rconstats(self, interaction: discord.Interaction, server: str):
+        info = await self.get_server_info(interaction.guild.id, server)
+        if not info:
+            await interaction.response.send_message(f"Server not found: {server}", ephemeral=True)
+            return
+        scheduler = find_scheduler(info["host"], info["port"], info["password"])
+        if not scheduler:
+            await interaction.response.send_message(f"No RCON commands have been sent to {server} yet.", ephemeral=True)
+            return
+        stats = scheduler.stats()
+        embed = discord.Embed(title=f"RCON Queue - {server}", color=discord.Color.blurple())
+        embed.add_field(name="Queued", value=stats["depth"])
+        embed.add_field(name="In Flight", value=f"{stats['in_flight']}/{scheduler.max_in_flight}")
+        embed.add_field(name="Completed", value=stats["completed"])
+        embed.add_field(name="Failed", value=stats["failed"])
+        embed.add_field(name="Coalesced", value=f"{stats['coalesced']}/{stats['submitted']}")
+        embed.add_field(name="Wait (avg/max)", value=f"{stats['wait_avg'] * 1000:.0f} / {stats['wait_max'] * 1000:.0f} ms")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(RconCog(bot))
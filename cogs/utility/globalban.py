@@ -1,25 +1,100 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import aiohttp
 import logging
 import os
-from utils.pagination import Pagination, PaginationView
+import time
+from utils.database import (
+    fetch_global_bans,
+    global_ban_sync_state,
+    apply_global_ban_changes,
+    count_global_bans,
+    fetch_global_ban_page
+)
+from utils.pagination import LazyPagination, PaginationView
+
+SYNC_SECONDS = int(os.getenv("BANLIST_SYNC_SECONDS", 300))
 
 class GlobalBan(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.api_url = os.getenv("API_URL")
         self.bearer_token = os.getenv("API_KEY")
+        self.session = None
+        self.bans = {}
+
+    async def cog_load(self):
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        self.bans = {player_id: (name, reason) for player_id, name, reason in await fetch_global_bans()}
+        if self.api_url:
+            self.sync_bans.start()
+
+    async def cog_unload(self):
+        self.sync_bans.cancel()
+        if self.session:
+            await self.session.close()
 
     async def api_request(self, method: str, endpoint: str, json: dict = None, params: dict = None):
         url = f"{self.api_url}{endpoint}"
         headers = {"Authorization": f"Bearer {self.bearer_token}"}
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method, url, headers=headers, json=json, params=params) as response:
-                if response.status == 200:
-                    return await response.json()
-                raise Exception(f"API request failed: {response.status}, {await response.text()}")
+        async with self.session.request(method, url, headers=headers, json=json, params=params) as response:
+            if response.status == 200:
+                return await response.json()
+            raise Exception(f"API request failed: {response.status}, {await response.text()}")
+
+    # Conditional fetch of the full list; a 304 costs one round trip and no
+    # writes, and a 200 is diffed so only changed rows touch the table.
+    @tasks.loop(seconds=SYNC_SECONDS)
+    async def sync_bans(self):
+        if not self.api_url:
+            return
+        try:
+            snapshot = dict(self.bans)
+            state = await global_ban_sync_state()
+            headers = {"Authorization": f"Bearer {self.bearer_token}"}
+            if state and state[0]:
+                headers["If-None-Match"] = state[0]
+            if state and state[1]:
+                headers["If-Modified-Since"] = state[1]
+
+            async with self.session.get(f"{self.api_url}/api/bannedusers", headers=headers) as response:
+                if response.status == 304:
+                    return
+                if response.status != 200:
+                    logging.warning(f"Banlist sync failed: {response.status}, {await response.text()}")
+                    return
+                data = await response.json()
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+
+            remote = {}
+            for ban in data or []:
+                if ban.get("id"):
+                    remote[str(ban["id"])] = (ban.get("name") or "Unknown", ban.get("reason"))
+            # Bans made with /api while the request was out may be missing from
+            # this reply; leave them alone and drop the validators so the next
+            # sync fetches the full list again.
+            touched = {player_id for player_id in snapshot.keys() | self.bans.keys() if snapshot.get(player_id) != self.bans.get(player_id)}
+            if touched:
+                etag = last_modified = None
+            upserts = [(player_id, *ban) for player_id, ban in remote.items() if player_id not in touched and snapshot.get(player_id) != ban]
+            deletes = [player_id for player_id in snapshot if player_id not in remote and player_id not in touched]
+            await apply_global_ban_changes(upserts, deletes, etag, last_modified, int(time.time()))
+
+            for player_id, name, reason in upserts:
+                self.bans[player_id] = (name, reason)
+            for player_id in deletes:
+                self.bans.pop(player_id, None)
+            if upserts or deletes:
+                self.bot.dispatch("moderation_changed")
+                logging.info(f"Banlist synced: {len(upserts)} updated, {len(deletes)} removed, {len(self.bans)} total")
+        except Exception as e:
+            logging.error(f"Banlist sync failed: {e}")
+
+    @sync_bans.before_loop
+    async def before_sync_bans(self):
+        await self.bot.wait_until_ready()
 
     api_group = app_commands.Group(
         name="api",
@@ -35,6 +110,10 @@ class GlobalBan(commands.Cog):
         try:
             payload = {"name": name, "id": user_id, "reason": reason}
             await self.api_request("POST", "/api/banuser", json=payload)
+            # Mirror it right away; clearing the ETag makes the next sync refetch.
+            await apply_global_ban_changes([(user_id, name, reason)], [], None, None, int(time.time()))
+            self.bans[user_id] = (name, reason)
+            self.bot.dispatch("moderation_changed")
             await interaction.followup.send(f"User `{name}` (ID: {user_id}) has been banned for: {reason}", ephemeral=True)
         except Exception as e:
             logging.error(f"Failed to ban user: {e}")
@@ -46,19 +125,22 @@ class GlobalBan(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         try:
             await self.api_request("POST", "/api/unbanuser", params={"userid": user_id})
+            await apply_global_ban_changes([], [user_id], None, None, int(time.time()))
+            self.bans.pop(user_id, None)
+            self.bot.dispatch("moderation_changed")
             await interaction.followup.send(f"User with ID `{user_id}` has been unbanned successfully.", ephemeral=True)
         except Exception as e:
             logging.error(f"Failed to unban user: {e}")
             await interaction.followup.send(f"An error occurred while unbanning the user: {str(e)}", ephemeral=True)
 
     @api_group.command(name="banlist", description="Get detailed banned users list.")
-    @app_commands.describe(name="Filter the banlist by name")
+    @app_commands.describe(name="Filter the banlist by names starting with this")
     async def banned_users(self, interaction: discord.Interaction, name: str = None):
         await interaction.response.defer(ephemeral=True)
         try:
-            params = {"name": name} if name else None
-            bans = await self.api_request("GET", "/api/bannedusers", params=params)
-            if not bans:
+            # Pages come from the local mirror; the sync loop keeps it current.
+            total = await count_global_bans(name)
+            if not total:
                 await interaction.followup.send("No users are currently banned.", ephemeral=True)
                 return
 
@@ -67,20 +149,20 @@ class GlobalBan(commands.Cog):
                     title="Banned Users",
                     color=discord.Color.red()
                 )
-                for ban in ban_page:
+                for player_id, ban_name, reason in ban_page:
                     embed.add_field(
-                        name=f"**Name:** {ban['name']}",
+                        name=f"**Name:** {ban_name}",
                         value=(
-                            f"**ID:** `{ban['id']}`\n"
-                            f"**Reason:** {ban['reason']}"
+                            f"**ID:** `{player_id}`\n"
+                            f"**Reason:** {reason}"
                         ),
                         inline=False
                     )
-                embed.set_footer(text=f"Page {current_page} of {total_pages}")
+                embed.set_footer(text=f"Page {current_page} of {total_pages} | {total} bans")
                 return embed
 
-            paginator = Pagination(bans, page_size=5)
-            embed = create_embed(paginator.get_page(1), 1, paginator.total_pages)
+            paginator = LazyPagination(lambda offset, limit: fetch_global_ban_page(offset, limit, name), total, page_size=5)
+            embed = create_embed(await paginator.get_page(1), 1, paginator.total_pages)
             view = PaginationView(paginator, 1, create_embed)
 
             await interaction.followup.send(embed=embed, view=view, ephemeral=True)
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from gamercon_async import GameRCON
+from tests.fake_rcon import FakeRconServer
+from utils.movement import MovementTracker
+from utils.rconutility import RconUtility, close_pools
+from utils.searchindex import SearchIndex
+
+# Pooled vs. connect-per-command throughput against a local fake server.
+async def rcon(count: int = 500, handshake_delay: float = 0.002):
+    server = await FakeRconServer("secret", handshake_delay).start()
+
+    start = time.perf_counter()
+    for i in range(count):
+        async with GameRCON("127.0.0.1", server.port, "secret", 30) as client:
+            await client.send(f"echo {i}")
+    unpooled = count / (time.perf_counter() - start)
+
+    utility = RconUtility()
+    start = time.perf_counter()
+    for i in range(count):
+        await utility.rcon_command("127.0.0.1", server.port, "secret", f"echo {i}")
+    pooled = count / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(utility.rcon_command("127.0.0.1", server.port, "secret", f"echo {i}") for i in range(count)))
+    concurrent = count / (time.perf_counter() - start)
+
+    await close_pools()
+    await server.close()
+    print(f"connect per command: {unpooled:8.0f} cmd/s")
+    print(f"pooled sequential:   {pooled:8.0f} cmd/s")
+    print(f"pooled concurrent:   {concurrent:8.0f} cmd/s")
+
+# The linear substring scan autocomplete used before SearchIndex.
+def _scan(entries, current: str, limit: int):
+    results = []
+    for entry in entries:
+        if current.lower() in entry.get("name", "").lower() or current.lower() in entry.get("id", "").lower():
+            results.append(entry)
+    return results[:limit]
+
+# Autocomplete latency against the bundled game data.
+def search(rounds: int = 200):
+    queries = ["", "p", "pa", "pal", "sphere", "mega sph", "anub", "boss_", "ingot", "cake", "lamball", "xyzzy", "sheild", "legendary"]
+    for name in ("items", "pals"):
+        with open(os.path.join("gamedata", f"{name}.json"), "r", encoding="utf-8") as f:
+            entries = json.load(f).get(name, [])
+
+        start = time.perf_counter()
+        index = SearchIndex(entries)
+        build = (time.perf_counter() - start) * 1000
+
+        timings = {}
+        for label, fn in (("scan", lambda q: _scan(entries, q, 15)), ("index", lambda q: index.search(q, 15))):
+            samples = []
+            for _ in range(rounds):
+                for q in queries:
+                    start = time.perf_counter()
+                    fn(q)
+                    samples.append(time.perf_counter() - start)
+            samples.sort()
+            timings[label] = (samples[len(samples) // 2] * 1e6, samples[int(len(samples) * 0.99)] * 1e6)
+
+        print(f"{name}: {len(entries)} entries, index built in {build:.1f} ms")
+        for label, (p50, p99) in timings.items():
+            print(f"  {label:<6} p50 {p50:8.1f} us   p99 {p99:8.1f} us")
+
+# Per-tick cost of movement checks for a full fleet.
+def movement(servers: int = 40, players: int = 32, ticks: int = 500):
+    rng = np.random.default_rng(0)
+    trackers = [MovementTracker() for _ in range(servers)]
+    coords = rng.uniform(-700000, 700000, size=(servers, players, 2))
+    ids = [f"steam_{i}" for i in range(players)]
+    samples = []
+    for tick in range(ticks):
+        coords += rng.normal(0, 3000, size=coords.shape)
+        start = time.perf_counter()
+        for s, tracker in enumerate(trackers):
+            tracker.observe(tick * 30.0, dict(zip(ids, map(tuple, coords[s]))), 5000)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    print(f"{servers} servers x {players} players: p50 {samples[len(samples) // 2] * 1000:.2f} ms, p99 {samples[int(len(samples) * 0.99)] * 1000:.2f} ms per tick")
+
+BENCHMARKS = {
+    "rcon": lambda: asyncio.run(rcon()),
+    "search": search,
+    "movement": movement
+}
+
+# Run from the repository root: python -m tests.benchmark [name ...]
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
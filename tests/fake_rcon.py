@@ -0,0 +1,49 @@
+import asyncio
+import struct
+
+# Minimal Source RCON server: authenticates against `password` and echoes each
+# command back. Tracks open client writers, so tests can reset or watch them,
+# and the peak number of connections open at once.
+class FakeRconServer:
+    def __init__(self, password: str, handshake_delay: float = 0, command_delay: float = 0):
+        self.password = password
+        self.handshake_delay = handshake_delay
+        self.command_delay = command_delay
+        self.clients = set()
+        self.peak = 0
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self
+
+    @property
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.clients.add(writer)
+        self.peak = max(self.peak, len(self.clients))
+        try:
+            while True:
+                size = struct.unpack("<i", await reader.readexactly(4))[0]
+                payload = await reader.readexactly(size)
+                request_id, kind = struct.unpack("<ii", payload[:8])
+                body = payload[8:-2].decode()
+                if kind == 3:
+                    await asyncio.sleep(self.handshake_delay)
+                    request_id = request_id if body == self.password else -1
+                    body = ""
+                elif self.command_delay:
+                    await asyncio.sleep(self.command_delay)
+                out = struct.pack("<ii", request_id, 0) + body.encode() + b"\x00\x00"
+                writer.write(struct.pack("<i", len(out)) + out)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            writer.close()
+        finally:
+            self.clients.discard(writer)
@@ -0,0 +1,111 @@
+import asyncio
+
+from aiohttp import web
+
+from cogs.utility.globalban import GlobalBan
+from utils import database
+from utils.database import apply_global_ban_changes, fetch_global_bans, global_ban_sync_state, initialize_db
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+class FakeBot:
+    def __init__(self):
+        self.events = []
+
+    def dispatch(self, event, *args):
+        self.events.append(event)
+
+# Stand-in for the ban API: serves `bans` with an ETag and answers 304 when
+# the client already has it. `during` runs while a request is being served.
+class FakeBanApi:
+    def __init__(self):
+        self.bans = []
+        self.etag = '"v1"'
+        self.requests = []
+        self.during = None
+
+    async def banned_users(self, request):
+        self.requests.append(request.headers.get("If-None-Match"))
+        if self.during:
+            await self.during()
+        if request.headers.get("If-None-Match") == self.etag:
+            return web.Response(status=304)
+        return web.json_response(self.bans, headers={"ETag": self.etag})
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/api/bannedusers", self.banned_users)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        return self
+
+async def _cog(monkeypatch, api):
+    monkeypatch.setenv("API_URL", api.url)
+    monkeypatch.setenv("API_KEY", "token")
+    await initialize_db()
+    cog = GlobalBan(FakeBot())
+    await cog.cog_load()
+    cog.sync_bans.cancel()
+    return cog
+
+async def _mirror():
+    return sorted(await fetch_global_bans())
+
+def test_sync_diffs_and_honours_etag(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, "DATABASE_PATH", str(tmp_path / "palworld.db"))
+
+    async def scenario():
+        api = await FakeBanApi().start()
+        cog = await _cog(monkeypatch, api)
+        try:
+            api.bans = [{"id": "1", "name": "Alpha", "reason": "cheating"}, {"id": "2", "name": "Beta", "reason": "griefing"}]
+            await cog.sync_bans()
+            assert await _mirror() == [("1", "Alpha", "cheating"), ("2", "Beta", "griefing")]
+            assert (await global_ban_sync_state())[0] == '"v1"'
+            assert cog.bot.events == ["moderation_changed"]
+
+            # Unchanged list: the stored ETag gets a 304 and nothing is written.
+            await cog.sync_bans()
+            assert api.requests == [None, '"v1"']
+            assert cog.bot.events == ["moderation_changed"]
+
+            api.etag = '"v2"'
+            api.bans = [{"id": "2", "name": "Beta", "reason": "exploits"}, {"id": "3", "name": "Gamma", "reason": "spam"}]
+            await cog.sync_bans()
+            assert await _mirror() == [("2", "Beta", "exploits"), ("3", "Gamma", "spam")]
+            assert cog.bans == {"2": ("Beta", "exploits"), "3": ("Gamma", "spam")}
+            assert (await global_ban_sync_state())[0] == '"v2"'
+        finally:
+            await cog.cog_unload()
+            await api.runner.cleanup()
+    run(scenario())
+
+def test_sync_keeps_bans_added_during_fetch(monkeypatch, tmp_path):
+    monkeypatch.setattr(database, "DATABASE_PATH", str(tmp_path / "palworld.db"))
+
+    async def scenario():
+        api = await FakeBanApi().start()
+        cog = await _cog(monkeypatch, api)
+        try:
+            api.bans = [{"id": "1", "name": "Alpha", "reason": "cheating"}]
+            await cog.sync_bans()
+
+            # What /api ban does, landing after the server built its reply.
+            async def ban_during_fetch():
+                await apply_global_ban_changes([("9", "Late", "ban")], [], None, None, 0)
+                cog.bans["9"] = ("Late", "ban")
+            api.etag = '"v2"'
+            api.during = ban_during_fetch
+            await cog.sync_bans()
+            assert await _mirror() == [("1", "Alpha", "cheating"), ("9", "Late", "ban")]
+            assert cog.bans == {"1": ("Alpha", "cheating"), "9": ("Late", "ban")}
+            # The reply was stale, so the next sync asks for the full list.
+            assert (await global_ban_sync_state())[0] is None
+        finally:
+            await cog.cog_unload()
+            await api.runner.cleanup()
+    run(scenario())
@@ -0,0 +1,102 @@
+import asyncio
+import os
+
+import pytest
+
+from utils.pdexport import ExportCache, ExportError, export_path, parse_guilds, parse_pals, read_export
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+GUILDS_REPLY = 'Exported 2 guilds to "C:\\PalServer\\Pal\\Binaries\\Win64\\PalDefender\\Exports\\paldefender_guilds.json"'
+PALS_REPLY = "Exported 3 pals of A1B2C3D4000000000000000000000000 to /srv/palworld/PalDefender/Exports/paldefender_pals.json."
+
+def test_export_path_from_reply():
+    assert export_path(GUILDS_REPLY, None) == "C:\\PalServer\\Pal\\Binaries\\Win64\\PalDefender\\Exports\\paldefender_guilds.json"
+    assert export_path(PALS_REPLY, None) == "/srv/palworld/PalDefender/Exports/paldefender_pals.json"
+    assert export_path(GUILDS_REPLY, FIXTURES) == os.path.join(FIXTURES, "paldefender_guilds.json")
+
+def test_reply_without_file_is_an_error():
+    with pytest.raises(ExportError) as error:
+        export_path("Player not found.", FIXTURES)
+    assert error.value.response == "Player not found."
+
+def test_parse_guild_export():
+    guilds = asyncio.run(read_export(GUILDS_REPLY, parse_guilds, FIXTURES))
+    assert [g["name"] for g in guilds] == ["Night Owls", "Unnamed Guild"]
+    owls = guilds[0]
+    assert owls["admin"] == "A1B2C3D4000000000000000000000000"
+    assert [(m["name"], m["level"]) for m in owls["members"]] == [("Kestrel", 47), ("Moth", 32)]
+    assert owls["bases"] == [{"id": "0F3E2D1C000000000000000000000000", "location": (-358123.5, 201947.25, 1532.0)}]
+    assert guilds[1]["bases"] == []
+
+def test_parse_pal_export():
+    pals = asyncio.run(read_export(PALS_REPLY, parse_pals, FIXTURES))
+    assert pals == [
+        {"species": "SheepBall", "nickname": "", "level": 12},
+        {"species": "Anubis", "nickname": "Boss", "level": 45},
+        {"species": "SheepBall", "nickname": "", "level": 3}
+    ]
+
+def test_wrong_export_kind_is_rejected():
+    with pytest.raises(ExportError):
+        asyncio.run(read_export(GUILDS_REPLY, parse_pals, FIXTURES))
+
+def test_unreadable_export_keeps_the_reply():
+    reply = 'Exported to "missing.json"'
+    with pytest.raises(ExportError, match="Cannot read export file") as error:
+        asyncio.run(read_export(reply, parse_pals, FIXTURES))
+    assert error.value.response == reply
+
+def test_export_read_from_reported_path():
+    reply = f'Exported 3 pals to "{os.path.join(FIXTURES, "paldefender_pals.json")}"'
+    assert len(asyncio.run(read_export(reply, parse_pals))) == 3
+
+def test_cache_drops_expired_and_bounds_size(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("utils.pdexport.time.time", lambda: clock[0])
+
+    async def scenario():
+        cache = ExportCache(ttl=60, size=2)
+        loads = []
+
+        def loader(value):
+            async def load():
+                loads.append(value)
+                return value
+            return load
+
+        await cache.get("a", loader("a"))
+        await cache.get("a", loader("a2"))
+        assert loads == ["a"]
+        clock[0] += 30
+        await cache.get("b", loader("b"))
+        clock[0] += 10
+        await cache.get("c", loader("c"))
+        assert list(cache.entries) == ["b", "c"]
+        clock[0] += 55
+        assert cache.peek("b") is None
+        assert list(cache.entries) == ["c"]
+        assert cache.loading == {}
+
+    asyncio.run(scenario())
+
+def test_cache_shares_one_load_and_skips_failures():
+    async def scenario():
+        cache = ExportCache(ttl=60)
+        calls = []
+
+        async def slow():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "data"
+
+        results = await asyncio.gather(*(cache.get("k", slow) for _ in range(5)))
+        assert len(calls) == 1
+        assert {r[1] for r in results} == {"data"}
+
+        async def fail():
+            raise ExportError("boom")
+        with pytest.raises(ExportError):
+            await cache.get("x", fail)
+        assert "x" not in cache.entries and cache.loading == {}
+
+    asyncio.run(scenario())
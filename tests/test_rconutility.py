@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from gamercon_async import ClientError
+from tests.fake_rcon import FakeRconServer
+from utils.rconutility import MAX_IN_FLIGHT, POOL_SIZE, RconConnection, RconUtility, close_pools, get_pool, get_scheduler
+from utils import rconutility
+
+# A leaked pool slot shows up as a hang, so every scenario gets a deadline.
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+@pytest.fixture
+def opened(monkeypatch):
+    counter = {"opens": 0}
+    original = RconConnection.open
+
+    async def counting_open(self):
+        counter["opens"] += 1
+        await original(self)
+    monkeypatch.setattr(RconConnection, "open", counting_open)
+    return counter
+
+async def _stop(server):
+    await close_pools()
+    await server.close()
+
+# The pool still opens up to POOL_SIZE sockets at once, and no more.
+async def _assert_full_capacity(pool, server):
+    await asyncio.gather(*(pool.send(f"load {i}") for i in range(POOL_SIZE * 2)))
+    assert server.peak == POOL_SIZE
+
+def test_reset_connection_retries_once(opened):
+    async def scenario():
+        server = await FakeRconServer("secret").start()
+        pool = get_pool("127.0.0.1", server.port, "secret")
+        try:
+            assert await pool.send("first") == "first"
+            for writer in list(server.clients):
+                writer.transport.abort()
+            assert await pool.send("second") == "second"
+            assert opened["opens"] == 2
+            assert len(pool.idle) == 1
+        finally:
+            await _stop(server)
+    run(scenario())
+
+def test_fresh_connection_reset_is_not_retried(opened, monkeypatch):
+    async def scenario():
+        server = await FakeRconServer("secret", command_delay=0.02).start()
+        pool = get_pool("127.0.0.1", server.port, "secret")
+        original = RconConnection.send
+
+        async def reset(self, command):
+            if command.startswith("fail"):
+                raise ConnectionResetError("reset by peer")
+            return await original(self, command)
+        try:
+            await pool.send("first")
+            monkeypatch.setattr(RconConnection, "send", reset)
+            with pytest.raises(ConnectionResetError):
+                await pool.send("fail")
+            # One retry after the reused socket failed, then the fresh one gave up.
+            assert opened["opens"] == 2
+            await _assert_full_capacity(pool, server)
+        finally:
+            await _stop(server)
+    run(scenario())
+
+def test_idle_connections_closed_after_timeout(monkeypatch):
+    monkeypatch.setattr(rconutility, "IDLE_TIMEOUT", 0.05)
+    monkeypatch.setattr(rconutility, "REAP_INTERVAL", 0.02)
+
+    async def scenario():
+        server = await FakeRconServer("secret").start()
+        pool = get_pool("127.0.0.1", server.port, "secret")
+        try:
+            await pool.send("ping")
+            assert len(pool.idle) == 1
+            assert len(server.clients) == 1
+            await asyncio.sleep(0.2)
+            assert pool.idle == []
+            assert server.clients == set()
+        finally:
+            await _stop(server)
+    run(scenario())
+
+def test_down_server_returns_clean_error():
+    async def scenario():
+        server = await FakeRconServer("secret").start()
+        port = server.port
+        await server.close()
+        try:
+            pool = get_pool("127.0.0.1", port, "secret")
+            for _ in range(POOL_SIZE + 1):
+                result = await RconUtility(timeout=2).rcon_command("127.0.0.1", port, "secret", "info")
+                assert result.startswith("RCON error:")
+            with pytest.raises(ClientError):
+                await pool.send("info")
+            assert pool.idle == []
+        finally:
+            await close_pools()
+    run(scenario())
+
+def test_failed_connects_do_not_leak_slots():
+    async def scenario():
+        server = await FakeRconServer("secret", command_delay=0.02).start()
+        pool = get_pool("127.0.0.1", server.port, "wrong")
+        try:
+            for _ in range(POOL_SIZE + 1):
+                with pytest.raises(ClientError):
+                    await pool.send("info")
+            pool.password = "secret"
+            await _assert_full_capacity(pool, server)
+        finally:
+            await _stop(server)
+    run(scenario())
+
+def test_stop_fails_queued_commands():
+    async def scenario():
+        server = await FakeRconServer("secret", command_delay=0.05).start()
+        scheduler = get_scheduler("127.0.0.1", server.port, "secret")
+        try:
+            pending = [asyncio.ensure_future(scheduler.submit(f"cmd {i}")) for i in range(MAX_IN_FLIGHT + 3)]
+            await asyncio.sleep(0.01)
+            scheduler.stop()
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            assert all(isinstance(r, ConnectionAbortedError) for r in results)
+        finally:
+            await _stop(server)
+    run(scenario())
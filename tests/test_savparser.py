@@ -0,0 +1,100 @@
+import io
+import struct
+import uuid
+import zlib
+
+import pytest
+
+from utils.savparser import SaveFormatError, parse_level
+
+PLAYER = "11111111-0000-0000-0000-000000000001"
+OTHER = "11111111-0000-0000-0000-000000000002"
+GUILD = "22222222-0000-0000-0000-000000000001"
+BASE = "33333333-0000-0000-0000-000000000001"
+ZERO = "00000000-0000-0000-0000-000000000000"
+
+# Just enough of a GVAS writer to build a Level.sav by hand, in the same
+# layout parse_level reads.
+def fstring(s):
+    data = s.encode() + b"\0"
+    return struct.pack("<i", len(data)) + data
+
+def guid(s):
+    b = uuid.UUID(s).bytes
+    return b[3::-1] + b[7:3:-1] + b[11:7:-1] + b[15:11:-1]
+
+def prop(name, ptype, body, extra=b""):
+    return fstring(name) + fstring(ptype) + struct.pack("<q", len(body)) + extra + b"\0" + body
+
+def props(*items):
+    return b"".join(items) + fstring("None")
+
+def int_prop(name, value):
+    return prop(name, "IntProperty", struct.pack("<i", value))
+
+def str_prop(name, value):
+    return prop(name, "StrProperty", fstring(value))
+
+def bool_prop(name, value):
+    return fstring(name) + fstring("BoolProperty") + struct.pack("<q", 0) + bytes([value]) + b"\0"
+
+def enum_prop(name, value):
+    return prop(name, "EnumProperty", fstring(value), fstring("None"))
+
+def struct_prop(name, struct_type, body):
+    return prop(name, "StructProperty", body, fstring(struct_type) + bytes(16))
+
+def raw_prop(data):
+    return prop("RawData", "ArrayProperty", struct.pack("<I", len(data)) + data, fstring("ByteProperty"))
+
+def map_prop(name, entries):
+    body = struct.pack("<II", 0, len(entries)) + b"".join(key + value for key, value in entries)
+    return prop(name, "MapProperty", body, fstring("StructProperty") + fstring("StructProperty"))
+
+def character(uid, nickname, level, is_player, owner=ZERO):
+    params = props(int_prop("Level", level), str_prop("NickName", nickname), bool_prop("IsPlayer", is_player), struct_prop("OwnerPlayerUId", "Guid", guid(owner)))
+    raw = props(struct_prop("SaveParameter", "PalIndividualCharacterSaveParameter", params))
+    return props(struct_prop("PlayerUId", "Guid", guid(uid))), props(raw_prop(raw))
+
+def guild(guild_id, name, admin, members):
+    raw = guid(guild_id) + fstring("") + struct.pack("<I", 0) + b"\0" + struct.pack("<I", 0) + struct.pack("<i", 0) + struct.pack("<I", 0)
+    raw += fstring(name) + bytes(16) + guid(admin) + struct.pack("<i", len(members))
+    raw += b"".join(guid(uid) + struct.pack("<q", 0) + fstring(nickname) for uid, nickname in members)
+    return guid(guild_id), props(enum_prop("GroupType", "EPalGroupType::Guild"), raw_prop(raw))
+
+def base(base_id, name, guild_id, location):
+    raw = guid(base_id) + fstring(name) + b"\0" + bytes(32) + struct.pack("<3d", *location) + bytes(28) + guid(guild_id)
+    return guid(base_id), props(raw_prop(raw))
+
+def level_sav():
+    world = props(
+        int_prop("Version", 100),
+        map_prop("CharacterSaveParameterMap", [
+            character(PLAYER, "Kestrel", 47, True),
+            character(OTHER, "Moth", 12, True),
+            character(ZERO, "", 20, False, owner=PLAYER),
+            character(ZERO, "", 5, False, owner=PLAYER),
+        ]),
+        map_prop("GroupSaveDataMap", [
+            guild(GUILD, "Night Owls", PLAYER, [(PLAYER, "Kestrel")]),
+            (guid("44444444-0000-0000-0000-000000000001"), props(enum_prop("GroupType", "EPalGroupType::Neutral"))),
+        ]),
+        map_prop("BaseCampSaveData", [base(BASE, "Hollow", GUILD, (-358123.5, 201947.25, 1532.0))]),
+    )
+    body = b"GVAS" + struct.pack("<iii", 3, 522, 1009) + bytes(10) + fstring("++UE5+Release-5.1") + struct.pack("<ii", 3, 0) + fstring("/Script/Pal.PalWorldSaveGame")
+    body += props(str_prop("Unrelated", "skipped"), struct_prop("worldSaveData", "PalWorldSaveData", world))
+    compressed = zlib.compress(body)
+    return struct.pack("<II", len(body), len(compressed)) + b"PlZ\x31" + compressed
+
+def test_parse_level_extracts_players_guilds_and_bases():
+    data = parse_level(io.BytesIO(level_sav()))
+    assert data["players"] == [
+        {"player_uid": PLAYER, "nickname": "Kestrel", "level": 47, "guild_id": GUILD, "pal_count": 2},
+        {"player_uid": OTHER, "nickname": "Moth", "level": 12, "guild_id": None, "pal_count": 0}
+    ]
+    assert data["guilds"] == [{"guild_id": GUILD, "name": "Night Owls", "admin_uid": PLAYER, "member_count": 1}]
+    assert data["bases"] == [{"base_id": BASE, "guild_id": GUILD, "name": "Hollow", "x": -358123.5, "y": 201947.25, "z": 1532.0}]
+
+def test_oodle_saves_are_rejected():
+    with pytest.raises(SaveFormatError, match="Oodle"):
+        parse_level(io.BytesIO(struct.pack("<II", 0, 0) + b"PlM\x31"))
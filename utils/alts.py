@@ -0,0 +1,60 @@
+# Union-find over the observation graph: every user id is joined to the IPs
+# and account names it has been seen with, so accounts that share either end
+# up in one set. Each root keeps the user ids in its set, so a lookup is a
+# find() plus reading one list.
+class AltIndex:
+    def __init__(self):
+        self.parent = {}
+        self.members = {}
+
+    def find(self, node):
+        parent = self.parent.setdefault(node, node)
+        if parent == node:
+            return node
+        root = node
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[node] != root:
+            self.parent[node], node = root, self.parent[node]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return
+        ma, mb = self.members.get(ra, []), self.members.get(rb, [])
+        if len(ma) < len(mb):
+            ra, rb, ma, mb = rb, ra, mb, ma
+        self.parent[rb] = ra
+        if mb:
+            ma.extend(mb)
+            self.members[ra] = ma
+            del self.members[rb]
+
+    def observe(self, user_id: str, ip: str = None, account_name: str = None):
+        node = ("user", user_id)
+        if node not in self.parent:
+            self.parent[node] = node
+            self.members[node] = [user_id]
+        if ip:
+            self.union(node, ("ip", ip))
+        if account_name:
+            self.union(node, ("account", account_name))
+
+    # Every user id linked to user_id, including itself.
+    def cluster(self, user_id: str):
+        node = ("user", user_id)
+        if node not in self.parent:
+            return [user_id]
+        return list(self.members.get(self.find(node), [user_id]))
+
+# One index per Discord guild, so accounts are only linked through what was
+# observed on that guild's servers. Pure CPU work; callers run it in a thread.
+def build_alt_indexes(rows):
+    indexes = {}
+    for guild_id, user_id, ip, account_name in rows:
+        index = indexes.get(guild_id)
+        if index is None:
+            index = indexes[guild_id] = AltIndex()
+        index.observe(user_id, ip, account_name)
+    return indexes
@@ -0,0 +1,82 @@
+import os
+
+def format_size(size):
+    return f"{size / 1024:.2f} KB"
+
+def file_changes(rows, names):
+    lines = []
+    for path, old_size, new_size, old_sha, new_sha in sorted(rows):
+        label = path
+        if path.startswith("Players/"):
+            uid = os.path.splitext(os.path.basename(path))[0].lower()
+            if uid in names:
+                label = f"{path} ({names[uid]})"
+        if old_sha is None:
+            lines.append(f"+ {label}: added ({format_size(new_size)})")
+        elif new_sha is None:
+            lines.append(f"- {label}: removed ({format_size(old_size)})")
+        else:
+            delta = new_size - old_size
+            lines.append(f"~ {label}: {format_size(old_size)} -> {format_size(new_size)} ({'+' if delta >= 0 else '-'}{format_size(abs(delta))})")
+    return lines
+
+# Entities are the rows stored by save inspection: players, guilds and bases.
+def entity_changes(old, new):
+    lines = []
+
+    old_guilds = {g[0]: g for g in old["guilds"]}
+    new_guilds = {g[0]: g for g in new["guilds"]}
+
+    def guild_name(gid):
+        guild = new_guilds.get(gid) or old_guilds.get(gid)
+        return guild[1] if guild else "None"
+
+    old_players = {p[0]: p for p in old["players"]}
+    new_players = {p[0]: p for p in new["players"]}
+    for uid in sorted(old_players.keys() | new_players.keys()):
+        o, n = old_players.get(uid), new_players.get(uid)
+        if o is None:
+            lines.append(f"+ player {n[1]}: new at Lv {n[2]} with {n[4]} pals")
+        elif n is None:
+            lines.append(f"- player {o[1]}: no longer in save")
+        else:
+            changes = []
+            if o[2] != n[2]:
+                changes.append(f"level {o[2]} -> {n[2]}")
+            if o[4] != n[4]:
+                changes.append(f"pals {o[4]} -> {n[4]} ({n[4] - o[4]:+d})")
+            if o[3] != n[3]:
+                changes.append(f"guild {guild_name(o[3])} -> {guild_name(n[3])}")
+            if changes:
+                lines.append(f"~ player {n[1]}: {', '.join(changes)}")
+
+    for gid in sorted(old_guilds.keys() | new_guilds.keys()):
+        o, n = old_guilds.get(gid), new_guilds.get(gid)
+        if o is None:
+            lines.append(f"+ guild {n[1]}: created with {n[3]} members")
+        elif n is None:
+            lines.append(f"- guild {o[1]}: disbanded")
+        elif o[1] != n[1] or o[3] != n[3]:
+            lines.append(f"~ guild {n[1]}: members {o[3]} -> {n[3]}" + (f", renamed from {o[1]}" if o[1] != n[1] else ""))
+
+    old_bases = {b[0]: b for b in old["bases"]}
+    new_bases = {b[0]: b for b in new["bases"]}
+    for bid in sorted(old_bases.keys() | new_bases.keys()):
+        o, n = old_bases.get(bid), new_bases.get(bid)
+        if o is None:
+            lines.append(f"+ base {bid[:8]} ({guild_name(n[1])}): built at ({n[3]:.0f}, {n[4]:.0f})")
+        elif n is None:
+            lines.append(f"- base {bid[:8]} ({guild_name(o[1])}): destroyed at ({o[3]:.0f}, {o[4]:.0f})")
+        elif o[1] != n[1]:
+            lines.append(f"~ base {bid[:8]}: owner {guild_name(o[1])} -> {guild_name(n[1])}")
+
+    return lines
+
+def build_report(rows, old_entities, new_entities):
+    names = {}
+    for entities in (old_entities, new_entities):
+        if entities:
+            names.update({p[0].replace("-", ""): p[1] for p in entities["players"]})
+    files = file_changes(rows, names)
+    entities = entity_changes(old_entities, new_entities) if old_entities and new_entities else None
+    return files, entities
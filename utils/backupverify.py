@@ -0,0 +1,31 @@
+import hashlib
+import zipfile
+import zlib
+
+CHUNK_SIZE = 1024 * 1024
+
+# Runs inside a worker process. Reading every member to the end makes zipfile
+# check the stored CRC, and the same pass produces the SHA-256 manifest.
+def verify_archive(zip_path: str):
+    files = []
+    try:
+        with zipfile.ZipFile(zip_path) as z:
+            for info in z.infolist():
+                if info.is_dir():
+                    continue
+                digest = hashlib.sha256()
+                with z.open(info) as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                files.append({
+                    "path": info.filename,
+                    "size": info.file_size,
+                    "crc": info.CRC,
+                    "sha256": digest.hexdigest()
+                })
+    except (zipfile.BadZipFile, zlib.error, EOFError, OSError) as e:
+        return {"ok": False, "error": str(e), "files": files}
+
+    if not files:
+        return {"ok": False, "error": "Archive is empty.", "files": files}
+    return {"ok": True, "error": None, "files": files}
@@ -1,23 +1,178 @@
 import aiosqlite
+import csv
+import io
+import json
 import os
+import tempfile
 
 DATABASE_PATH = os.path.join('data', 'palworld.db')
 
-async def log_ban(player_id: str, reason: str):
+# Exports stay in memory up to this size, then spill to a temporary file.
+SPOOL_BYTES = 4 * 1048576
+
+# Re-banning a player in the same guild updates the reason but keeps the
+# original ban time.
+async def log_ban(guild_id: int, player_id: str, reason: str):
     async with aiosqlite.connect(DATABASE_PATH) as db:
         await db.execute("""
-            INSERT OR REPLACE INTO bans (player_id, reason)
-            VALUES (?, ?)
-        """, (player_id, reason))
+            INSERT INTO bans (guild_id, player_id, reason)
+            VALUES (?, ?, ?)
+            ON CONFLICT(guild_id, player_id) DO UPDATE SET reason = excluded.reason
+        """, (guild_id, player_id, reason))
+        await db.commit()
+
+async def remove_ban(guild_id: int, player_id: str):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.execute("DELETE FROM bans WHERE guild_id = ? AND player_id = ?", (guild_id, player_id))
         await db.commit()
         
-async def fetch_bans():
+# Every filter sits behind the guild_id prefix: player_id completes the key,
+# reason is a prefix range on idx_bans_guild_reason and since/until bound
+# idx_bans_guild_timestamp.
+def _ban_filter(guild_id, player_id=None, reason=None, since=None, until=None):
+    clauses, params = ["guild_id = ?"], [guild_id]
+    if player_id:
+        clauses.append("player_id = ?")
+        params.append(player_id)
+    if reason:
+        clauses.append("reason >= ? COLLATE NOCASE AND reason < ? COLLATE NOCASE")
+        params.extend((reason, reason + "\U0010ffff"))
+    if since:
+        clauses.append("timestamp >= ?")
+        params.append(since)
+    if until:
+        clauses.append("timestamp < ?")
+        params.append(until)
+    return "WHERE " + " AND ".join(clauses), params
+
+# Streams matching bans into a spooled file as CSV or JSON, reading the cursor
+# a batch at a time. Returns (file positioned at the start, row count).
+async def export_bans(guild_id: int, fmt: str = "csv", player_id=None, reason=None, since=None, until=None, batch: int = 1000):
+    where, params = _ban_filter(guild_id, player_id, reason, since, until)
+    columns = ["player_id", "reason", "timestamp"]
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    count = 0
+    if fmt == "json":
+        text.write("[")
+    else:
+        writer.writerow(columns)
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        cursor = await db.execute(f"SELECT {', '.join(columns)} FROM bans {where} ORDER BY timestamp", params)
+        while True:
+            rows = await cursor.fetchmany(batch)
+            if not rows:
+                break
+            if fmt == "json":
+                text.write("".join(("," if count or i else "") + "\n  " + json.dumps(dict(zip(columns, row))) for i, row in enumerate(rows)))
+            else:
+                writer.writerows(rows)
+            count += len(rows)
+    if fmt == "json":
+        text.write("\n]\n" if count else "]\n")
+    text.flush()
+    text.detach()
+    out.seek(0)
+    return out, count
+
+async def clear_bans(guild_id: int):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        cursor = await db.execute("DELETE FROM bans WHERE guild_id = ?", (guild_id,))
+        await db.commit()
+        return cursor.rowcount
+
+async def guild_ban_ids():
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        cursor = await db.execute("SELECT guild_id, player_id FROM bans")
+        return await cursor.fetchall()
+
+async def ban_sync_guilds():
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        cursor = await db.execute("SELECT DISTINCT guild_id FROM servers")
+        return [row[0] for row in await cursor.fetchall()]
+
+# Queues one ban or unban for every listed server; rows stay pending
+# (applied_at NULL) until a server accepts them.
+async def queue_ban_action(guild_id: int, server_names, player_id: str, action: str, reason: str, queued_at: int):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.executemany("""
+            INSERT OR REPLACE INTO ban_state (guild_id, server_name, player_id, action, reason, queued_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [(guild_id, server_name, player_id, action, reason, queued_at) for server_name in server_names])
+        await db.commit()
+
+# Queues every guild ban a server has no state for, which covers servers
+# added after the ban was issued.
+async def queue_missing_bans(guild_id: int, server_name: str, queued_at: int):
     async with aiosqlite.connect(DATABASE_PATH) as db:
-        cursor = await db.execute("SELECT player_id, reason, timestamp FROM bans")
-        results = await cursor.fetchall()
-        return results
+        cursor = await db.execute("""
+            INSERT OR IGNORE INTO ban_state (guild_id, server_name, player_id, action, reason, queued_at)
+            SELECT ?, ?, player_id, 'ban', reason, ? FROM bans WHERE guild_id = ?
+        """, (guild_id, server_name, queued_at, guild_id))
+        await db.commit()
+        return cursor.rowcount
+
+async def pending_ban_actions(guild_id: int, player_id: str = None):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        if player_id:
+            cursor = await db.execute("""
+                SELECT server_name, player_id, action, reason, queued_at FROM ban_state
+                WHERE guild_id = ? AND player_id = ? AND applied_at IS NULL
+            """, (guild_id, player_id))
+        else:
+            cursor = await db.execute("""
+                SELECT server_name, player_id, action, reason, queued_at FROM ban_state
+                WHERE guild_id = ? AND applied_at IS NULL
+            """, (guild_id,))
+        return await cursor.fetchall()
+
+# results are (player_id, error) with error None on success.
+async def record_ban_results(guild_id: int, server_name: str, results, applied_at: int):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.executemany("""
+            UPDATE ban_state SET applied_at = ?, error = ?
+            WHERE guild_id = ? AND server_name = ? AND player_id = ?
+        """, [(None if error else applied_at, error, guild_id, server_name, player_id) for player_id, error in results])
+        await db.commit()
+
+# Re-queues everything on a server, for when it may have come back from an
+# older save.
+async def requeue_server_bans(guild_id: int, server_name: str):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        cursor = await db.execute("""
+            UPDATE ban_state SET applied_at = NULL, error = NULL
+            WHERE guild_id = ? AND server_name = ? AND applied_at IS NOT NULL
+        """, (guild_id, server_name))
+        await db.commit()
+        return cursor.rowcount
 
-async def clear_bans():
+async def ban_server_starts(guild_id: int):
     async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute("DELETE FROM bans")
-        await db.commit()
\ No newline at end of file
+        cursor = await db.execute("SELECT server_name, started_at FROM ban_servers WHERE guild_id = ?", (guild_id,))
+        return dict(await cursor.fetchall())
+
+async def set_ban_server_start(guild_id: int, server_name: str, started_at: int):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.execute("INSERT OR REPLACE INTO ban_servers (guild_id, server_name, started_at) VALUES (?, ?, ?)", (guild_id, server_name, started_at))
+        await db.commit()
+
+async def ban_sync_summary(guild_id: int):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        cursor = await db.execute("""
+            SELECT server_name,
+                   SUM(applied_at IS NOT NULL),
+                   SUM(applied_at IS NULL),
+                   MIN(CASE WHEN applied_at IS NULL THEN queued_at END),
+                   MAX(applied_at - queued_at),
+                   MAX(CASE WHEN applied_at IS NULL THEN error END)
+            FROM ban_state WHERE guild_id = ?
+            GROUP BY server_name ORDER BY server_name
+        """, (guild_id,))
+        return await cursor.fetchall()
+
+async def remove_ban_state(guild_id: int, server_name: str):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.execute("DELETE FROM ban_state WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await db.execute("DELETE FROM ban_servers WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await db.commit()
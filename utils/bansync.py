@@ -0,0 +1,56 @@
+import asyncio
+import time
+from palworld_api import PalworldAPI
+from utils.database import fleet_servers
+from utils.bans import (
+    queue_ban_action,
+    pending_ban_actions,
+    record_ban_results
+)
+
+# Requests in flight per server; servers themselves are all worked at once.
+BAN_CONCURRENCY = 8
+
+async def _apply(api, player_id, action, reason):
+    if action == "ban":
+        response = await api.ban_player(player_id, reason or "Banned")
+    else:
+        response = await api.unban_player(player_id)
+    if isinstance(response, dict) and "error" in response:
+        return str(response["error"])
+    return None
+
+async def _push_server(guild_id, server, actions, concurrency):
+    name, host, password, api_port, rcon_port = server
+    start = time.perf_counter()
+    if not api_port:
+        results = [(player_id, "No REST API port configured.") for player_id, *_ in actions]
+    else:
+        api = PalworldAPI(f"http://{host}:{api_port}", password)
+        limit = asyncio.Semaphore(concurrency)
+
+        async def run(player_id, action, reason):
+            async with limit:
+                try:
+                    return player_id, await _apply(api, player_id, action, reason)
+                except Exception as e:
+                    return player_id, str(e) or type(e).__name__
+
+        results = await asyncio.gather(*(run(*a) for a in actions))
+    await record_ban_results(guild_id, name, results, int(time.time()))
+    failed = [r for r in results if r[1]]
+    return name, len(results) - len(failed), failed, time.perf_counter() - start
+
+# Pushes every pending action for a guild (or one player) to its servers and
+# returns [(server_name, applied, [(player_id, error)], seconds)].
+async def converge(guild_id: int, player_id: str = None, concurrency: int = BAN_CONCURRENCY):
+    pending = {}
+    for server_name, pid, action, reason, _ in await pending_ban_actions(guild_id, player_id):
+        pending.setdefault(server_name, []).append((pid, action, reason))
+    servers = [s for s in await fleet_servers(guild_id) if s[0] in pending]
+    return await asyncio.gather(*(_push_server(guild_id, s, pending[s[0]], concurrency) for s in servers))
+
+async def push_ban_action(guild_id: int, player_id: str, action: str, reason: str = None):
+    servers = await fleet_servers(guild_id)
+    await queue_ban_action(guild_id, [s[0] for s in servers], player_id, action, reason, int(time.time()))
+    return await converge(guild_id, player_id)
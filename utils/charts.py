@@ -0,0 +1,56 @@
+import io
+import datetime
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+
+# Rows come from fetch_save_series:
+# (bucket, resolution, samples, size_avg, size_max, gap_avg, gap_max, duration_avg, duration_max)
+def render_growth_chart(server_name, rows):
+    times = [datetime.datetime.utcfromtimestamp(r[0]) for r in rows]
+    sizes = [r[3] / 1048576 for r in rows]
+    durations = [r[7] for r in rows]
+
+    fig, (size_ax, duration_ax) = plt.subplots(2, 1, sharex=True, figsize=(9, 6))
+    size_ax.plot(times, sizes, color="#5865F2")
+    size_ax.set_ylabel("Level.sav (MB)")
+    size_ax.set_title(f"{server_name} save growth")
+    size_ax.grid(alpha=0.3)
+    duration_ax.plot(times, durations, color="#ED4245")
+    duration_ax.set_ylabel("Save duration (s)")
+    duration_ax.grid(alpha=0.3)
+    fig.autofmt_xdate()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    buffer.seek(0)
+    return buffer
+
+# Blobs come from fetch_position_samples: packed int32 (x, y) world positions.
+def render_heatmap(server_name, blobs, hours, bins=200):
+    positions = np.frombuffer(b"".join(blobs), dtype=np.int32).reshape(-1, 2)
+    counts, xedges, yedges = np.histogram2d(positions[:, 0], positions[:, 1], bins=bins)
+
+    fig, ax = plt.subplots(figsize=(8, 8))
+    ax.set_facecolor("#111214")
+    image = ax.imshow(
+        counts.T,
+        origin="lower",
+        extent=(xedges[0], xedges[-1], yedges[0], yedges[-1]),
+        norm=LogNorm(vmin=1, vmax=max(counts.max(), 1)),
+        cmap="inferno",
+        interpolation="nearest"
+    )
+    fig.colorbar(image, ax=ax, shrink=0.8, label="Player samples")
+    ax.set_title(f"{server_name} player positions, last {hours}h")
+    ax.set_xlabel("World X")
+    ax.set_ylabel("World Y")
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=100, bbox_inches="tight")
+    plt.close(fig)
+    buffer.seek(0)
+    return buffer, len(positions)
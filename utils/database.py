@@ -25,7 +25,7 @@ async def initialize_db():
             PRIMARY KEY (guild_id, server_name)
         )""",
         """CREATE TABLE IF NOT EXISTS players (
-            user_id TEXT PRIMARY KEY,
+            user_id TEXT NOT NULL UNIQUE,
             name TEXT NOT NULL,
             account_name TEXT NOT NULL,
             player_id TEXT NOT NULL,
@@ -33,12 +33,19 @@ async def initialize_db():
             ping REAL NOT NULL,
             location_x REAL NOT NULL,
             location_y REAL NOT NULL,
-            level INTEGER NOT NULL
+            level INTEGER NOT NULL,
+            search_id INTEGER PRIMARY KEY
         )""",
         """CREATE TABLE IF NOT EXISTS whitelist (
             player_id TEXT PRIMARY KEY,
             whitelisted BOOLEAN NOT NULL
         )""",
+        """CREATE TABLE IF NOT EXISTS whitelist_entries (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            player_id TEXT NOT NULL,
+            PRIMARY KEY (guild_id, server_name, player_id)
+        ) WITHOUT ROWID""",
         """CREATE TABLE IF NOT EXISTS whitelist_status (
             guild_id INTEGER NOT NULL,
             server_name TEXT NOT NULL,
@@ -46,10 +53,14 @@ async def initialize_db():
             PRIMARY KEY (guild_id, server_name)
         )""",
         """CREATE TABLE IF NOT EXISTS bans (
-            player_id TEXT PRIMARY KEY,
+            guild_id INTEGER NOT NULL,
+            player_id TEXT NOT NULL,
             reason TEXT NOT NULL,
-            timestamp DEFAULT CURRENT_TIMESTAMP
+            timestamp DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (guild_id, player_id)
         )""",
+        "CREATE INDEX IF NOT EXISTS idx_bans_guild_timestamp ON bans (guild_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_bans_guild_reason ON bans (guild_id, reason COLLATE NOCASE)",
         """CREATE TABLE IF NOT EXISTS server_logs (
             guild_id INTEGER NOT NULL,
             channel_id INTEGER NOT NULL,
@@ -94,11 +105,172 @@ async def initialize_db():
             kit_name TEXT PRIMARY KEY,
             commands TEXT NOT NULL,
             description TEXT NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS backup_history (
+            backup_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        """CREATE INDEX IF NOT EXISTS idx_backup_history_server
+            ON backup_history (guild_id, server_name, backup_id)""",
+        """CREATE TABLE IF NOT EXISTS backup_files (
+            backup_id INTEGER NOT NULL,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            crc INTEGER NOT NULL,
+            sha256 TEXT NOT NULL,
+            PRIMARY KEY (backup_id, path)
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_backup_files_sha256 ON backup_files (sha256)",
+        """CREATE TABLE IF NOT EXISTS save_parses (
+            sha256 TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            error TEXT,
+            parsed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )""",
+        """CREATE TABLE IF NOT EXISTS save_players (
+            sha256 TEXT NOT NULL,
+            player_uid TEXT NOT NULL,
+            nickname TEXT NOT NULL,
+            level INTEGER NOT NULL,
+            guild_id TEXT,
+            pal_count INTEGER NOT NULL,
+            PRIMARY KEY (sha256, player_uid)
+        )""",
+        """CREATE TABLE IF NOT EXISTS save_guilds (
+            sha256 TEXT NOT NULL,
+            guild_id TEXT NOT NULL,
+            guild_name TEXT NOT NULL,
+            admin_uid TEXT NOT NULL,
+            member_count INTEGER NOT NULL,
+            PRIMARY KEY (sha256, guild_id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS save_bases (
+            sha256 TEXT NOT NULL,
+            base_id TEXT NOT NULL,
+            guild_id TEXT NOT NULL,
+            base_name TEXT NOT NULL,
+            x REAL NOT NULL,
+            y REAL NOT NULL,
+            z REAL NOT NULL,
+            PRIMARY KEY (sha256, base_id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS save_monitors (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            save_path TEXT NOT NULL,
+            stall_seconds INTEGER NOT NULL DEFAULT 300,
+            threshold INTEGER NOT NULL DEFAULT 3,
+            PRIMARY KEY (guild_id, server_name)
+        )""",
+        """CREATE TABLE IF NOT EXISTS save_series (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            resolution INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            samples INTEGER NOT NULL,
+            size_avg REAL NOT NULL,
+            size_max INTEGER NOT NULL,
+            gap_avg REAL NOT NULL,
+            gap_max REAL NOT NULL,
+            duration_avg REAL NOT NULL,
+            duration_max REAL NOT NULL,
+            PRIMARY KEY (guild_id, server_name, resolution, bucket)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS server_tags (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (guild_id, tag, server_name)
+        )""",
+        """CREATE TABLE IF NOT EXISTS movement_checks (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            max_speed REAL NOT NULL DEFAULT 5000,
+            strikes INTEGER NOT NULL DEFAULT 2,
+            kick INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (guild_id, server_name)
+        )""",
+        """CREATE TABLE IF NOT EXISTS pd_export_dirs (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            export_dir TEXT NOT NULL,
+            PRIMARY KEY (guild_id, server_name)
+        )""",
+        """CREATE TABLE IF NOT EXISTS position_samples (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            sampled_at INTEGER NOT NULL,
+            positions BLOB NOT NULL,
+            PRIMARY KEY (guild_id, server_name, sampled_at)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS global_bans (
+            player_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            reason TEXT,
+            synced_at INTEGER NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_global_bans_name ON global_bans (name COLLATE NOCASE)",
+        """CREATE TABLE IF NOT EXISTS global_ban_sync (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            etag TEXT,
+            last_modified TEXT,
+            synced_at INTEGER
+        )""",
+        """CREATE TABLE IF NOT EXISTS ban_state (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            player_id TEXT NOT NULL,
+            action TEXT NOT NULL,
+            reason TEXT,
+            queued_at INTEGER NOT NULL,
+            applied_at INTEGER,
+            error TEXT,
+            PRIMARY KEY (guild_id, server_name, player_id)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS player_presence (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            user_id TEXT NOT NULL,
+            name TEXT NOT NULL,
+            online INTEGER NOT NULL,
+            joined_at TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            PRIMARY KEY (guild_id, server_name, user_id)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS idx_player_presence_user ON player_presence (user_id)",
+        """CREATE TABLE IF NOT EXISTS player_observations (
+            guild_id INTEGER NOT NULL,
+            user_id TEXT NOT NULL,
+            ip TEXT NOT NULL,
+            account_name TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            PRIMARY KEY (guild_id, user_id, ip, account_name)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE IF NOT EXISTS moderation_rules (
+            rule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id INTEGER NOT NULL,
+            server_name TEXT,
+            kind TEXT NOT NULL,
+            value TEXT NOT NULL,
+            reason TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS ban_servers (
+            guild_id INTEGER NOT NULL,
+            server_name TEXT NOT NULL,
+            started_at INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, server_name)
         )"""
     ]
     conn = await db_connection()
     if conn is not None:
         cursor = await conn.cursor()
+        await migrate_bans(cursor)
         for command in commands:
             await cursor.execute(command)
         try:
@@ -106,17 +278,187 @@ async def initialize_db():
         except aiosqlite.OperationalError:
             # Column already exists, ignore
             pass
+        await migrate_player_observations(cursor)
+        await migrate_whitelist(cursor)
+        await cursor.execute("CREATE INDEX IF NOT EXISTS idx_player_observations_ip ON player_observations (guild_id, ip)")
+        await cursor.execute("CREATE INDEX IF NOT EXISTS idx_player_observations_account ON player_observations (guild_id, account_name)")
+        await initialize_player_search(cursor)
         await conn.commit()
         await conn.close()
 
+# Bans used to be keyed by player_id alone, so a ban in one guild replaced
+# another guild's ban of the same player. Rebuilds the table keyed by
+# (guild_id, player_id). Bans recorded before guild_id existed belong to the
+# only guild when a single guild has servers; otherwise their guild is unknown
+# and they are kept in legacy_bans as history, never enforced or synced.
+async def migrate_bans(cursor):
+    await cursor.execute("PRAGMA table_info(bans)")
+    columns = {row[1]: row[5] for row in await cursor.fetchall()}
+    if not columns or columns.get("guild_id"):
+        return
+    if "guild_id" not in columns:
+        await cursor.execute("ALTER TABLE bans ADD COLUMN guild_id INTEGER")
+    await cursor.execute("""
+        CREATE TABLE bans_migrated (
+            guild_id INTEGER NOT NULL,
+            player_id TEXT NOT NULL,
+            reason TEXT NOT NULL,
+            timestamp DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (guild_id, player_id)
+        )
+    """)
+    await cursor.execute("""
+        INSERT OR IGNORE INTO bans_migrated (guild_id, player_id, reason, timestamp)
+        SELECT guild_id, player_id, reason, timestamp FROM bans WHERE guild_id IS NOT NULL
+    """)
+    await cursor.execute("SELECT DISTINCT guild_id FROM servers")
+    guilds = await cursor.fetchall()
+    if len(guilds) == 1:
+        await cursor.execute("""
+            INSERT OR IGNORE INTO bans_migrated (guild_id, player_id, reason, timestamp)
+            SELECT ?, player_id, reason, timestamp FROM bans WHERE guild_id IS NULL
+        """, guilds[0])
+    else:
+        await cursor.execute("""
+            CREATE TABLE IF NOT EXISTS legacy_bans (
+                player_id TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                timestamp
+            )
+        """)
+        await cursor.execute("INSERT INTO legacy_bans (player_id, reason, timestamp) SELECT player_id, reason, timestamp FROM bans WHERE guild_id IS NULL")
+    await cursor.execute("DROP TABLE bans")
+    await cursor.execute("ALTER TABLE bans_migrated RENAME TO bans")
+
+# The old global whitelist applied to every server of every guild; its rows
+# become per-server entries so they can be listed and removed per guild.
+async def migrate_whitelist(cursor):
+    await cursor.execute("""
+        INSERT OR IGNORE INTO whitelist_entries (guild_id, server_name, player_id)
+        SELECT s.guild_id, s.server_name, w.player_id FROM whitelist w JOIN servers s
+        WHERE w.whitelisted
+    """)
+    await cursor.execute("DELETE FROM whitelist")
+
+# Observations were recorded without a guild, which let /alts link accounts
+# across guilds. Old rows are assigned to the guilds the player has presence
+# in; players never seen there are kept only when a single guild has servers.
+async def migrate_player_observations(cursor):
+    await cursor.execute("PRAGMA table_info(player_observations)")
+    if any(row[1] == "guild_id" for row in await cursor.fetchall()):
+        return
+    await cursor.execute("DROP INDEX IF EXISTS idx_player_observations_ip")
+    await cursor.execute("DROP INDEX IF EXISTS idx_player_observations_account")
+    await cursor.execute("ALTER TABLE player_observations RENAME TO player_observations_old")
+    await cursor.execute("""
+        CREATE TABLE player_observations (
+            guild_id INTEGER NOT NULL,
+            user_id TEXT NOT NULL,
+            ip TEXT NOT NULL,
+            account_name TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            PRIMARY KEY (guild_id, user_id, ip, account_name)
+        ) WITHOUT ROWID
+    """)
+    await cursor.execute("""
+        INSERT OR IGNORE INTO player_observations (guild_id, user_id, ip, account_name, first_seen)
+        SELECT p.guild_id, o.user_id, o.ip, o.account_name, o.first_seen
+        FROM player_observations_old o JOIN (SELECT DISTINCT guild_id, user_id FROM player_presence) p ON p.user_id = o.user_id
+    """)
+    await cursor.execute("""
+        INSERT OR IGNORE INTO player_observations (guild_id, user_id, ip, account_name, first_seen)
+        SELECT s.guild_id, o.user_id, o.ip, o.account_name, o.first_seen
+        FROM player_observations_old o JOIN (SELECT DISTINCT guild_id FROM servers) s
+        WHERE (SELECT COUNT(DISTINCT guild_id) FROM servers) = 1
+          AND NOT EXISTS (SELECT 1 FROM player_presence p WHERE p.user_id = o.user_id)
+    """)
+    await cursor.execute("DROP TABLE player_observations_old")
+
+# players_fts used to follow the implicit rowid of players, which VACUUM may
+# renumber since user_id is a TEXT key. Rebuilds players with an INTEGER
+# PRIMARY KEY (search_id) and drops the old index so it is rebuilt against it.
+async def migrate_players(cursor):
+    await cursor.execute("PRAGMA table_info(players)")
+    if any(row[1] == "search_id" for row in await cursor.fetchall()):
+        return
+    for trigger in ("players_fts_insert", "players_fts_delete", "players_fts_update"):
+        await cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    await cursor.execute("DROP TABLE IF EXISTS players_fts")
+    await cursor.execute("""
+        CREATE TABLE players_migrated (
+            user_id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            account_name TEXT NOT NULL,
+            player_id TEXT NOT NULL,
+            ip TEXT NOT NULL,
+            ping REAL NOT NULL,
+            location_x REAL NOT NULL,
+            location_y REAL NOT NULL,
+            level INTEGER NOT NULL,
+            search_id INTEGER PRIMARY KEY
+        )
+    """)
+    await cursor.execute("""
+        INSERT INTO players_migrated (user_id, name, account_name, player_id, ip, ping, location_x, location_y, level)
+        SELECT user_id, name, account_name, player_id, ip, ping, location_x, location_y, level FROM players ORDER BY rowid
+    """)
+    await cursor.execute("DROP TABLE players")
+    await cursor.execute("ALTER TABLE players_migrated RENAME TO players")
+
+# Trigram index over players for autocomplete, kept in sync by triggers. The
+# update trigger skips the ping/location refreshes the player loop does every
+# poll. Needs SQLite 3.34+; older builds fall back to LIKE in player_autocomplete.
+async def initialize_player_search(cursor):
+    await migrate_players(cursor)
+    await cursor.execute("CREATE INDEX IF NOT EXISTS idx_players_name ON players (name COLLATE NOCASE)")
+    await cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'players_fts'")
+    exists = await cursor.fetchone()
+    try:
+        await cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS players_fts USING fts5(
+                user_id, name, account_name, content='players', content_rowid='search_id', tokenize='trigram'
+            )
+        """)
+    except aiosqlite.OperationalError as e:
+        logging.warning(f"Trigram player search unavailable: {e}")
+        return
+    await cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS players_fts_insert AFTER INSERT ON players BEGIN
+            INSERT INTO players_fts (rowid, user_id, name, account_name) VALUES (new.search_id, new.user_id, new.name, new.account_name);
+        END
+    """)
+    await cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS players_fts_delete AFTER DELETE ON players BEGIN
+            INSERT INTO players_fts (players_fts, rowid, user_id, name, account_name) VALUES ('delete', old.search_id, old.user_id, old.name, old.account_name);
+        END
+    """)
+    await cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS players_fts_update AFTER UPDATE OF name, account_name ON players
+        WHEN old.name IS NOT new.name OR old.account_name IS NOT new.account_name BEGIN
+            INSERT INTO players_fts (players_fts, rowid, user_id, name, account_name) VALUES ('delete', old.search_id, old.user_id, old.name, old.account_name);
+            INSERT INTO players_fts (rowid, user_id, name, account_name) VALUES (new.search_id, new.user_id, new.name, new.account_name);
+        END
+    """)
+    if not exists:
+        await cursor.execute("INSERT INTO players_fts (players_fts) VALUES ('rebuild')")
+
 async def add_player(player):
+    await add_players([player])
+
+async def add_players(players):
     conn = await db_connection()
     if conn is not None:
         cursor = await conn.cursor()
-        await cursor.execute("""
-            INSERT OR REPLACE INTO players (user_id, name, account_name, player_id, ip, ping, location_x, location_y, level)
+        # An upsert rather than INSERT OR REPLACE: REPLACE deletes the old row
+        # without firing delete triggers, which would leave players_fts stale.
+        await cursor.executemany("""
+            INSERT INTO players (user_id, name, account_name, player_id, ip, ping, location_x, location_y, level)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+            ON CONFLICT(user_id) DO UPDATE SET
+                name = excluded.name, account_name = excluded.account_name, player_id = excluded.player_id,
+                ip = excluded.ip, ping = excluded.ping, location_x = excluded.location_x,
+                location_y = excluded.location_y, level = excluded.level
+        """, [(
             player['userId'],
             player['name'],
             player['accountName'],
@@ -126,7 +468,7 @@ async def add_player(player):
             player['location_x'],
             player['location_y'],
             player['level']
-        ))
+        ) for player in players])
         await conn.commit()
         await conn.close()
 
@@ -139,14 +481,117 @@ async def fetch_player(user_id):
         await conn.close()
         return player
 
-async def player_autocomplete(current):
+# Ranked in tiers, each its own indexed query stopped at the limit: names
+# starting with the input, then user ids starting with it, then substring
+# matches anywhere in name, account name or user id through the trigram
+# index. Later tiers only run if earlier ones didn't fill the list.
+async def player_autocomplete(current, limit=25):
+    current = current.strip()
+    upper = current + "\U0010ffff"
+    tiers = [
+        ("""SELECT user_id, name FROM players
+            WHERE name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE
+            ORDER BY name COLLATE NOCASE LIMIT ?""", (current, upper, limit)),
+        ("SELECT user_id, name FROM players WHERE user_id >= ? AND user_id < ? ORDER BY user_id LIMIT ?", (current, upper, limit))
+    ]
+    # Trigrams need at least three characters.
+    if len(current) >= 3:
+        tiers.append(("""SELECT p.user_id, p.name FROM players_fts f JOIN players p ON p.search_id = f.rowid
+            WHERE players_fts MATCH ? LIMIT ?""", ('"' + current.replace('"', '""') + '"', limit * 2)))
+    conn = await db_connection()
+    players = {}
+    if conn is not None:
+        cursor = await conn.cursor()
+        for query, params in tiers:
+            if len(players) >= limit:
+                break
+            try:
+                await cursor.execute(query, params)
+            except aiosqlite.OperationalError:
+                # No trigram index on this SQLite build.
+                await cursor.execute("SELECT user_id, name FROM players WHERE name LIKE ? LIMIT ?", (f'%{current}%', limit))
+            for user_id, name in await cursor.fetchall():
+                players.setdefault(user_id, name)
+        await conn.close()
+    return list(players.items())[:limit]
+
+# Player Presence
+async def update_presence(guild_id, server_name, joined, left_ids, now):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.executemany("""
+            INSERT INTO player_presence (guild_id, server_name, user_id, name, online, joined_at, last_seen)
+            VALUES (?, ?, ?, ?, 1, ?, ?)
+            ON CONFLICT(guild_id, server_name, user_id) DO UPDATE SET
+                name = excluded.name, online = 1, joined_at = excluded.joined_at, last_seen = excluded.last_seen
+        """, [(guild_id, server_name, user_id, name, now, now) for user_id, name in joined])
+        await cursor.executemany("""
+            UPDATE player_presence SET online = 0, last_seen = ?
+            WHERE guild_id = ? AND server_name = ? AND user_id = ?
+        """, [(now, guild_id, server_name, user_id) for user_id in left_ids])
+        await conn.commit()
+        await conn.close()
+
+# Nothing is known to be online at startup; the first snapshot re-joins
+# whoever still is.
+async def reset_presence():
     conn = await db_connection()
     if conn is not None:
         cursor = await conn.cursor()
-        await cursor.execute("SELECT user_id, name FROM players WHERE name LIKE ?", (f'%{current}%',))
-        players = await cursor.fetchall()
+        await cursor.execute("UPDATE player_presence SET online = 0 WHERE online")
+        await conn.commit()
+        await conn.close()
+
+async def fetch_presence(guild_id, user_id):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT server_name, online, joined_at, last_seen FROM player_presence
+            WHERE user_id = ? AND guild_id = ? ORDER BY last_seen DESC
+        """, (user_id, guild_id))
+        rows = await cursor.fetchall()
         await conn.close()
-        return [(player[0], player[1]) for player in players]
+        return rows
+    return []
+
+# Player Observations
+async def add_player_observations(rows):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.executemany("""
+            INSERT OR IGNORE INTO player_observations (guild_id, user_id, ip, account_name, first_seen)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+        await conn.commit()
+        await conn.close()
+
+async def fetch_player_observations():
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT guild_id, user_id, ip, account_name FROM player_observations")
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+    return []
+
+async def fetch_alt_evidence(guild_id, user_ids):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        marks = ", ".join("?" * len(user_ids))
+        await cursor.execute(f"""
+            SELECT o.user_id, o.ip, o.account_name, o.first_seen, p.name
+            FROM player_observations o LEFT JOIN players p ON p.user_id = o.user_id
+            WHERE o.guild_id = ? AND o.user_id IN ({marks})
+        """, [guild_id, *user_ids])
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+    return []
 
 async def fetch_all_servers():
     conn = await db_connection()
@@ -183,23 +628,68 @@ async def remove_server(guild_id, server_name):
         await conn.commit()
         await conn.close()
 
-async def remove_whitelist_status(guild_id, server_name):
+async def server_autocomplete(guild_id, current):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT server_name FROM servers WHERE guild_id = ? AND server_name LIKE ?", (guild_id, f'%{current}%'))
+        servers = await cursor.fetchall()
+        await conn.close()
+        return [server[0] for server in servers]
+    
+# Server Tags
+async def add_server_tag(guild_id, server_name, tag):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("INSERT OR IGNORE INTO server_tags (guild_id, server_name, tag) VALUES (?, ?, ?)", (guild_id, server_name, tag))
+        await conn.commit()
+        await conn.close()
+
+async def remove_server_tag(guild_id, server_name, tag):
     conn = await db_connection()
     if conn is not None:
         cursor = await conn.cursor()
-        await cursor.execute("DELETE FROM whitelist_status WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await cursor.execute("DELETE FROM server_tags WHERE guild_id = ? AND server_name = ? AND tag = ?", (guild_id, server_name, tag))
         await conn.commit()
         await conn.close()
 
-async def server_autocomplete(guild_id, current):
+async def del_server_tags(guild_id, server_name):
     conn = await db_connection()
     if conn is not None:
         cursor = await conn.cursor()
-        await cursor.execute("SELECT server_name FROM servers WHERE guild_id = ? AND server_name LIKE ?", (guild_id, f'%{current}%'))
+        await cursor.execute("DELETE FROM server_tags WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await conn.commit()
+        await conn.close()
+
+async def tag_autocomplete(guild_id, current):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT DISTINCT tag FROM server_tags WHERE guild_id = ? AND tag LIKE ? ORDER BY tag LIMIT 25", (guild_id, f'%{current}%'))
+        tags = await cursor.fetchall()
+        await conn.close()
+        return [tag[0] for tag in tags]
+
+# Every server in the guild, or only those carrying the given tag.
+async def fleet_servers(guild_id, tag=None):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        if tag:
+            await cursor.execute("""
+                SELECT s.server_name, s.host, s.password, s.api_port, s.rcon_port
+                FROM server_tags t
+                JOIN servers s ON s.guild_id = t.guild_id AND s.server_name = t.server_name
+                WHERE t.guild_id = ? AND t.tag = ?
+                ORDER BY s.server_name
+            """, (guild_id, tag))
+        else:
+            await cursor.execute("SELECT server_name, host, password, api_port, rcon_port FROM servers WHERE guild_id = ? ORDER BY server_name", (guild_id,))
         servers = await cursor.fetchall()
         await conn.close()
-        return [server[0] for server in servers]
-    
+        return servers
+
 # Server Logs
 async def add_logchannel(guild_id, channel_id, server_name):
     conn = await db_connection()
@@ -350,6 +840,545 @@ async def del_backup(guild_id, server_name):
         await conn.commit()
         await conn.close()
 
+async def add_backup_record(guild_id, server_name, filename, size):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            INSERT INTO backup_history (guild_id, server_name, filename, size)
+            VALUES (?, ?, ?, ?)
+        """, (guild_id, server_name, filename, size))
+        backup_id = cursor.lastrowid
+        await conn.commit()
+        await conn.close()
+        return backup_id
+
+async def set_backup_status(backup_id, status, error=None, files=None):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute(
+            "UPDATE backup_history SET status = ?, error = ? WHERE backup_id = ?",
+            (status, error, backup_id)
+        )
+        if files:
+            await cursor.executemany("""
+                INSERT OR REPLACE INTO backup_files (backup_id, path, size, crc, sha256)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(backup_id, f["path"], f["size"], f["crc"], f["sha256"]) for f in files])
+        await conn.commit()
+        await conn.close()
+
+# Drops all but the newest `keep` backup manifests for a server, then any
+# parsed save data no remaining manifest points at. Identical saves share one
+# parse, so a hash is only removed once nothing references it.
+async def prune_backup_history(guild_id, server_name, keep):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT backup_id FROM backup_history
+            WHERE guild_id = ? AND server_name = ?
+            ORDER BY backup_id DESC LIMIT -1 OFFSET ?
+        """, (guild_id, server_name, keep))
+        ids = [(row[0],) for row in await cursor.fetchall()]
+        if not ids:
+            await conn.close()
+            return 0
+        hashes = set()
+        for (backup_id,) in ids:
+            await cursor.execute("SELECT sha256 FROM backup_files WHERE backup_id = ?", (backup_id,))
+            hashes.update(row[0] for row in await cursor.fetchall())
+        await cursor.executemany("DELETE FROM backup_files WHERE backup_id = ?", ids)
+        await cursor.executemany("DELETE FROM backup_history WHERE backup_id = ?", ids)
+        orphans = []
+        for sha256 in hashes:
+            await cursor.execute("SELECT 1 FROM backup_files WHERE sha256 = ? LIMIT 1", (sha256,))
+            if not await cursor.fetchone():
+                orphans.append((sha256,))
+        for table in ("save_players", "save_guilds", "save_bases", "save_parses"):
+            await cursor.executemany(f"DELETE FROM {table} WHERE sha256 = ?", orphans)
+        await conn.commit()
+        await conn.close()
+        return len(ids)
+    return 0
+
+async def recent_backups(guild_id, server_name, current="", limit=25):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT backup_id, filename, status, created_at
+            FROM backup_history
+            WHERE guild_id = ? AND server_name = ? AND filename LIKE ?
+            ORDER BY backup_id DESC
+            LIMIT ?
+        """, (guild_id, server_name, f"%{current}%", limit))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+    return []
+
+async def fetch_backup(guild_id, server_name, backup_id):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT backup_id, filename, status, created_at
+            FROM backup_history
+            WHERE guild_id = ? AND server_name = ? AND backup_id = ?
+        """, (guild_id, server_name, backup_id))
+        row = await cursor.fetchone()
+        await conn.close()
+        return row
+
+# Only files whose hash differs come back; unchanged saves never leave SQLite.
+async def diff_backup_files(old_id, new_id):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT n.path, o.size, n.size, o.sha256, n.sha256
+            FROM backup_files n
+            LEFT JOIN backup_files o ON o.backup_id = ? AND o.path = n.path
+            WHERE n.backup_id = ? AND (o.sha256 IS NULL OR o.sha256 != n.sha256)
+            UNION ALL
+            SELECT o.path, o.size, NULL, o.sha256, NULL
+            FROM backup_files o
+            WHERE o.backup_id = ? AND NOT EXISTS (
+                SELECT 1 FROM backup_files n WHERE n.backup_id = ? AND n.path = o.path
+            )
+        """, (old_id, new_id, old_id, new_id))
+        rows = await cursor.fetchall()
+        await cursor.execute("""
+            SELECT COUNT(*) FROM backup_files WHERE backup_id = ?
+        """, (new_id,))
+        total = (await cursor.fetchone())[0]
+        await conn.close()
+        return rows, total
+    return [], 0
+
+async def fetch_backup_file_hash(backup_id, path):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT sha256 FROM backup_files WHERE backup_id = ? AND path = ?", (backup_id, path))
+        row = await cursor.fetchone()
+        await conn.close()
+        return row[0] if row else None
+
+# Save Monitor
+async def set_save_monitor(guild_id, server_name, save_path, stall_seconds, threshold):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            INSERT OR REPLACE INTO save_monitors (guild_id, server_name, save_path, stall_seconds, threshold)
+            VALUES (?, ?, ?, ?, ?)
+        """, (guild_id, server_name, save_path, stall_seconds, threshold))
+        await conn.commit()
+        await conn.close()
+
+async def del_save_monitor(guild_id, server_name):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("DELETE FROM save_monitors WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await conn.commit()
+        await conn.close()
+
+async def all_save_monitors():
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT m.guild_id, m.server_name, m.save_path, m.stall_seconds, m.threshold, s.host, s.password, s.api_port
+            FROM save_monitors m
+            JOIN servers s ON s.guild_id = m.guild_id AND s.server_name = m.server_name
+        """)
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+    return []
+
+# Global Ban Mirror
+async def fetch_global_bans():
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT player_id, name, reason FROM global_bans")
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+    return []
+
+async def global_ban_sync_state():
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT etag, last_modified, synced_at FROM global_ban_sync WHERE id = 1")
+        row = await cursor.fetchone()
+        await conn.close()
+        return row
+
+# Name filters are prefix ranges so they stay on idx_global_bans_name.
+def _global_ban_filter(name):
+    if not name:
+        return "", ()
+    return "WHERE name >= ? COLLATE NOCASE AND name < ? COLLATE NOCASE", (name, name + "\U0010ffff")
+
+async def count_global_bans(name=None):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        where, params = _global_ban_filter(name)
+        await cursor.execute(f"SELECT COUNT(*) FROM global_bans {where}", params)
+        row = await cursor.fetchone()
+        await conn.close()
+        return row[0]
+    return 0
+
+async def fetch_global_ban_page(offset, limit, name=None):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        where, params = _global_ban_filter(name)
+        await cursor.execute(f"""
+            SELECT player_id, name, reason FROM global_bans {where}
+            ORDER BY name COLLATE NOCASE LIMIT ? OFFSET ?
+        """, (*params, limit, offset))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+    return []
+
+# Applies only what changed since the last sync, together with the validators
+# for the next conditional request, in one transaction.
+async def apply_global_ban_changes(upserts, deletes, etag, last_modified, synced_at):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.executemany("""
+            INSERT INTO global_bans (player_id, name, reason, synced_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(player_id) DO UPDATE SET name = excluded.name, reason = excluded.reason, synced_at = excluded.synced_at
+        """, [(player_id, name, reason, synced_at) for player_id, name, reason in upserts])
+        await cursor.executemany("DELETE FROM global_bans WHERE player_id = ?", [(player_id,) for player_id in deletes])
+        await cursor.execute("""
+            INSERT INTO global_ban_sync (id, etag, last_modified, synced_at) VALUES (1, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified, synced_at = excluded.synced_at
+        """, (etag, last_modified, synced_at))
+        await conn.commit()
+        await conn.close()
+
+# Moderation Rules
+async def add_moderation_rule(guild_id, server_name, kind, value, reason):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            INSERT INTO moderation_rules (guild_id, server_name, kind, value, reason)
+            VALUES (?, ?, ?, ?, ?)
+        """, (guild_id, server_name, kind, value, reason))
+        rule_id = cursor.lastrowid
+        await conn.commit()
+        await conn.close()
+        return rule_id
+
+async def remove_moderation_rule(guild_id, rule_id):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("DELETE FROM moderation_rules WHERE guild_id = ? AND rule_id = ?", (guild_id, rule_id))
+        removed = cursor.rowcount
+        await conn.commit()
+        await conn.close()
+        return removed
+
+async def fetch_moderation_rules(guild_id=None):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        if guild_id is None:
+            await cursor.execute("SELECT rule_id, guild_id, server_name, kind, value, reason FROM moderation_rules ORDER BY rule_id")
+        else:
+            await cursor.execute("SELECT rule_id, guild_id, server_name, kind, value, reason FROM moderation_rules WHERE guild_id = ? ORDER BY rule_id", (guild_id,))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+    return []
+
+async def del_moderation_rules(guild_id, server_name):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("DELETE FROM moderation_rules WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await conn.commit()
+        await conn.close()
+
+# Movement Checks
+async def set_movement_check(guild_id, server_name, max_speed, strikes, kick):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            INSERT OR REPLACE INTO movement_checks (guild_id, server_name, max_speed, strikes, kick)
+            VALUES (?, ?, ?, ?, ?)
+        """, (guild_id, server_name, max_speed, strikes, int(kick)))
+        await conn.commit()
+        await conn.close()
+
+async def del_movement_check(guild_id, server_name):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("DELETE FROM movement_checks WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await conn.commit()
+        await conn.close()
+
+async def all_movement_checks():
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT guild_id, server_name, max_speed, strikes, kick FROM movement_checks")
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+
+# PalDefender export folders, as this host sees them
+async def set_export_dir(guild_id, server_name, export_dir):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("INSERT OR REPLACE INTO pd_export_dirs (guild_id, server_name, export_dir) VALUES (?, ?, ?)", (guild_id, server_name, export_dir))
+        await conn.commit()
+        await conn.close()
+
+async def del_export_dir(guild_id, server_name):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("DELETE FROM pd_export_dirs WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await conn.commit()
+        await conn.close()
+
+async def fetch_export_dir(guild_id, server_name):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT export_dir FROM pd_export_dirs WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        row = await cursor.fetchone()
+        await conn.close()
+        return row[0] if row else None
+
+# Position Samples (one row per sample, positions packed as int32 x/y pairs)
+async def add_position_sample(guild_id, server_name, sampled_at, positions):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("INSERT OR REPLACE INTO position_samples (guild_id, server_name, sampled_at, positions) VALUES (?, ?, ?, ?)",
+                       (guild_id, server_name, int(sampled_at), positions))
+        await conn.commit()
+        await conn.close()
+
+async def fetch_position_samples(guild_id, server_name, since):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT positions FROM position_samples
+            WHERE guild_id = ? AND server_name = ? AND sampled_at >= ?
+        """, (guild_id, server_name, since))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return [row[0] for row in rows]
+    return []
+
+async def latest_position_sample(guild_id, server_name):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT MAX(sampled_at) FROM position_samples WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        row = await cursor.fetchone()
+        await conn.close()
+        return row[0] if row else None
+
+async def prune_position_samples(before):
+    conn = await db_connection()
+    if conn is not None:
+        cursor = await conn.cursor()
+        # Walk the servers by seeking the primary key and delete each one's old
+        # range, instead of scanning every sample (and its blob) for the timestamp.
+        await cursor.execute("SELECT guild_id, server_name FROM position_samples ORDER BY guild_id, server_name LIMIT 1")
+        server = await cursor.fetchone()
+        while server:
+            await cursor.execute("DELETE FROM position_samples WHERE guild_id = ? AND server_name = ? AND sampled_at < ?", (*server, before))
+            await cursor.execute("""
+                SELECT guild_id, server_name FROM position_samples
+                WHERE (guild_id, server_name) > (?, ?)
+                ORDER BY guild_id, server_name LIMIT 1
+            """, server)
+            server = await cursor.fetchone()
+        await conn.commit()
+        await conn.close()
+
+# Resolution 0 holds one row per save; older rows are folded into 5 minute
+# and then hourly buckets by rollup_save_series.
+async def add_save_samples(rows):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.executemany("""
+            INSERT OR REPLACE INTO save_series (
+                guild_id, server_name, resolution, bucket, samples,
+                size_avg, size_max, gap_avg, gap_max, duration_avg, duration_max
+            ) VALUES (?, ?, 0, ?, 1, ?, ?, ?, ?, ?, ?)
+        """, [(gid, name, int(saved_at), size, size, gap, gap, duration, duration) for gid, name, saved_at, size, gap, duration in rows])
+        await conn.commit()
+        await conn.close()
+
+async def fetch_save_series(guild_id, server_name, since):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT bucket, resolution, samples, size_avg, size_max, gap_avg, gap_max, duration_avg, duration_max
+            FROM save_series
+            WHERE guild_id = ? AND server_name = ? AND bucket >= ?
+            ORDER BY bucket
+        """, (guild_id, server_name, since))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+    return []
+
+async def rollup_save_series(source, target, before):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            INSERT INTO save_series (
+                guild_id, server_name, resolution, bucket, samples,
+                size_avg, size_max, gap_avg, gap_max, duration_avg, duration_max
+            )
+            SELECT guild_id, server_name, ?, bucket / ? * ?, SUM(samples),
+                SUM(size_avg * samples) / SUM(samples), MAX(size_max),
+                SUM(gap_avg * samples) / SUM(samples), MAX(gap_max),
+                SUM(duration_avg * samples) / SUM(samples), MAX(duration_max)
+            FROM save_series
+            WHERE resolution = ? AND bucket < ?
+            GROUP BY guild_id, server_name, bucket / ?
+            ON CONFLICT (guild_id, server_name, resolution, bucket) DO UPDATE SET
+                samples = samples + excluded.samples,
+                size_avg = (size_avg * samples + excluded.size_avg * excluded.samples) / (samples + excluded.samples),
+                size_max = MAX(size_max, excluded.size_max),
+                gap_avg = (gap_avg * samples + excluded.gap_avg * excluded.samples) / (samples + excluded.samples),
+                gap_max = MAX(gap_max, excluded.gap_max),
+                duration_avg = (duration_avg * samples + excluded.duration_avg * excluded.samples) / (samples + excluded.samples),
+                duration_max = MAX(duration_max, excluded.duration_max)
+        """, (target, target, target, source, before, target))
+        await cursor.execute("DELETE FROM save_series WHERE resolution = ? AND bucket < ?", (source, before))
+        await conn.commit()
+        await conn.close()
+
+# Save Inspection (results are keyed by the save's SHA-256 from the backup manifest)
+async def cached_save_hashes(hashes):
+    conn = await db_connection()
+    if conn and hashes:
+        cursor = await conn.cursor()
+        placeholders = ",".join("?" for _ in hashes)
+        await cursor.execute(f"SELECT sha256 FROM save_parses WHERE sha256 IN ({placeholders})", tuple(hashes))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return {row[0] for row in rows}
+    return set()
+
+async def store_save_parse(sha256, result):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            INSERT OR REPLACE INTO save_parses (sha256, status, error)
+            VALUES (?, ?, ?)
+        """, (sha256, "ok" if result["ok"] else "failed", result["error"]))
+        data = result["data"]
+        if data:
+            await cursor.executemany("""
+                INSERT OR REPLACE INTO save_players (sha256, player_uid, nickname, level, guild_id, pal_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [(sha256, p["player_uid"], p["nickname"], p["level"], p["guild_id"], p["pal_count"]) for p in data["players"]])
+            await cursor.executemany("""
+                INSERT OR REPLACE INTO save_guilds (sha256, guild_id, guild_name, admin_uid, member_count)
+                VALUES (?, ?, ?, ?, ?)
+            """, [(sha256, g["guild_id"], g["name"], g["admin_uid"], g["member_count"]) for g in data["guilds"]])
+            await cursor.executemany("""
+                INSERT OR REPLACE INTO save_bases (sha256, base_id, guild_id, base_name, x, y, z)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(sha256, b["base_id"], b["guild_id"], b["name"], b["x"], b["y"], b["z"]) for b in data["bases"]])
+        await conn.commit()
+        await conn.close()
+
+async def save_parse_status(sha256):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("SELECT status FROM save_parses WHERE sha256 = ?", (sha256,))
+        row = await cursor.fetchone()
+        await conn.close()
+        return row[0] if row else None
+
+async def latest_level_parse(guild_id, server_name):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT f.sha256
+            FROM backup_history h
+            JOIN backup_files f ON f.backup_id = h.backup_id
+            JOIN save_parses p ON p.sha256 = f.sha256
+            WHERE h.guild_id = ? AND h.server_name = ? AND f.path = 'Level.sav' AND p.status = 'ok'
+            ORDER BY h.backup_id DESC
+            LIMIT 1
+        """, (guild_id, server_name))
+        row = await cursor.fetchone()
+        await conn.close()
+        return row[0] if row else None
+
+async def fetch_save_players(sha256):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT player_uid, nickname, level, guild_id, pal_count
+            FROM save_players WHERE sha256 = ?
+        """, (sha256,))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+
+async def fetch_save_guilds(sha256):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT guild_id, guild_name, admin_uid, member_count
+            FROM save_guilds WHERE sha256 = ?
+        """, (sha256,))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+
+async def fetch_save_bases(sha256):
+    conn = await db_connection()
+    if conn:
+        cursor = await conn.cursor()
+        await cursor.execute("""
+            SELECT base_id, guild_id, base_name, x, y, z
+            FROM save_bases WHERE sha256 = ?
+        """, (sha256,))
+        rows = await cursor.fetchall()
+        await conn.close()
+        return rows
+
 # Player Time Tracking
 async def track_sessions(current_online: set, previous_online: set, timestamp: str):
     conn = await db_connection()
@@ -0,0 +1,25 @@
+import asyncio
+import time
+
+FLEET_CONCURRENCY = 8
+FLEET_TIMEOUT = 30
+
+# Runs action(server) against every server at once, at most `concurrency` in
+# flight, so the whole fleet takes about as long as its slowest member.
+# Returns (server_name, ok, result, seconds) in the order servers were given.
+async def run_fleet(servers, action, concurrency: int = FLEET_CONCURRENCY, timeout: float = FLEET_TIMEOUT):
+    limit = asyncio.Semaphore(concurrency)
+
+    async def run(server):
+        async with limit:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(action(server), timeout)
+                ok = True
+            except asyncio.TimeoutError:
+                result, ok = "Timed out.", False
+            except Exception as e:
+                result, ok = str(e) or type(e).__name__, False
+            return server[0], ok, result, time.perf_counter() - start
+
+    return await asyncio.gather(*(run(s) for s in servers))
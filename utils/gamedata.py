@@ -0,0 +1,81 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from utils.searchindex import SearchIndex
+
+GAMEDATA_DIR = "gamedata"
+# How often the backing file is stat'ed for changes.
+CHECK_INTERVAL = 5
+
+class GameEntry:
+    __slots__ = ("id", "name")
+
+    def __init__(self, id: str, name: str):
+        self.id = id
+        self.name = name
+
+    # Lets an entry stand in for the raw JSON dict in SearchIndex.
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+# One JSON list from gamedata/, parsed on first use and reloaded whenever the
+# file's mtime changes. Lookups are case-insensitive on id and name.
+class GameDataSet:
+    def __init__(self, path: str, key: str):
+        self.path = path
+        self.key = key
+        self.mtime = None
+        self.checked = 0.0
+        self.entries = []
+        self.by_id = {}
+        self.by_name = {}
+        self.index = SearchIndex([])
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        with self.lock:
+            self.checked = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+                if mtime == self.mtime:
+                    return
+                with open(self.path, "r", encoding="utf-8") as f:
+                    raw = json.load(f).get(self.key, [])
+            except (OSError, ValueError) as e:
+                logging.error(f"Failed to load {self.path}: {e}")
+                return
+
+            entries = [GameEntry(str(x.get("id", "")), str(x.get("name", ""))) for x in raw]
+            by_id = {e.id.lower(): e for e in entries}
+            by_name = {}
+            for e in entries:
+                by_name.setdefault(e.name.lower(), e)
+            self.entries, self.by_id, self.by_name, self.index = entries, by_id, by_name, SearchIndex(entries)
+            if self.mtime is not None:
+                logging.info(f"Reloaded {len(entries)} {self.key} from {self.path}")
+            self.mtime = mtime
+
+    # Parses off the event loop on first use and after the file changes.
+    async def ready(self):
+        if self.mtime is None or time.monotonic() - self.checked >= CHECK_INTERVAL:
+            await asyncio.to_thread(self.refresh)
+        return self
+
+    def find(self, key: str):
+        key = key.lower()
+        return self.by_id.get(key) or self.by_name.get(key)
+
+    def search(self, query: str, limit: int = 25):
+        return self.index.search(query, limit)
+
+# Shared by every cog so each file is parsed once per process.
+_datasets = {}
+
+def get_gamedata(name: str):
+    dataset = _datasets.get(name)
+    if dataset is None:
+        dataset = _datasets[name] = GameDataSet(os.path.join(GAMEDATA_DIR, f"{name}.json"), name)
+    return dataset
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import time
+import weakref
+from utils.rconutility import BULK
+
+KIT_RATE = float(os.getenv("KIT_RATE", 5))
+KIT_CONCURRENCY = int(os.getenv("KIT_CONCURRENCY", 4))
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def take(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# One bucket per server at the configured KIT_RATE, shared by every delivery
+# to it so overlapping deliveries split one rate limit.
+_buckets = weakref.WeakKeyDictionary()
+
+def server_bucket(scheduler):
+    bucket = _buckets.get(scheduler)
+    if bucket is None:
+        bucket = _buckets[scheduler] = TokenBucket(KIT_RATE)
+    return bucket
+
+# Kit commands are str.format templates whose only placeholder is {userid};
+# literal braces must be doubled. Returns an error message, or None if valid.
+def validate_kit(commands):
+    if not isinstance(commands, list) or not all(isinstance(c, str) for c in commands):
+        return "Commands must be a JSON list of strings."
+    for template in commands:
+        try:
+            template.format(userid="")
+        except (KeyError, IndexError, ValueError) as e:
+            return f"Invalid command template {template!r}: {e!r}. Use {{userid}} for the player and double any literal braces."
+    return None
+
+# Queues each command of a kit on the server's scheduler at bulk priority so
+# interactive commands are never stuck behind a mass delivery. Returns a list
+# of (command, ok, response) so callers can build a single summary.
+async def deliver_kit(scheduler, commands: list, userid: str, buckets: list):
+    results = []
+    for template in commands:
+        try:
+            cmd = str(template).format(userid=userid)
+        except (KeyError, IndexError, ValueError) as e:
+            results.append((str(template), False, f"Invalid command template: {e!r}"))
+            continue
+        for bucket in buckets:
+            await bucket.take()
+        try:
+            response = await scheduler.submit(cmd, BULK)
+        except Exception as e:
+            results.append((cmd, False, str(e)))
+            break
+        results.append((cmd, True, response))
+
+    results.extend((str(template), False, "Skipped after connection error.") for template in commands[len(results):])
+    return results
+
+async def deliver_to_many(scheduler, commands: list, userids: list, rate: float = KIT_RATE, concurrency: int = KIT_CONCURRENCY):
+    # A lower per-call rate throttles this delivery further; it never raises
+    # the server's limit.
+    buckets = [server_bucket(scheduler)]
+    if rate < KIT_RATE:
+        buckets.insert(0, TokenBucket(rate))
+    limit = asyncio.Semaphore(concurrency)
+
+    async def deliver(userid):
+        async with limit:
+            return userid, await deliver_kit(scheduler, commands, userid, buckets)
+
+    return dict(await asyncio.gather(*(deliver(u) for u in userids)))
@@ -0,0 +1,76 @@
+import numpy as np
+
+# Polls kept per player; at the 30s player poll this is the last 8 minutes.
+HISTORY = 16
+
+# Ring buffers of recent positions for every player on one server. Every poll
+# writes one column for all players at once, so speeds for the whole server
+# come out of a single vectorized pass.
+class MovementTracker:
+    def __init__(self, history: int = HISTORY, capacity: int = 32):
+        self.history = history
+        self.rows = {}
+        self.ids = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+        self.positions = np.full((capacity, history, 2), np.nan)
+        self.times = np.full(history, np.nan)
+        self.strikes = np.zeros(capacity, dtype=np.int32)
+        self.tick = 0
+
+    def _grow(self):
+        capacity = len(self.ids)
+        self.positions = np.concatenate([self.positions, np.full((capacity, self.history, 2), np.nan)])
+        self.strikes = np.concatenate([self.strikes, np.zeros(capacity, dtype=np.int32)])
+        self.ids.extend([None] * capacity)
+        self.free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def _release(self, userid):
+        row = self.rows.pop(userid)
+        self.positions[row] = np.nan
+        self.strikes[row] = 0
+        self.ids[row] = None
+        self.free.append(row)
+
+    # Records one snapshot of {userid: (x, y)} and returns
+    # [(userid, speed, distance, strikes)] for players moving faster than
+    # max_speed (world units per second) since the previous poll.
+    def observe(self, timestamp: float, players: dict, max_speed: float):
+        for userid in [u for u in self.rows if u not in players]:
+            self._release(userid)
+        for userid in players:
+            if userid not in self.rows:
+                if not self.free:
+                    self._grow()
+                row = self.free.pop()
+                self.rows[userid] = row
+                self.ids[row] = userid
+
+        col = self.tick % self.history
+        prev = (self.tick - 1) % self.history
+        self.tick += 1
+        self.times[col] = timestamp
+        self.positions[:, col] = np.nan
+        if players:
+            rows = np.fromiter((self.rows[u] for u in players), dtype=np.intp, count=len(players))
+            self.positions[rows, col] = np.array(list(players.values()), dtype=float)
+
+        dt = self.times[col] - self.times[prev]
+        if self.tick < 2 or not dt > 0:
+            return []
+        delta = self.positions[:, col] - self.positions[:, prev]
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        speed = distance / dt
+        # NaN (no previous position) compares False, so joins never flag.
+        fast = speed > max_speed
+        self.strikes = np.where(fast, self.strikes + 1, 0).astype(np.int32)
+        return [(self.ids[r], float(speed[r]), float(distance[r]), int(self.strikes[r])) for r in np.flatnonzero(fast)]
+
+    # Latest and peak speed over the whole window for every tracked player.
+    def speeds(self):
+        order = [(self.tick + i) % self.history for i in range(self.history)]
+        positions = self.positions[:, order]
+        dts = np.diff(self.times[order])
+        steps = np.hypot(*np.moveaxis(np.diff(positions, axis=1), 2, 0)) / dts
+        steps = np.where(np.isnan(steps), -1.0, steps)
+        latest, peak = steps[:, -1], steps.max(axis=1)
+        return {userid: (float(latest[row]), float(peak[row])) for userid, row in self.rows.items()}
@@ -1,4 +1,6 @@
 import discord
+import inspect
+from collections import OrderedDict
 
 # I really need to make a pagination pip package
 
@@ -13,6 +15,26 @@ class Pagination:
         end = start + self.page_size
         return self.items[start:end]
 
+# Loads one page at a time through fetch_page(offset, limit) and keeps the
+# last few in an LRU, so a view never holds more than cache_size pages.
+class LazyPagination:
+    def __init__(self, fetch_page, total_items, page_size=10, cache_size=8):
+        self.fetch_page = fetch_page
+        self.page_size = page_size
+        self.cache_size = cache_size
+        self.pages = OrderedDict()
+        self.total_pages = total_items // page_size + (1 if total_items % page_size > 0 else 0)
+
+    async def get_page(self, page_number):
+        if page_number in self.pages:
+            self.pages.move_to_end(page_number)
+            return self.pages[page_number]
+        items = await self.fetch_page((page_number - 1) * self.page_size, self.page_size)
+        self.pages[page_number] = items
+        if len(self.pages) > self.cache_size:
+            self.pages.popitem(last=False)
+        return items
+
 class PaginationView(discord.ui.View):
     def __init__(self, paginator, current_page, embed_creator):
         super().__init__()
@@ -30,7 +52,10 @@ class PaginationView(discord.ui.View):
 
     async def update_page(self, interaction, page_delta):
         self.current_page += page_delta
-        new_embed = self.embed_creator(self.paginator.get_page(self.current_page), self.current_page, self.paginator.total_pages)
+        page = self.paginator.get_page(self.current_page)
+        if inspect.isawaitable(page):
+            page = await page
+        new_embed = self.embed_creator(page, self.current_page, self.paginator.total_pages)
         await interaction.response.edit_message(embed=new_embed, view=PaginationView(self.paginator, self.current_page, self.embed_creator))
 
 class PaginationButton(discord.ui.Button):
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import os
+import re
+import time
+
+EXPORT_TTL = int(os.getenv("PD_EXPORT_TTL", 300))
+EXPORT_CACHE_SIZE = int(os.getenv("PD_EXPORT_CACHE_SIZE", 500))
+# Keeps the server's reply so callers can show it when the file is unusable.
+class ExportError(Exception):
+    def __init__(self, message: str, response: str = None):
+        super().__init__(message)
+        self.response = response
+
+# exportguilds and exportpals write a JSON file and reply with its path. A
+# server's export_dir is where this host sees that folder (e.g. a mounted
+# share); without one the reported path is opened as is.
+_EXPORT_PATH = re.compile(r"""["']([^"']+?\.json)["']|(\S+?\.json)\b""", re.IGNORECASE)
+
+def export_path(response: str, export_dir: str = None):
+    match = _EXPORT_PATH.search(response or "")
+    if not match:
+        raise ExportError("The reply names no export file.", response)
+    path = match.group(1) or match.group(2)
+    if export_dir:
+        path = os.path.join(export_dir, re.split(r"[\\/]", path)[-1])
+    return path
+
+def _read_json(path: str):
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            return json.load(f)
+    except OSError as e:
+        raise ExportError(f"Cannot read export file {path}: {e.strerror}")
+    except ValueError as e:
+        raise ExportError(f"Export file {path} is not valid JSON: {e}")
+
+async def read_export(response: str, parse, export_dir: str = None):
+    path = export_path(response, export_dir)
+    try:
+        return parse(await asyncio.to_thread(_read_json, path))
+    except ExportError as e:
+        raise ExportError(str(e), response)
+
+def _int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def _location(base):
+    loc = base.get("Location")
+    if not isinstance(loc, dict):
+        return None
+    try:
+        return tuple(float(loc.get(axis, 0)) for axis in ("X", "Y", "Z"))
+    except (TypeError, ValueError):
+        return None
+
+def parse_guilds(data):
+    if not isinstance(data, dict) or not isinstance(data.get("Guilds"), list):
+        raise ExportError("Guild export has no Guilds list.")
+    guilds = []
+    for g in data["Guilds"]:
+        guilds.append({
+            "guild_id": g.get("GuildId"),
+            "name": g.get("GuildName") or "Unnamed Guild",
+            "admin": g.get("AdminPlayerUId"),
+            "members": [{
+                "uid": m.get("PlayerUId"),
+                "name": m.get("NickName") or "Unknown",
+                "level": _int(m.get("Level"))
+            } for m in g.get("Members", [])],
+            "bases": [{"id": b.get("BaseCampId"), "location": _location(b)} for b in g.get("BaseCamps", [])]
+        })
+    return guilds
+
+def parse_pals(data):
+    if not isinstance(data, dict) or not isinstance(data.get("Pals"), list):
+        raise ExportError("Pal export has no Pals list.")
+    return [{
+        "species": p["PalID"],
+        "nickname": p.get("Nickname") or "",
+        "level": _int(p.get("Level"), 1)
+    } for p in data["Pals"] if p.get("PalID")]
+
+# TTL cache with one load in flight per key: concurrent callers share the same
+# export instead of each asking the server for it. Failures aren't cached.
+# Entries are kept in insertion order, so expired ones are always at the front.
+class ExportCache:
+    def __init__(self, ttl: int = EXPORT_TTL, size: int = EXPORT_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self.entries = {}
+        self.loading = {}
+
+    def expire(self, now: float):
+        while self.entries:
+            key, (exported_at, _) = next(iter(self.entries.items()))
+            if now - exported_at < self.ttl and len(self.entries) <= self.size:
+                break
+            del self.entries[key]
+
+    async def get(self, key, loader, refresh: bool = False):
+        self.expire(time.time())
+        entry = self.entries.get(key)
+        if entry and not refresh:
+            return entry
+        task = self.loading.get(key)
+        if task is None:
+            task = self.loading[key] = asyncio.ensure_future(self.load(key, loader))
+        return await asyncio.shield(task)
+
+    async def load(self, key, loader):
+        try:
+            entry = (time.time(), await loader())
+        finally:
+            del self.loading[key]
+        self.entries.pop(key, None)
+        self.entries[key] = entry
+        self.expire(entry[0])
+        return entry
+
+    def peek(self, key):
+        self.expire(time.time())
+        return self.entries.get(key)
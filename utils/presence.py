@@ -0,0 +1,46 @@
+# Fields worth persisting when they change mid-session; ping and location
+# change every poll and are served from memory while a player is online.
+IDENTITY_FIELDS = ("name", "accountName", "playerId", "ip", "level")
+
+# Who is online where, from the latest snapshot of every server. Servers are
+# keyed (guild_id, server_name) and hold each player's last reported dict.
+class PresenceIndex:
+    def __init__(self):
+        self.servers = {}
+        self.where = {}
+
+    # Applies one snapshot of {user_id: player} and returns (joined, changed,
+    # left) as lists of player dicts; left carries the last dict seen.
+    def update(self, key, players: dict):
+        previous = self.servers.get(key, {})
+        joined, changed, left = [], [], []
+        for user_id, player in players.items():
+            old = previous.get(user_id)
+            if old is None:
+                joined.append(player)
+                self.where.setdefault(user_id, set()).add(key)
+            elif any(old.get(f) != player.get(f) for f in IDENTITY_FIELDS):
+                changed.append(player)
+        for user_id, player in previous.items():
+            if user_id not in players:
+                left.append(player)
+                self._forget(user_id, key)
+        self.servers[key] = players
+        return joined, changed, left
+
+    def clear(self, key):
+        return self.update(key, {})[2]
+
+    def _forget(self, user_id, key):
+        keys = self.where.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.where[user_id]
+
+    def online(self, key):
+        return set(self.servers.get(key, ()))
+
+    # [(key, player)] for every server the user is on right now.
+    def locate(self, user_id: str):
+        return [(key, self.servers[key][user_id]) for key in self.where.get(user_id, ())]
@@ -1,14 +1,265 @@
 import asyncio
+import itertools
+import socket
+import struct
+import time
+from collections import deque
+from contextlib import asynccontextmanager
 from gamercon_async import GameRCON, ClientError, TimeoutError, InvalidPassword
 
+POOL_SIZE = 4
+IDLE_TIMEOUT = 60
+REAP_INTERVAL = 15
+
+# Scheduler priorities: lower runs first.
+INTERACTIVE = 0
+BULK = 10
+MAX_IN_FLIGHT = 2
+# Commands that are safe to merge while an identical one is still queued.
+COALESCE_COMMANDS = {"reloadcfg", "save", "showplayers", "info"}
+
+# Errors that mean a pooled socket went stale rather than the command failing.
+STALE_ERRORS = (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError, struct.error)
+
+class RconConnection:
+    def __init__(self, host: str, port: int, password: str, timeout: int):
+        self.rcon = GameRCON(host, port, password, timeout)
+        self.last_used = time.monotonic()
+        self.reused = False
+
+    async def open(self):
+        await self.rcon.__aenter__()
+        sock = self.rcon._writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    def is_alive(self):
+        writer = self.rcon._writer
+        return writer is not None and not writer.is_closing() and not self.rcon._reader.at_eof()
+
+    async def send(self, command: str):
+        return await self.rcon.send(command)
+
+    async def close(self):
+        try:
+            await self.rcon.__aexit__(None, None, None)
+        except (OSError, RuntimeError):
+            pass
+
+class RconPool:
+    def __init__(self, host: str, port: int, password: str, timeout: int, size: int = POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.timeout = timeout
+        self.idle = []
+        self.slots = asyncio.Semaphore(size)
+
+    async def acquire(self):
+        await self.slots.acquire()
+        try:
+            while self.idle:
+                conn = self.idle.pop()
+                if conn.is_alive():
+                    conn.reused = True
+                    return conn
+                await conn.close()
+            conn = RconConnection(self.host, self.port, self.password, self.timeout)
+            try:
+                await conn.open()
+            except BaseException:
+                await conn.close()
+                raise
+            return conn
+        except BaseException:
+            self.slots.release()
+            raise
+
+    async def release(self, conn: RconConnection, healthy: bool = True):
+        if healthy:
+            conn.last_used = time.monotonic()
+            self.idle.append(conn)
+        else:
+            await conn.close()
+        self.slots.release()
+
+    # Holds one authenticated connection for a sequence of commands.
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self.acquire()
+        healthy = False
+        try:
+            yield conn
+            healthy = True
+        finally:
+            await self.release(conn, healthy)
+
+    async def send(self, command: str):
+        while True:
+            conn = await self.acquire()
+            try:
+                result = await conn.send(command)
+            except STALE_ERRORS:
+                await self.release(conn, False)
+                if conn.reused:
+                    continue
+                raise
+            except BaseException:
+                await self.release(conn, False)
+                raise
+            await self.release(conn)
+            return result
+
+    async def evict_idle(self, now: float):
+        stale = [c for c in self.idle if now - c.last_used > IDLE_TIMEOUT or not c.is_alive()]
+        self.idle = [c for c in self.idle if c not in stale]
+        for conn in stale:
+            await conn.close()
+
+    async def close(self):
+        idle, self.idle = self.idle, []
+        for conn in idle:
+            await conn.close()
+
+# Pools are shared by every cog so all commands to a server reuse the same sockets.
+_pools = {}
+_reaper = None
+
+async def _reap_idle():
+    global _reaper
+    try:
+        while _pools:
+            await asyncio.sleep(REAP_INTERVAL)
+            now = time.monotonic()
+            for pool in list(_pools.values()):
+                await pool.evict_idle(now)
+    finally:
+        _reaper = None
+
+def get_pool(host: str, port: int, password: str, timeout: int = 30):
+    global _reaper
+    key = (host, port, password)
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = RconPool(host, port, password, timeout)
+    if _reaper is None:
+        _reaper = asyncio.get_running_loop().create_task(_reap_idle())
+    return pool
+
+async def close_pools():
+    for scheduler in _schedulers.values():
+        scheduler.stop()
+    _schedulers.clear()
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
+
+# Serializes commands to one server: at most MAX_IN_FLIGHT run at once,
+# interactive commands jump ahead of bulk traffic, and duplicate idempotent
+# commands that are still waiting share one result.
+class RconScheduler:
+    def __init__(self, pool: RconPool, max_in_flight: int = MAX_IN_FLIGHT):
+        self.pool = pool
+        self.max_in_flight = max_in_flight
+        self.queue = asyncio.PriorityQueue()
+        self.sequence = itertools.count()
+        self.queued = {}
+        self.workers = []
+        self.in_flight = 0
+        self.submitted = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+        self.waits = deque(maxlen=500)
+
+    def start(self):
+        if not self.workers:
+            loop = asyncio.get_running_loop()
+            self.workers = [loop.create_task(self.worker()) for _ in range(self.max_in_flight)]
+
+    async def submit(self, command: str, priority: int = INTERACTIVE):
+        self.start()
+        self.submitted += 1
+        key = command.strip().lower()
+        future = self.queued.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            if key in COALESCE_COMMANDS:
+                self.queued[key] = future
+            self.queue.put_nowait((priority, next(self.sequence), time.monotonic(), command, key, future))
+        return await asyncio.shield(future)
+
+    async def worker(self):
+        while True:
+            priority, _, enqueued, command, key, future = await self.queue.get()
+            if self.queued.get(key) is future:
+                del self.queued[key]
+            self.waits.append(time.monotonic() - enqueued)
+            self.in_flight += 1
+            try:
+                result = await self.pool.send(command)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_exception(ConnectionAbortedError("RCON scheduler stopped."))
+                raise
+            except Exception as e:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.completed += 1
+                if not future.done():
+                    future.set_result(result)
+            finally:
+                self.in_flight -= 1
+
+    def stats(self):
+        waits = list(self.waits)
+        return {
+            "depth": self.queue.qsize(),
+            "in_flight": self.in_flight,
+            "submitted": self.submitted,
+            "coalesced": self.coalesced,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_avg": sum(waits) / len(waits) if waits else 0.0,
+            "wait_max": max(waits) if waits else 0.0
+        }
+
+    # Fails every command still queued or in flight, so no submit() is left
+    # waiting on a future nothing will resolve.
+    def stop(self):
+        while not self.queue.empty():
+            future = self.queue.get_nowait()[-1]
+            if not future.done():
+                future.set_exception(ConnectionAbortedError("RCON scheduler stopped."))
+        self.queued.clear()
+        for worker in self.workers:
+            worker.cancel()
+        self.workers = []
+
+_schedulers = {}
+
+def get_scheduler(host: str, port: int, password: str, timeout: int = 30):
+    key = (host, port, password)
+    scheduler = _schedulers.get(key)
+    if scheduler is None:
+        scheduler = _schedulers[key] = RconScheduler(get_pool(host, port, password, timeout))
+    return scheduler
+
+def find_scheduler(host: str, port: int, password: str):
+    return _schedulers.get((host, port, password))
+
 class RconUtility:
     def __init__(self, timeout=30):
         self.timeout = timeout
 
-    async def rcon_command(self, host: str, port: int, password: str, command: str):
+    async def rcon_command(self, host: str, port: int, password: str, command: str, priority: int = INTERACTIVE):
         try:
-            async with GameRCON(host, port, password, self.timeout) as rcon:
-                return await rcon.send(command)
+            return await get_scheduler(host, port, password, self.timeout).submit(command, priority)
         except (ClientError, TimeoutError, InvalidPassword) as e:
             return f"RCON error: {e}"
         except asyncio.TimeoutError:
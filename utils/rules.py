@@ -0,0 +1,88 @@
+import re
+
+RULE_KINDS = {
+    "id_pattern": "Kick players whose ID matches a regular expression",
+    "name_block": "Kick players whose name contains any of these comma-separated words",
+    "level_cap": "Kick players above this level",
+    "ping_max": "Kick players whose ping is above this many milliseconds"
+}
+
+# Players joining with an unset ID show up as null_<n>; always kicked.
+NULL_ID = "null_"
+
+def parse_rule_value(kind: str, value: str):
+    if kind == "id_pattern":
+        re.compile(value)
+        return value
+    if kind == "name_block":
+        terms = [t.strip() for t in value.split(",") if t.strip()]
+        if not terms:
+            raise ValueError("Give at least one word to block.")
+        return ",".join(terms)
+    if kind == "level_cap":
+        return str(int(value))
+    if kind == "ping_max":
+        return str(float(value))
+    raise ValueError(f"Unknown rule type '{kind}'.")
+
+# Every rule for one server folded into the cheapest form to test: one regex
+# per ID pattern, one alternation for all blocked names and the tightest
+# level and ping limits. banned is a tuple of ID sets, shared rather than
+# merged. check() is then a handful of lookups per player.
+class CompiledRules:
+    def __init__(self, rules, banned=()):
+        self.banned = banned
+        self.id_patterns = []
+        self.level_cap = self.ping_max = None
+        names = []
+        for rule_id, kind, value, reason in rules:
+            if kind == "id_pattern":
+                self.id_patterns.append((re.compile(value), reason or "Your ID is not allowed here."))
+            elif kind == "name_block":
+                names.extend((term, reason) for term in value.split(","))
+            elif kind == "level_cap":
+                if self.level_cap is None or int(value) < self.level_cap[0]:
+                    self.level_cap = (int(value), reason or f"Level is above the cap of {value}.")
+            elif kind == "ping_max":
+                if self.ping_max is None or float(value) < self.ping_max[0]:
+                    self.ping_max = (float(value), reason or f"Ping is above {float(value):g}ms.")
+        self.name_reasons = {}
+        if names:
+            groups = []
+            for i, (term, reason) in enumerate(names):
+                groups.append(f"(?P<n{i}>{re.escape(term)})")
+                self.name_reasons[f"n{i}"] = reason or f"Name contains '{term}'."
+            self.name_pattern = re.compile("|".join(groups), re.IGNORECASE)
+        else:
+            self.name_pattern = None
+
+    # Returns the reason to kick the player, or None. whitelisted is a
+    # callable when the server enforces its whitelist.
+    def check(self, player: dict, whitelisted=None):
+        userid = str(player.get('userId', ''))
+        if NULL_ID in userid:
+            return "Invalid ID detected."
+        if any(userid in ids for ids in self.banned):
+            return "You are banned."
+        if whitelisted is not None and not whitelisted(userid):
+            return "You are not whitelisted."
+        for pattern, reason in self.id_patterns:
+            if pattern.search(userid):
+                return reason
+        if self.name_pattern:
+            match = self.name_pattern.search(str(player.get('name', '')))
+            if match:
+                return self.name_reasons[match.lastgroup]
+        if self.level_cap:
+            try:
+                if int(player.get('level') or 0) > self.level_cap[0]:
+                    return self.level_cap[1]
+            except (TypeError, ValueError):
+                pass
+        if self.ping_max:
+            try:
+                if float(player.get('ping') or 0) > self.ping_max[0]:
+                    return self.ping_max[1]
+            except (TypeError, ValueError):
+                pass
+        return None
@@ -0,0 +1,358 @@
+import io
+import struct
+import uuid
+import zipfile
+import zlib
+
+# Streaming reader for Palworld's compressed GVAS saves. Only the pieces of
+# Level.sav needed for offline lookups are decoded; everything else is skipped
+# by its serialized size so a large world never has to sit in memory at once.
+
+CHUNK_SIZE = 64 * 1024
+ZERO_GUID = "00000000-0000-0000-0000-000000000000"
+
+# Map keys that are serialized as raw GUIDs rather than property lists.
+GUID_KEYED_MAPS = {"GroupSaveDataMap", "BaseCampSaveData"}
+
+class SaveFormatError(Exception):
+    pass
+
+class InflateStream:
+    def __init__(self, source, passes: int):
+        self.source = source
+        self.stages = [zlib.decompressobj() for _ in range(passes)]
+        self.buffer = bytearray()
+        self.offset = 0
+        self.finished = False
+
+    # Each stage is capped at CHUNK_SIZE of output per call, so even a highly
+    # compressible region never inflates more than a chunk at a time.
+    def _pull(self, index: int) -> bytes:
+        if index < 0:
+            return self.source.read(CHUNK_SIZE)
+        stage = self.stages[index]
+        while not stage.eof:
+            data = stage.unconsumed_tail or self._pull(index - 1)
+            if not data:
+                return stage.flush()
+            out = stage.decompress(data, CHUNK_SIZE)
+            if out:
+                return out
+        return b""
+
+    def _fill(self, size: int):
+        while len(self.buffer) - self.offset < size and not self.finished:
+            data = self._pull(len(self.stages) - 1)
+            if self.offset:
+                del self.buffer[:self.offset]
+                self.offset = 0
+            self.buffer += data
+            self.finished = not data
+
+    def read(self, size: int) -> bytes:
+        self._fill(size)
+        data = bytes(self.buffer[self.offset:self.offset + size])
+        self.offset += len(data)
+        return data
+
+    def skip(self, size: int):
+        while size > 0:
+            step = min(size, CHUNK_SIZE)
+            if len(self.read(step)) < step:
+                raise SaveFormatError("Unexpected end of save data.")
+            size -= step
+
+class PlainStream:
+    def __init__(self, source):
+        self.source = source
+
+    def read(self, size: int) -> bytes:
+        return self.source.read(size)
+
+    def skip(self, size: int):
+        while size > 0:
+            step = min(size, CHUNK_SIZE)
+            if len(self.source.read(step)) < step:
+                raise SaveFormatError("Unexpected end of save data.")
+            size -= step
+
+def open_gvas(fileobj):
+    header = fileobj.read(12)
+    if header[8:11] == b"CNK":
+        header = fileobj.read(12)
+    if len(header) < 12:
+        raise SaveFormatError("File is too small to be a save.")
+    magic, save_type = header[8:11], header[11]
+    if magic == b"PlM":
+        raise SaveFormatError("Oodle-compressed (PlM) saves are not supported.")
+    if magic != b"PlZ":
+        raise SaveFormatError(f"Unknown save magic: {magic!r}")
+    if save_type == 0x30:
+        return PlainStream(fileobj)
+    if save_type in (0x31, 0x32):
+        return InflateStream(fileobj, save_type - 0x30)
+    raise SaveFormatError(f"Unknown save type: {save_type:#x}")
+
+class GvasReader:
+    def __init__(self, stream):
+        self.stream = stream
+
+    def read(self, size: int) -> bytes:
+        data = self.stream.read(size)
+        if len(data) < size:
+            raise SaveFormatError("Unexpected end of save data.")
+        return data
+
+    def skip(self, size: int):
+        self.stream.skip(size)
+
+    def u8(self):
+        return self.read(1)[0]
+
+    def i32(self):
+        return struct.unpack("<i", self.read(4))[0]
+
+    def u32(self):
+        return struct.unpack("<I", self.read(4))[0]
+
+    def i64(self):
+        return struct.unpack("<q", self.read(8))[0]
+
+    def f32(self):
+        return struct.unpack("<f", self.read(4))[0]
+
+    def f64(self):
+        return struct.unpack("<d", self.read(8))[0]
+
+    def guid(self):
+        b = self.read(16)
+        # Unreal stores GUIDs as four little-endian uint32 words.
+        return str(uuid.UUID(bytes=b[3::-1] + b[7:3:-1] + b[11:7:-1] + b[15:11:-1]))
+
+    def fstring(self):
+        size = self.i32()
+        if size == 0:
+            return ""
+        if size < 0:
+            return self.read(-size * 2)[:-2].decode("utf-16-le", errors="replace")
+        return self.read(size)[:-1].decode("utf-8", errors="replace")
+
+    def optional_guid(self):
+        if self.u8():
+            self.skip(16)
+
+    def header(self):
+        if self.read(4) != b"GVAS":
+            raise SaveFormatError("Missing GVAS header.")
+        save_game_version = self.i32()
+        self.i32()
+        if save_game_version >= 3:
+            self.i32()
+        self.skip(10)
+        self.fstring()
+        self.i32()
+        self.skip(self.i32() * 20)
+        return self.fstring()
+
+    def tag(self):
+        name = self.fstring()
+        if name == "None":
+            return None
+        tag = {"name": name, "type": self.fstring(), "size": self.i64()}
+        ptype = tag["type"]
+        if ptype == "StructProperty":
+            tag["struct_type"] = self.fstring()
+            self.skip(16)
+        elif ptype == "ArrayProperty":
+            tag["array_type"] = self.fstring()
+        elif ptype == "MapProperty":
+            tag["key_type"] = self.fstring()
+            tag["value_type"] = self.fstring()
+        elif ptype == "SetProperty":
+            tag["set_type"] = self.fstring()
+        elif ptype in ("ByteProperty", "EnumProperty"):
+            tag["enum_type"] = self.fstring()
+        elif ptype == "BoolProperty":
+            tag["value"] = self.u8() != 0
+        self.optional_guid()
+        return tag
+
+    def value(self, tag):
+        ptype = tag["type"]
+        if ptype == "IntProperty":
+            return self.i32()
+        if ptype == "Int64Property":
+            return self.i64()
+        if ptype == "UInt32Property":
+            return self.u32()
+        if ptype == "FloatProperty":
+            return self.f32()
+        if ptype == "DoubleProperty":
+            return self.f64()
+        if ptype == "BoolProperty":
+            return tag["value"]
+        if ptype in ("StrProperty", "NameProperty", "EnumProperty"):
+            return self.fstring()
+        if ptype == "ByteProperty":
+            return self.u8() if tag["enum_type"] == "None" else self.fstring()
+        if ptype == "StructProperty":
+            return self.struct(tag["struct_type"])
+        if ptype == "ArrayProperty" and tag["array_type"] == "ByteProperty":
+            return self.read(self.u32())
+        self.skip(tag["size"])
+        return None
+
+    def struct(self, struct_type: str):
+        if struct_type == "Guid":
+            return self.guid()
+        if struct_type in ("Vector", "Rotator"):
+            return struct.unpack("<3d", self.read(24))
+        if struct_type == "Quat":
+            return struct.unpack("<4d", self.read(32))
+        if struct_type in ("DateTime", "Timespan"):
+            return self.i64()
+        if struct_type == "LinearColor":
+            return struct.unpack("<4f", self.read(16))
+        return self.properties()
+
+    def properties(self):
+        props = {}
+        while True:
+            tag = self.tag()
+            if tag is None:
+                return props
+            props[tag["name"]] = self.value(tag)
+
+    def map_entries(self, guid_keys: bool):
+        self.u32()
+        for _ in range(self.u32()):
+            key = self.guid() if guid_keys else self.properties()
+            yield key, self.properties()
+
+def _reader(data: bytes):
+    return GvasReader(PlainStream(io.BytesIO(data)))
+
+def _character(key, value):
+    raw = value.get("RawData")
+    if not raw:
+        return None
+    params = _reader(raw).properties().get("SaveParameter") or {}
+    level = params.get("Level", 1)
+    return {
+        "player_uid": key.get("PlayerUId"),
+        "is_player": bool(params.get("IsPlayer")),
+        "nickname": params.get("NickName", ""),
+        "level": level if isinstance(level, int) else 1,
+        "owner_uid": params.get("OwnerPlayerUId")
+    }
+
+def _guild(value, with_modifier: bool):
+    if value.get("GroupType") != "EPalGroupType::Guild" or not value.get("RawData"):
+        return None
+    r = _reader(value["RawData"])
+    guild_id = r.guid()
+    r.fstring()
+    r.skip(r.u32() * 32)
+    r.u8()
+    r.skip(r.u32() * 16)
+    r.i32()
+    r.skip(r.u32() * 16)
+    name = r.fstring()
+    if with_modifier:
+        r.skip(16)
+    admin_uid = r.guid()
+    count = r.i32()
+    if not 0 <= count <= 1024:
+        raise SaveFormatError("Implausible guild member count.")
+    members = []
+    for _ in range(count):
+        uid = r.guid()
+        r.i64()
+        members.append((uid, r.fstring()))
+    return {"guild_id": guild_id, "name": name, "admin_uid": admin_uid, "members": members}
+
+def _base(key, value):
+    raw = value.get("RawData")
+    if not raw:
+        return None
+    r = _reader(raw)
+    base_id = r.guid()
+    name = r.fstring()
+    r.u8()
+    r.skip(32)
+    x, y, z = struct.unpack("<3d", r.read(24))
+    r.skip(24 + 4)
+    return {"base_id": base_id or key, "guild_id": r.guid(), "name": name, "x": x, "y": y, "z": z}
+
+def parse_level(fileobj):
+    reader = GvasReader(open_gvas(fileobj))
+    reader.header()
+    characters, guilds, bases = [], [], []
+
+    while True:
+        tag = reader.tag()
+        if tag is None:
+            break
+        if tag["name"] != "worldSaveData":
+            reader.skip(tag["size"])
+            continue
+        while True:
+            inner = reader.tag()
+            if inner is None:
+                break
+            name = inner["name"]
+            if name == "CharacterSaveParameterMap":
+                for key, value in reader.map_entries(name in GUID_KEYED_MAPS):
+                    character = _character(key, value)
+                    if character:
+                        characters.append(character)
+            elif name == "GroupSaveDataMap":
+                for _, value in reader.map_entries(name in GUID_KEYED_MAPS):
+                    try:
+                        guild = _guild(value, True)
+                    except (SaveFormatError, struct.error):
+                        guild = _guild(value, False)
+                    if guild:
+                        guilds.append(guild)
+            elif name == "BaseCampSaveData":
+                for key, value in reader.map_entries(name in GUID_KEYED_MAPS):
+                    base = _base(key, value)
+                    if base:
+                        bases.append(base)
+            else:
+                reader.skip(inner["size"])
+
+    membership = {uid: g["guild_id"] for g in guilds for uid, _ in g["members"]}
+    pal_counts = {}
+    for c in characters:
+        if not c["is_player"] and c["owner_uid"] and c["owner_uid"] != ZERO_GUID:
+            pal_counts[c["owner_uid"]] = pal_counts.get(c["owner_uid"], 0) + 1
+
+    players = [
+        {
+            "player_uid": c["player_uid"],
+            "nickname": c["nickname"],
+            "level": c["level"],
+            "guild_id": membership.get(c["player_uid"]),
+            "pal_count": pal_counts.get(c["player_uid"], 0)
+        }
+        for c in characters if c["is_player"]
+    ]
+    guild_rows = [
+        {"guild_id": g["guild_id"], "name": g["name"], "admin_uid": g["admin_uid"], "member_count": len(g["members"])}
+        for g in guilds
+    ]
+    return {"players": players, "guilds": guild_rows, "bases": bases}
+
+# Worker-process entry point: parses the given archive members and reports
+# failures per file instead of raising, so one bad save doesn't sink the batch.
+def inspect_archive(zip_path: str, members: dict):
+    results = {}
+    with zipfile.ZipFile(zip_path) as z:
+        for member, sha256 in members.items():
+            try:
+                with z.open(member) as f:
+                    results[sha256] = {"ok": True, "error": None, "data": parse_level(f)}
+            except (SaveFormatError, struct.error, zlib.error, KeyError, UnicodeDecodeError) as e:
+                results[sha256] = {"ok": False, "error": str(e), "data": None}
+    return results
@@ -0,0 +1,77 @@
+import heapq
+import re
+from collections import Counter
+
+PREFIX_LEN = 12
+WORD_SPLIT = re.compile(r"[\s_\-()]+")
+
+def ngrams(text: str, n: int):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+# Lowercased lookup tables built once at load time so autocomplete never has
+# to walk or re-lowercase the whole list on a keystroke.
+class SearchIndex:
+    def __init__(self, entries, fields=("name", "id")):
+        self.entries = list(entries)
+        self.values = []
+        self.exact = {}
+        self.prefixes = [{} for _ in fields]
+        self.word_prefixes = [{} for _ in fields]
+        self.grams = {}
+        for i, entry in enumerate(self.entries):
+            values = [str(entry.get(f) or "").lower() for f in fields]
+            self.values.append(values)
+            for field, value in enumerate(values):
+                self.exact.setdefault(value, set()).add(i)
+                for n in range(1, min(len(value), PREFIX_LEN) + 1):
+                    self.prefixes[field].setdefault(value[:n], set()).add(i)
+                for word in WORD_SPLIT.split(value)[1:]:
+                    for n in range(1, min(len(word), PREFIX_LEN) + 1):
+                        self.word_prefixes[field].setdefault(word[:n], set()).add(i)
+                for n in range(1, 4):
+                    for gram in ngrams(value, n):
+                        self.grams.setdefault(gram, set()).add(i)
+
+    # Matches are grouped best first: exact, then per field (name before id)
+    # prefix and word prefix, then substring, then fuzzy. Later groups are only
+    # consulted while there are fewer than `limit` results.
+    def search(self, query: str, limit: int = 25):
+        q = query.strip().lower()
+        if not q:
+            return self.entries[:limit]
+
+        key = q[:PREFIX_LEN]
+        groups = [(self.exact.get(q, ()), None)]
+        for field in range(len(self.prefixes)):
+            groups.append((self.prefixes[field].get(key, ()), lambda i, f=field: self.values[i][f].startswith(q)))
+            groups.append((self.word_prefixes[field].get(key, ()), lambda i, f=field: any(w.startswith(q) for w in WORD_SPLIT.split(self.values[i][f])[1:])))
+
+        ranked = {}
+        for rank, (ids, check) in enumerate(groups):
+            for i in ids:
+                if i not in ranked and (check is None or len(q) <= PREFIX_LEN or check(i)):
+                    ranked[i] = (rank, 0)
+            if len(ranked) >= limit:
+                break
+
+        rank = len(groups)
+        if len(ranked) < limit:
+            keys = ngrams(q, 3) if len(q) > 3 else {q}
+            sets = sorted((self.grams.get(k, set()) for k in keys), key=len)
+            for i in set.intersection(*sets) if sets else ():
+                if i not in ranked and any(q in v for v in self.values[i]):
+                    ranked[i] = (rank, 0)
+
+        # Fuzzy: share at least half of the query's trigrams.
+        if len(ranked) < limit and len(q) > 3:
+            trigrams = ngrams(q, 3)
+            shared = Counter()
+            for gram in trigrams:
+                shared.update(self.grams.get(gram, ()))
+            needed = (len(trigrams) + 1) // 2
+            for i, count in shared.items():
+                if i not in ranked and count >= needed:
+                    ranked[i] = (rank + 1, -count)
+
+        order = heapq.nsmallest(limit, ranked, key=lambda i: (*ranked[i], len(self.values[i][0]), i))
+        return [self.entries[i] for i in order]
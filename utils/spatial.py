@@ -0,0 +1,62 @@
+import math
+import time
+
+# World units (cm) per grid cell; 100m keeps a typical search to a few cells.
+CELL_SIZE = 10000
+
+# Uniform grid of points. Updates only touch the grid when a point crosses
+# into a new cell, so a full snapshot costs one dict lookup per player.
+class SpatialGrid:
+    def __init__(self, cell_size: float = CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.points = {}
+        self.updated = None
+
+    def cell(self, x: float, y: float):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+
+    def update(self, key, x: float, y: float, data=None):
+        cell = self.cell(x, y)
+        old = self.points.get(key)
+        if old is not None and old[2] != cell:
+            self.discard(key)
+            old = None
+        if old is None:
+            self.cells.setdefault(cell, set()).add(key)
+        self.points[key] = (x, y, cell, data)
+
+    def discard(self, key):
+        point = self.points.pop(key, None)
+        if point is None:
+            return
+        members = self.cells.get(point[2])
+        if members is not None:
+            members.discard(key)
+            if not members:
+                del self.cells[point[2]]
+
+    # Applies a full snapshot of {key: (x, y, data)}: moves what changed and
+    # drops keys that are no longer present.
+    def sync(self, snapshot: dict):
+        for key in [k for k in self.points if k not in snapshot]:
+            self.discard(key)
+        for key, (x, y, data) in snapshot.items():
+            self.update(key, x, y, data)
+        self.updated = time.time()
+
+    # Returns [(key, data, distance)] within radius of (x, y), nearest first.
+    def within(self, x: float, y: float, radius: float):
+        (cx0, cy0), (cx1, cy1) = self.cell(x - radius, y - radius), self.cell(x + radius, y + radius)
+        found = []
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            candidates = (k for members in self.cells.values() for k in members)
+        else:
+            candidates = (k for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1) for k in self.cells.get((cx, cy), ()))
+        for key in candidates:
+            px, py, _, data = self.points[key]
+            distance = math.hypot(px - x, py - y)
+            if distance <= radius:
+                found.append((key, data, distance))
+        found.sort(key=lambda f: f[2])
+        return found
@@ -1,28 +1,136 @@
 import aiosqlite
+import csv
+import io
+import json
 import os
 
 DATABASE_PATH = os.path.join('data', 'palworld.db')
 
-async def add_whitelist(player_id: str, whitelisted: bool):
+# In-memory copies of the whitelist and enabled servers, loaded once and kept
+# current by the functions below so checks never touch the database.
+# whitelist_entries holds per-(guild, server) scopes.
+_scoped = None
+_enabled = None
+
+async def load_whitelist():
+    global _scoped, _enabled
     async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute("""
-            INSERT OR REPLACE INTO whitelist (player_id, whitelisted)
-            VALUES (?, ?)
-        """, (player_id, whitelisted))
+        scoped = {}
+        cursor = await db.execute("SELECT guild_id, server_name, player_id FROM whitelist_entries")
+        for guild_id, server_name, player_id in await cursor.fetchall():
+            scoped.setdefault((guild_id, server_name), set()).add(player_id)
+        cursor = await db.execute("SELECT guild_id, server_name FROM whitelist_status WHERE enabled")
+        enabled = {(row[0], row[1]) for row in await cursor.fetchall()}
+    _scoped, _enabled = scoped, enabled
+
+async def _ensure_loaded():
+    if _scoped is None:
+        await load_whitelist()
+
+# Synchronous membership test for one server, or None when the server doesn't
+# enforce its whitelist. It reads the live sets, so later changes apply.
+async def whitelist_checker(guild_id: int, server_name: str):
+    await _ensure_loaded()
+    if (guild_id, server_name) not in _enabled:
+        return None
+    return lambda player_id: player_id in _scoped.get((guild_id, server_name), ())
+
+# The guild's servers that whitelist player_id.
+async def whitelisted_servers(guild_id: int, player_id: str):
+    await _ensure_loaded()
+    return sorted(server_name for (gid, server_name), player_ids in _scoped.items() if gid == guild_id and player_id in player_ids)
+
+async def add_server_whitelist(guild_id: int, server_name: str, player_id: str):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.execute("INSERT OR IGNORE INTO whitelist_entries (guild_id, server_name, player_id) VALUES (?, ?, ?)", (guild_id, server_name, player_id))
+        await db.commit()
+    await _ensure_loaded()
+    _scoped.setdefault((guild_id, server_name), set()).add(player_id)
+
+async def remove_server_whitelist(guild_id: int, server_name: str, player_id: str):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.execute("DELETE FROM whitelist_entries WHERE guild_id = ? AND server_name = ? AND player_id = ?", (guild_id, server_name, player_id))
+        await db.commit()
+    await _ensure_loaded()
+    _scoped.get((guild_id, server_name), set()).discard(player_id)
+
+# Guild-wide changes apply to each of the guild's servers.
+async def add_guild_whitelist(guild_id: int, server_names, player_id: str):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.executemany(
+            "INSERT OR IGNORE INTO whitelist_entries (guild_id, server_name, player_id) VALUES (?, ?, ?)",
+            ((guild_id, server_name, player_id) for server_name in server_names)
+        )
         await db.commit()
+    await _ensure_loaded()
+    for server_name in server_names:
+        _scoped.setdefault((guild_id, server_name), set()).add(player_id)
 
-async def remove_whitelist(player_id: str):
+async def remove_guild_whitelist(guild_id: int, player_id: str):
     async with aiosqlite.connect(DATABASE_PATH) as db:
-        await db.execute("DELETE FROM whitelist WHERE player_id = ?", (player_id,))
+        await db.execute("DELETE FROM whitelist_entries WHERE guild_id = ? AND player_id = ?", (guild_id, player_id))
         await db.commit()
+    await _ensure_loaded()
+    for (gid, _), player_ids in _scoped.items():
+        if gid == guild_id:
+            player_ids.discard(player_id)
 
-async def is_whitelisted(player_id: str):
+# Writes every id in one transaction, then swaps the server's in-memory set in
+# a single assignment so enforcement never sees a half-imported list.
+async def import_server_whitelist(guild_id: int, server_name: str, player_ids, replace: bool = False):
+    player_ids = set(player_ids)
+    await _ensure_loaded()
     async with aiosqlite.connect(DATABASE_PATH) as db:
-        cursor = await db.execute("SELECT whitelisted FROM whitelist WHERE player_id = ?", (player_id,))
-        result = await cursor.fetchone()
-        if result:
-            return result[0]
-        return False
+        if replace:
+            await db.execute("DELETE FROM whitelist_entries WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await db.executemany(
+            "INSERT OR IGNORE INTO whitelist_entries (guild_id, server_name, player_id) VALUES (?, ?, ?)",
+            ((guild_id, server_name, player_id) for player_id in player_ids)
+        )
+        await db.commit()
+    current = _scoped.get((guild_id, server_name), set())
+    _scoped[(guild_id, server_name)] = player_ids if replace else current | player_ids
+    return len(player_ids)
+
+async def server_whitelist(guild_id: int, server_name: str):
+    await _ensure_loaded()
+    return sorted(_scoped.get((guild_id, server_name), ()))
+
+async def remove_server_whitelists(guild_id: int, server_name: str):
+    async with aiosqlite.connect(DATABASE_PATH) as db:
+        await db.execute("DELETE FROM whitelist_entries WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await db.commit()
+    await _ensure_loaded()
+    _scoped.pop((guild_id, server_name), None)
+
+# Accepts a CSV whose first column is the player id (header optional) or JSON:
+# a list of ids, a list of objects with a player id field, or {"players": [...]}.
+def parse_whitelist_file(filename: str, data: bytes):
+    text = data.decode("utf-8-sig")
+    if filename.lower().endswith(".json"):
+        entries = json.loads(text)
+        if isinstance(entries, dict):
+            entries = entries.get("players") or entries.get("whitelist") or []
+        ids = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                entry = entry.get("player_id") or entry.get("playerid") or entry.get("userId") or entry.get("userid")
+            if entry:
+                ids.append(str(entry).strip())
+        return [i for i in ids if i]
+    ids = [row[0].strip() for row in csv.reader(io.StringIO(text)) if row and row[0].strip()]
+    if ids and ids[0].lower() in ("player_id", "playerid", "userid", "user_id", "id"):
+        ids = ids[1:]
+    return ids
+
+def format_whitelist_file(player_ids, fmt: str):
+    if fmt == "json":
+        return json.dumps(player_ids, indent=2).encode("utf-8")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["player_id"])
+    writer.writerows([player_id] for player_id in player_ids)
+    return buffer.getvalue().encode("utf-8")
 
 async def whitelist_set(guild_id: int, server_name: str, enabled: bool):
     async with aiosqlite.connect(DATABASE_PATH) as db:
@@ -31,11 +139,19 @@ async def whitelist_set(guild_id: int, server_name: str, enabled: bool):
             VALUES (?, ?, ?)
         """, (guild_id, server_name, enabled))
         await db.commit()
+    await _ensure_loaded()
+    if enabled:
+        _enabled.add((guild_id, server_name))
+    else:
+        _enabled.discard((guild_id, server_name))
 
 async def whitelist_get(guild_id: int, server_name: str):
+    await _ensure_loaded()
+    return (guild_id, server_name) in _enabled
+
+async def remove_whitelist_status(guild_id: int, server_name: str):
     async with aiosqlite.connect(DATABASE_PATH) as db:
-        cursor = await db.execute("SELECT enabled FROM whitelist_status WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
-        result = await cursor.fetchone()
-        if result:
-            return result[0]
-        return False
+        await db.execute("DELETE FROM whitelist_status WHERE guild_id = ? AND server_name = ?", (guild_id, server_name))
+        await db.commit()
+    await _ensure_loaded()
+    _enabled.discard((guild_id, server_name))
@@ -0,0 +1,23 @@
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Shared process pool for CPU/IO heavy jobs that should never run on the event loop.
+_process_pool = None
+
+def get_process_pool():
+    global _process_pool
+    if _process_pool is None:
+        workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        _process_pool = ProcessPoolExecutor(max_workers=workers)
+    return _process_pool
+
+async def run_in_process(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_process_pool(), func, *args)
+
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None